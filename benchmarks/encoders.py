@@ -0,0 +1,192 @@
+"""
+Microbenchmark of the signal encoders of every ControlUnit and Gateway pair.
+
+For every registered control unit a channel configuration is generated from its
+channel config regexes. For every gateway and every supported action the script measures
+ * pulse_data_ns: duration of ControlUnit.get_pulse_data
+ * generate_code_ns: duration of Gateway.generate_code
+ * pulse_data_alloc_bytes / generate_code_alloc_bytes: peak memory allocated during a single call (tracemalloc)
+ * payload_bytes: size of the generated code
+All values are averaged over the supported actions of the control unit.
+
+The results are printed as JSON (or written to --output). Pass a previous result file with
+--compare to print the change of every pair, e.g. before and after an encoder optimization.
+
+Usage:
+    python benchmarks/encoders.py [--number N] [--filter TEXT] [--output FILE] [--compare FILE]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from xeger import Xeger  # noqa: E402
+
+from raspyrfm_client import RaspyRFMClient  # noqa: E402
+from raspyrfm_client.device_implementations.controlunit.base import ControlUnit  # noqa: E402
+from raspyrfm_client.device_implementations.gateway.base import Gateway  # noqa: E402
+
+
+def _time_ns(function, number: int, repeat: int = 3) -> float:
+    """
+    :return: the best average duration of a call in ns over the given number of repeats
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            function()
+        duration = (time.perf_counter_ns() - start) / number
+        best = duration if best is None else min(best, duration)
+    return best
+
+
+def _alloc_bytes(function) -> int:
+    """
+    :return: peak memory in bytes allocated by a single call
+    """
+    # tracemalloc slows down every allocation, so it only runs for this call
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def get_pairs(rfm_client: RaspyRFMClient, name_filter: str = None):
+    """
+    :return: generator of configured (control unit, gateway) pairs
+    """
+    gateways = [rfm_client.get_gateway(manufacturer, model)
+                for manufacturer in rfm_client.get_supported_gateway_manufacturers()
+                for model in rfm_client.get_supported_gateway_models(manufacturer)]
+
+    for manufacturer in rfm_client.get_supported_controlunit_manufacturers():
+        for model in rfm_client.get_supported_controlunit_models(manufacturer):
+            device = rfm_client.get_controlunit(manufacturer, model)
+            channel_config_args = device.get_channel_config_args()
+            device.set_channel_config(**{arg: Xeger().xeger(channel_config_args[arg]) for arg in channel_config_args})
+
+            for gateway in gateways:
+                if name_filter and name_filter.lower() not in _get_key(device, gateway).lower():
+                    continue
+                yield device, gateway
+
+
+def _get_key(device: ControlUnit, gateway: Gateway) -> str:
+    return "%s %s @ %s %s" % (device.get_manufacturer().value, device.get_model().value,
+                              gateway.get_manufacturer().value, gateway.get_model().value)
+
+
+def measure(device: ControlUnit, gateway: Gateway, number: int) -> dict:
+    """
+    :return: the measurements of a single pair, averaged over all supported actions
+    """
+    actions = device.get_supported_actions()
+    totals = {
+        "pulse_data_ns": 0.0,
+        "generate_code_ns": 0.0,
+        "pulse_data_alloc_bytes": 0,
+        "generate_code_alloc_bytes": 0,
+        "payload_bytes": 0,
+    }
+
+    for action in actions:
+        def pulse_data():
+            return device.get_pulse_data(action)
+
+        def generate_code():
+            return gateway.generate_code(device, action)
+
+        totals["pulse_data_ns"] += _time_ns(pulse_data, number)
+        totals["generate_code_ns"] += _time_ns(generate_code, number)
+        totals["pulse_data_alloc_bytes"] += _alloc_bytes(pulse_data)
+        totals["generate_code_alloc_bytes"] += _alloc_bytes(generate_code)
+        totals["payload_bytes"] += len(generate_code().encode())
+
+    result = {
+        "manufacturer": device.get_manufacturer().value,
+        "model": device.get_model().value,
+        "gateway_manufacturer": gateway.get_manufacturer().value,
+        "gateway_model": gateway.get_model().value,
+        "actions": len(actions),
+    }
+    for key, value in totals.items():
+        result[key] = round(value / len(actions), 1)
+    return result
+
+
+def run(number: int, name_filter: str = None) -> dict:
+    """
+    :param number: calls per measurement
+    :param name_filter: only measure pairs whose name contains this text
+    :return: the benchmark results
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        rfm_client = RaspyRFMClient()
+
+    results = [measure(device, gateway, number) for device, gateway in get_pairs(rfm_client, name_filter)]
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "number": number,
+        "results": results,
+    }
+
+
+def compare(current: dict, previous: dict) -> [str]:
+    """
+    :return: a line per pair with the relative change of the encoder timings
+    """
+    def key(result):
+        return result["manufacturer"], result["model"], result["gateway_manufacturer"], result["gateway_model"]
+
+    previous_results = {key(result): result for result in previous["results"]}
+    lines = []
+    for result in current["results"]:
+        old = previous_results.get(key(result))
+        if old is None:
+            continue
+        changes = []
+        for metric in ("pulse_data_ns", "generate_code_ns", "generate_code_alloc_bytes"):
+            if old[metric]:
+                changes.append("%s %+.1f%%" % (metric, (result[metric] / old[metric] - 1) * 100))
+        lines.append("%-60s %s" % (" ".join(key(result)), ", ".join(changes)))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=200, help="calls per measurement")
+    parser.add_argument("--filter", help="only measure pairs whose name contains this text")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="previous JSON results to compare with")
+    args = parser.parse_args()
+
+    results = run(args.number, args.filter)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+            file.write("\n")
+    elif not args.compare:
+        print(json.dumps(results, indent=2))
+
+    if args.compare:
+        with open(args.compare) as file:
+            previous = json.load(file)
+        print("\n".join(compare(results, previous)))
+
+
+if __name__ == "__main__":
+    main()
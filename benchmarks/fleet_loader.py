@@ -0,0 +1,60 @@
+"""
+Benchmark of raspyrfm_client.fleet.load_fleet with a generated CSV fleet file,
+with and without generating the ON and OFF codes of every device.
+
+Usage: python benchmarks/fleet_loader.py [--devices N] [--processes N] [--json]
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from raspyrfm_client import fleet  # noqa: E402
+from raspyrfm_client.device_implementations.controlunit.actions import Action  # noqa: E402
+from raspyrfm_client.device_implementations.gateway.manufacturer.seegel_systeme.RaspyRFM import RaspyRFM  # noqa: E402
+
+
+def create_csv(count: int) -> str:
+    lines = ["name,manufacturer,model,gateway,master,slave"]
+    for index in range(count):
+        lines.append("outlet%d,Intertechno,CMR 1000,gw%d,%s,%d" % (
+            index, index % 4, "ABCDEFGHIJKLMNOP"[index // 16 % 16], index % 16 + 1))
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=5000, help="devices in the generated fleet")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes of load_fleet")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    text = create_csv(args.devices)
+    gateways = {"gw%d" % index: RaspyRFM("192.168.2.%d" % (10 + index)) for index in range(4)}
+
+    results = {"devices": args.devices, "processes": args.processes}
+    for encode in (True, False):
+        start = time.perf_counter()
+        devices, errors = fleet.load_fleet(io.StringIO(text), "csv", gateways, encode=encode,
+                                           processes=args.processes)
+        duration = time.perf_counter() - start
+        assert len(devices) == args.devices and not errors
+        assert (devices[0].get_code(Action.ON) is not None) == encode
+
+        prefix = "load" if encode else "load_without_codes"
+        results[prefix + "_s"] = round(duration, 3)
+        results[prefix + "_us_per_device"] = round(duration / args.devices * 1000000, 1)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, value in results.items():
+            print("%-34s %s" % (name, value))
+
+
+if __name__ == "__main__":
+    main()
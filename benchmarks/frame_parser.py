@@ -0,0 +1,78 @@
+"""
+Benchmark of raspyrfm_client.frame.parse_frame against the split/int approach
+that was used by the payload consumers before.
+
+Usage: python benchmarks/frame_parser.py [--number N] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from raspyrfm_client.frame import parse_frame  # noqa: E402
+
+FRAMES = {
+    "hx2262": "TXP:0,0,5,5600,350,49," + ",".join(["1,3,1,3", "3,1,3,1", "1,3,3,1"][i % 3] for i in range(24)) + ",1,31",
+    "it1500": "TXP:0,0,6,5600,275,66,1,10," + ",".join(["1,1,1,5", "1,5,1,1"][i % 2] for i in range(32)) + ",1,41",
+    "itgw": "0,0,5,11200,350,50,0," + ",".join(["1,3,1,3", "3,1,3,1"][i % 2] for i in range(24)) + ",1,124,0",
+}
+
+
+def split_int(payload: str):
+    """
+    The previous approach: strip the prefix, split into str tokens and convert each token.
+    """
+    body = payload.strip()
+    if ":" in body:
+        _, body = body.split(":", 1)
+
+    tokens = [token for token in body.split(",") if token]
+    repetitions = int(tokens[2])
+    gap = int(tokens[3])
+    timebase = int(tokens[4])
+    pair_count = int(tokens[5])
+    pulses = [int(token) for token in tokens[6:6 + pair_count * 2]]
+    return repetitions, gap, timebase, pulses
+
+
+def run(number: int) -> dict:
+    results = {}
+    for name, frame in FRAMES.items():
+        data = frame.encode()
+        candidates = {
+            "split_int_str": (split_int, frame),
+            "split_int_bytes_decoded": (lambda d: split_int(d.decode()), data),
+            "parse_frame_str": (parse_frame, frame),
+            "parse_frame_bytes": (parse_frame, data),
+            "parse_frame_memoryview": (parse_frame, memoryview(data)),
+            "parse_frame_lenient": (lambda d: parse_frame(d, strict=False), data),
+        }
+        results[name] = {}
+        for candidate, (function, argument) in candidates.items():
+            seconds = min(timeit.repeat(lambda: function(argument), number=number, repeat=5))
+            results[name][candidate] = round(seconds / number * 1e9, 1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000, help="calls per measurement")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.number)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for name, timings in results.items():
+        print(name)
+        for candidate, nanoseconds in timings.items():
+            print("  %-26s %10.1f ns/frame" % (candidate, nanoseconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Cold-start benchmark of the raspyrfm_client library.
+
+Every sample runs in a fresh interpreter and measures
+ * import: "import raspyrfm_client"
+ * client: construction of the RaspyRFMClient (loads all implementation classes)
+ * first_code: the first generate_code call
+together with the number of loaded modules after each stage and the peak RSS of the process.
+
+The median of all samples is compared against a stored baseline so that startup regressions,
+e.g. from new manufacturer modules, are noticed.
+
+Usage:
+    python benchmarks/startup.py [--samples N] [--save-baseline] [--tolerance 0.25] [--min-delta-ms 1.0]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baselines", "startup.json")
+
+_CHILD = r"""
+import contextlib
+import io
+import json
+import resource
+import sys
+import time
+
+result = {}
+modules = len(sys.modules)
+
+start = time.perf_counter()
+import raspyrfm_client
+result["import_ms"] = (time.perf_counter() - start) * 1000
+result["import_modules"] = len(sys.modules) - modules
+
+from raspyrfm_client.device_implementations.controlunit.actions import Action
+from raspyrfm_client.device_implementations.controlunit.controlunit_constants import ControlUnitModel
+from raspyrfm_client.device_implementations.gateway.manufacturer.gateway_constants import GatewayModel
+from raspyrfm_client.device_implementations.manufacturer_constants import Manufacturer
+
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    client = raspyrfm_client.RaspyRFMClient()
+result["client_ms"] = (time.perf_counter() - start) * 1000
+result["client_modules"] = len(sys.modules) - modules
+
+gateway = client.get_gateway(Manufacturer.SEEGEL_SYSTEME, GatewayModel.RASPYRFM)
+device = client.get_controlunit(Manufacturer.INTERTECHNO, ControlUnitModel.CMR_1000)
+device.set_channel_config(master="A", slave=1)
+
+start = time.perf_counter()
+gateway.generate_code(device, Action.ON)
+result["first_code_ms"] = (time.perf_counter() - start) * 1000
+result["total_modules"] = len(sys.modules) - modules
+
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+result["peak_rss_kb"] = peak // 1024 if sys.platform == "darwin" else peak
+
+print(json.dumps(result))
+"""
+
+# metrics that are compared relative to the baseline, the module counts are compared exactly
+TIMED_METRICS = ("import_ms", "client_ms", "first_code_ms", "peak_rss_kb")
+COUNTED_METRICS = ("import_modules", "client_modules", "total_modules")
+
+
+def run_sample(python: str) -> dict:
+    """
+    :param python: the interpreter to run the sample with
+    :return: the measurements of a single cold start
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    env.pop("PYTHONDEVMODE", None)
+    output = subprocess.check_output([python, "-c", _CHILD], cwd=ROOT, env=env)
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def run(samples: int, python: str = sys.executable) -> dict:
+    """
+    :param samples: number of cold starts
+    :param python: the interpreter to run the samples with
+    :return: median of every metric over all samples
+    """
+    # the first run compiles the byte code, it is not representative for a cold start
+    run_sample(python)
+
+    results = [run_sample(python) for _ in range(samples)]
+    return {key: round(statistics.median(result[key] for result in results), 3) for key in results[0]}
+
+
+def compare(result: dict, baseline: dict, tolerance: float, min_delta_ms: float = 1.0) -> [str]:
+    """
+    :param result: the current measurements
+    :param baseline: the stored measurements
+    :param tolerance: allowed relative increase of the timed metrics
+    :param min_delta_ms: increases of durations below this absolute value are considered noise
+    :return: list of regression descriptions, empty if there is no regression
+    """
+    regressions = []
+    for key in TIMED_METRICS:
+        if key not in baseline:
+            continue
+        if key.endswith("_ms") and result[key] - baseline[key] < min_delta_ms:
+            continue
+        if result[key] > baseline[key] * (1 + tolerance):
+            regressions.append("%s: %.3f > %.3f (+%.0f%%)" % (
+                key, result[key], baseline[key], (result[key] / baseline[key] - 1) * 100))
+    for key in COUNTED_METRICS:
+        if key in baseline and result[key] > baseline[key]:
+            regressions.append("%s: %d > %d" % (key, result[key], baseline[key]))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=10, help="number of cold starts")
+    parser.add_argument("--python", default=sys.executable, help="interpreter to benchmark")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative increase of the timed metrics (default: 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="ignore duration increases below this many milliseconds (default: 1.0)")
+    args = parser.parse_args()
+
+    result = run(args.samples, args.python)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    for key, value in result.items():
+        line = "%-16s %12.3f" % (key, value)
+        if baseline is not None and key in baseline:
+            line += "   baseline %12.3f" % baseline[key]
+        print(line)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as file:
+            json.dump(result, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print("Baseline saved to " + args.baseline)
+        return 0
+
+    if baseline is None:
+        print("No baseline found, run with --save-baseline to create one")
+        return 0
+
+    regressions = compare(result, baseline, args.tolerance, args.min_delta_ms)
+    for regression in regressions:
+        print("REGRESSION " + regression)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
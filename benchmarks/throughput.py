@@ -0,0 +1,238 @@
+"""
+End-to-end throughput and latency benchmark of the client against the gateway simulator.
+
+The GatewaySimulator runs in a separate process so that it does not compete with the client for the GIL.
+For every send path and every target rate the client sends frames on an open-loop schedule and records
+ * the achieved rate in frames/sec
+ * p50/p99/max latency of a single send call (send_batch calls are divided by their frame count)
+ * CPU time of the client process per frame
+ * frames received, accepted and dropped (busy) by the simulator, and frames lost on the way
+   (sent but never received, e.g. socket buffer overflows)
+
+The report is printed as JSON. It contains the saturation point of the client (the highest rate it still
+achieved within 5%) and of the gateway (the highest rate without dropped frames) for every send path.
+The library has no asynchronous send path, the Home Assistant integration sends through the same
+socket calls from an executor.
+
+Usage:
+    python benchmarks/throughput.py [--rates 1,2,5,...] [--duration 2] [--modes send,batch] [--airtime-scale 1]
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from raspyrfm_client import RaspyRFMClient  # noqa: E402
+from raspyrfm_client.device_implementations.controlunit.actions import Action  # noqa: E402
+from raspyrfm_client.device_implementations.controlunit.controlunit_constants import ControlUnitModel  # noqa: E402
+from raspyrfm_client.device_implementations.gateway.manufacturer.gateway_constants import GatewayModel  # noqa: E402
+from raspyrfm_client.device_implementations.manufacturer_constants import Manufacturer  # noqa: E402
+from raspyrfm_client.simulator import GatewaySimulator  # noqa: E402
+
+DEFAULT_RATES = "1,2,5,10,20,50,100,200,500,1000,2000,5000"
+BATCH_SIZE = 16
+
+
+def _run_simulator(connection, gateway_model: str, airtime_scale: float) -> None:
+    simulator = GatewaySimulator(GatewayModel(gateway_model), port=0, airtime_scale=airtime_scale)
+    with simulator:
+        connection.send(simulator.get_address())
+        while True:
+            command = connection.recv()
+            if command == "stop":
+                return
+            # wait until the simulator processed every datagram of the run
+            received = -1
+            while received != simulator.get_stats().received:
+                received = simulator.get_stats().received
+                time.sleep(0.2)
+            connection.send(simulator.get_stats().to_dict())
+
+
+class SimulatorProcess(object):
+    """
+    A GatewaySimulator running in a child process
+    """
+
+    def __init__(self, gateway_model: GatewayModel, airtime_scale: float):
+        self._connection, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_run_simulator,
+                                                args=(child, gateway_model.value, airtime_scale), daemon=True)
+        self._process.start()
+        self.address = tuple(self._connection.recv())
+
+    def get_stats(self) -> dict:
+        """
+        :return: the cumulative counters of the simulator once it is idle
+        """
+        self._connection.send("stats")
+        return self._connection.recv()
+
+    def stop(self) -> None:
+        self._connection.send("stop")
+        self._process.join()
+
+
+def _percentile(values: [float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(percentile / 100 * (len(values) - 1))))]
+
+
+def _create_devices(rfm_client: RaspyRFMClient, count: int):
+    devices = []
+    for index in range(count):
+        device = rfm_client.get_controlunit(Manufacturer.INTERTECHNO, ControlUnitModel.CMR_1000)
+        device.set_channel_config(master="ABCDEFGHIJKLMNOP"[index // 16 % 16], slave=index % 16 + 1)
+        devices.append(device)
+    return devices
+
+
+def run_rate(rfm_client: RaspyRFMClient, gateway, devices, mode: str, rate: float, duration: float) -> dict:
+    """
+    Sends frames at the given rate for the given duration
+    :return: the client side measurements
+    """
+    frames_per_call = len(devices) if mode == "batch" else 1
+    calls = max(1, int(rate * duration / frames_per_call))
+    interval = frames_per_call / rate
+
+    latencies = []
+    frames = 0
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    for call in range(calls):
+        delay = start + call * interval - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+        call_start = time.perf_counter()
+        if mode == "batch":
+            frames += rfm_client.send_batch(gateway, devices, Action.ON, use_group_commands=False)
+        else:
+            rfm_client.send(gateway, devices[call % len(devices)], Action.ON)
+            frames += 1
+        latencies.append((time.perf_counter() - call_start) / frames_per_call * 1000000)
+    # a client that keeps up finishes with the schedule, the last call is due one interval before its end
+    elapsed = max(time.perf_counter() - start, calls * interval)
+    cpu = time.process_time() - cpu_start
+
+    return {
+        "mode": mode,
+        "target_rate": rate,
+        "frames": frames,
+        "elapsed_s": round(elapsed, 3),
+        "achieved_rate": round(frames / elapsed, 1),
+        "latency_us": {
+            "p50": round(_percentile(latencies, 50), 1),
+            "p99": round(_percentile(latencies, 99), 1),
+            "max": round(max(latencies), 1),
+        },
+        "cpu_us_per_frame": round(cpu / frames * 1000000, 1),
+    }
+
+
+def run(rates: [float], duration: float, modes: [str], gateway_model: GatewayModel, airtime_scale: float) -> dict:
+    """
+    :return: the benchmark report
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        rfm_client = RaspyRFMClient()
+    devices = _create_devices(rfm_client, BATCH_SIZE)
+
+    simulator = SimulatorProcess(gateway_model, airtime_scale)
+    try:
+        gateway = rfm_client.get_gateway(_get_gateway_manufacturer(rfm_client, gateway_model), gateway_model,
+                                         *simulator.address)
+        runs = []
+        previous = simulator.get_stats()
+        for mode in modes:
+            for rate in rates:
+                result = run_rate(rfm_client, gateway, devices, mode, rate, duration)
+                stats = simulator.get_stats()
+                received = stats["received"] - previous["received"]
+                result["gateway"] = {
+                    "received": received,
+                    "accepted": stats["accepted"] - previous["accepted"],
+                    "dropped_busy": stats["dropped_busy"] - previous["dropped_busy"],
+                    "lost": result["frames"] - received,
+                }
+                previous = stats
+                runs.append(result)
+    finally:
+        simulator.stop()
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "gateway_model": gateway_model.value,
+        "airtime_scale": airtime_scale,
+        "duration_s": duration,
+        "runs": runs,
+        "saturation": _get_saturation(runs, modes),
+    }
+
+
+def _get_gateway_manufacturer(rfm_client: RaspyRFMClient, gateway_model: GatewayModel) -> Manufacturer:
+    for manufacturer in rfm_client.get_supported_gateway_manufacturers():
+        if gateway_model in rfm_client.get_supported_gateway_models(manufacturer):
+            return manufacturer
+    raise ValueError("Unsupported gateway model: " + str(gateway_model))
+
+
+def _get_saturation(runs: [dict], modes: [str]) -> dict:
+    """
+    :return: per send path the highest rate the client sustained and the highest rate the gateway handled
+    """
+    saturation = {}
+    for mode in modes:
+        client = None
+        gateway = None
+        for result in (result for result in runs if result["mode"] == mode):
+            if result["achieved_rate"] >= result["target_rate"] * 0.95:
+                client = result["target_rate"]
+            if result["gateway"]["dropped_busy"] == 0 and result["gateway"]["lost"] == 0:
+                gateway = result["target_rate"]
+        saturation[mode] = {"client_rate": client, "gateway_rate": gateway}
+    return saturation
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rates", default=DEFAULT_RATES, help="comma separated target rates in frames/sec")
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds per rate")
+    parser.add_argument("--modes", default="send,batch", help="comma separated send paths: send, batch")
+    parser.add_argument("--gateway", default=GatewayModel.RASPYRFM.value,
+                        choices=[model.value for model in GatewayModel], help="simulated gateway model")
+    parser.add_argument("--airtime-scale", type=float, default=1.0,
+                        help="busy period factor of the simulator, 0 to measure the client only")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    modes = args.modes.split(",")
+    for mode in modes:
+        if mode not in ("send", "batch"):
+            parser.error("unknown mode: " + mode)
+
+    report = run([float(rate) for rate in args.rates.split(",")], args.duration, modes,
+                 GatewayModel(args.gateway), args.airtime_scale)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -93,4 +93,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_update_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
     hub: RaspyRFMHub = hass.data[DOMAIN][entry.entry_id]
+    if dict(entry.options) != hub.options:
+        # storage and receive path options are only read when the hub is created
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
     await hub.async_update_entry(entry)
@@ -9,7 +9,7 @@ from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.core import callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from .const import DOMAIN, SIGNAL_DEVICE_REGISTRY_UPDATED, SIGNAL_SIGNAL_RECEIVED
+from .const import DOMAIN, SIGNAL_DEVICE_REGISTRY_UPDATED, SIGNAL_DEVICE_SIGNAL_RECEIVED
 from .entity import RaspyRFMEntity
 from .hub import RaspyRFMHub
 from .storage import RaspyRFMDeviceEntry
@@ -59,8 +59,7 @@ class RaspyRFMBinarySensor(RaspyRFMEntity, BinarySensorEntity):
 
         @callback
         def handle_signal(event: Dict[str, Any]) -> None:
-            payload = event.get("payload")
-            if payload not in self._device.signals.values():
+            if event.get("action") not in self._device.signals:
                 return
             self._attr_is_on = True
             self.async_write_ha_state()
@@ -69,7 +68,7 @@ class RaspyRFMBinarySensor(RaspyRFMEntity, BinarySensorEntity):
             self._reset_handle = self.hass.loop.call_later(RESET_TIMEOUT, self._reset_state)
 
         self._signal_unsub = async_dispatcher_connect(
-            self.hass, SIGNAL_SIGNAL_RECEIVED, handle_signal
+            self.hass, SIGNAL_DEVICE_SIGNAL_RECEIVED.format(self._device.device_id), handle_signal
         )
 
     async def async_will_remove_from_hass(self) -> None:
@@ -10,7 +10,7 @@ from homeassistant.core import callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, SIGNAL_DEVICE_REGISTRY_UPDATED, SIGNAL_SIGNAL_RECEIVED
+from .const import DOMAIN, SIGNAL_DEVICE_REGISTRY_UPDATED, SIGNAL_DEVICE_SIGNAL_RECEIVED
 from .entity import RaspyRFMEntity
 from .hub import RaspyRFMHub
 from .storage import RaspyRFMDeviceEntry
@@ -91,13 +91,12 @@ class RaspyRFMButton(RaspyRFMEntity, ButtonEntity):
 
         @callback
         def handle_signal(event: Dict[str, Any]) -> None:
-            payload = event.get("payload")
-            if payload == self._device.signals.get(self._action):
+            if event.get("action") == self._action:
                 self._last_triggered = dt_util.utcnow()
                 self.async_write_ha_state()
 
         self._signal_unsub = async_dispatcher_connect(
-            self.hass, SIGNAL_SIGNAL_RECEIVED, handle_signal
+            self.hass, SIGNAL_DEVICE_SIGNAL_RECEIVED.format(self._device.device_id), handle_signal
         )
 
     async def async_will_remove_from_hass(self) -> None:
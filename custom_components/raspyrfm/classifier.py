@@ -5,10 +5,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from functools import lru_cache
 import logging
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from raspyrfm_client import RaspyRFMClient
 from raspyrfm_client.device_implementations.controlunit.actions import Action
+from raspyrfm_client.frame import parse_frame
 
 LOGGER = logging.getLogger(__name__)
 
@@ -56,6 +57,15 @@ def classify_payload(payload: str) -> Optional[SignalClassification]:
     return SignalClassification(actions=set(action_candidates), suggested_type=suggested_type)
 
 
+def frame_key(payload: str) -> Any:
+    """Return a key identifying a frame independent of its repetitions and pause."""
+
+    frame = parse_frame(payload, strict=False)
+    if frame is None:
+        return payload
+    return frame.signature()
+
+
 def _actions_to_device_type(actions: Iterable[Action]) -> str:
     """Translate a collection of supported actions into a RaspyRFM device type."""
 
@@ -78,46 +88,17 @@ def _fingerprint_from_payload(payload: str) -> Optional[SignalFingerprint]:
     if not payload:
         return None
 
-    body = payload.strip()
-    if ":" in body:
-        # Strip transport prefix (e.g. ``TXP:`` or ``RXP:``)
-        try:
-            _, body = body.split(":", 1)
-        except ValueError:
-            return None
-
-    tokens = [token for token in body.split(",") if token]
-    if len(tokens) < 6:
-        return None
-
-    try:
-        repetitions = int(tokens[2])
-        gap = int(tokens[3])
-        timebase = int(tokens[4])
-        pair_count = int(tokens[5])
-    except ValueError:
+    frame = parse_frame(payload, strict=False)
+    if frame is None or frame.count < 1:
         return None
 
-    pulses: List[int] = []
-    for token in tokens[6:6 + pair_count * 2]:
-        try:
-            pulses.append(int(token))
-        except ValueError:
-            return None
-
-    if len(pulses) < 2:
-        return None
-
-    min_pulse = min(pulses)
-    max_pulse = max(pulses)
-
     return SignalFingerprint(
-        repetitions=repetitions,
-        gap=gap,
-        timebase=timebase,
-        pulse_count=int(len(pulses) / 2),
-        min_pulse=min_pulse,
-        max_pulse=max_pulse,
+        repetitions=frame.repetitions,
+        gap=frame.pause,
+        timebase=frame.timebase,
+        pulse_count=frame.count,
+        min_pulse=min(frame.pulses),
+        max_pulse=max(frame.pulses),
     )
 
 
@@ -10,7 +10,35 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 
-from .const import CONF_HOST, CONF_PORT, DEFAULT_PORT, DOMAIN
+from .const import (
+    CONF_DEDUP_WINDOW,
+    CONF_HOST,
+    CONF_PORT,
+    CONF_QUEUE_OVERFLOW,
+    CONF_QUEUE_SIZE,
+    CONF_SAVE_DELAY,
+    CONF_SIGNAL_BUFFER_BYTES,
+    CONF_SIGNAL_BUFFER_SIZE,
+    DEFAULT_DEDUP_WINDOW,
+    DEFAULT_PORT,
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_SAVE_DELAY,
+    DEFAULT_SIGNAL_BUFFER_BYTES,
+    DEFAULT_SIGNAL_BUFFER_SIZE,
+    DOMAIN,
+    QUEUE_OVERFLOW_DROP_OLDEST,
+    QUEUE_OVERFLOW_POLICIES,
+)
+
+# entry options with their defaults and validators, host and port are kept in the entry data
+OPTIONS_SCHEMA: Dict[str, tuple[Any, Any]] = {
+    CONF_SAVE_DELAY: (DEFAULT_SAVE_DELAY, vol.All(vol.Coerce(float), vol.Range(min=0, max=300))),
+    CONF_QUEUE_SIZE: (DEFAULT_QUEUE_SIZE, vol.All(vol.Coerce(int), vol.Range(min=1, max=65536))),
+    CONF_QUEUE_OVERFLOW: (QUEUE_OVERFLOW_DROP_OLDEST, vol.In(QUEUE_OVERFLOW_POLICIES)),
+    CONF_DEDUP_WINDOW: (DEFAULT_DEDUP_WINDOW, vol.All(vol.Coerce(float), vol.Range(min=0, max=10))),
+    CONF_SIGNAL_BUFFER_SIZE: (DEFAULT_SIGNAL_BUFFER_SIZE, vol.All(vol.Coerce(int), vol.Range(min=1, max=100000))),
+    CONF_SIGNAL_BUFFER_BYTES: (DEFAULT_SIGNAL_BUFFER_BYTES, vol.All(vol.Coerce(int), vol.Range(min=1024))),
+}
 
 
 async def _validate_input(hass: HomeAssistant, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -72,10 +100,17 @@ class RaspyRFMOptionsFlow(config_entries.OptionsFlow):
                 CONF_PORT: user_input[CONF_PORT],
             }
             self.hass.config_entries.async_update_entry(self._entry, data=new_data)
-            return self.async_create_entry(title="", data={})
+            return self.async_create_entry(
+                title="", data={key: user_input[key] for key in OPTIONS_SCHEMA}
+            )
 
+        options = self._entry.options
         schema = vol.Schema({
             vol.Required(CONF_HOST, default=self._entry.data.get(CONF_HOST)): str,
             vol.Required(CONF_PORT, default=self._entry.data.get(CONF_PORT, DEFAULT_PORT)): int,
+            **{
+                vol.Required(key, default=options.get(key, default)): validator
+                for key, (default, validator) in OPTIONS_SCHEMA.items()
+            },
         })
         return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
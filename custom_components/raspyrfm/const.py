@@ -26,10 +26,43 @@ MAPPING_STORAGE_KEY = f"{DOMAIN}_signal_map"
 
 MAPPING_CATEGORIES: list[str] = ["sensor", "actuator", "other"]
 
+# seconds mutations are collected before the stores are written, see the save_delay option
+CONF_SAVE_DELAY = "save_delay"
+DEFAULT_SAVE_DELAY = 5.0
+
+# receive queue of the learning listener, see the queue_size and queue_overflow options
+CONF_QUEUE_SIZE = "queue_size"
+CONF_QUEUE_OVERFLOW = "queue_overflow"
+DEFAULT_QUEUE_SIZE = 256
+QUEUE_OVERFLOW_DROP_OLDEST = "drop_oldest"
+QUEUE_OVERFLOW_DROP_NEWEST = "drop_newest"
+QUEUE_OVERFLOW_POLICIES: list[str] = [QUEUE_OVERFLOW_DROP_OLDEST, QUEUE_OVERFLOW_DROP_NEWEST]
+
+# seconds repeated copies of a frame are collapsed into one signal, 0 disables deduplication
+CONF_DEDUP_WINDOW = "dedup_window"
+DEFAULT_DEDUP_WINDOW = 0.5
+
+# caps of the captured signal buffers, see the signal_buffer_size and signal_buffer_bytes options
+CONF_SIGNAL_BUFFER_SIZE = "signal_buffer_size"
+CONF_SIGNAL_BUFFER_BYTES = "signal_buffer_bytes"
+DEFAULT_SIGNAL_BUFFER_SIZE = 1000
+DEFAULT_SIGNAL_BUFFER_BYTES = 1024 * 1024
+
+# opt-in batching of raspyrfm/signals/subscribe, see the batch_window and batch_size parameters
+DEFAULT_SIGNAL_BATCH_SIZE = 50
+MAX_SIGNAL_BATCH_WINDOW = 5.0
+
 SIGNAL_DEVICE_REGISTRY_UPDATED = "raspyrfm_device_registry_updated"
 SIGNAL_DEVICE_REMOVED = "raspyrfm_device_removed"
 SIGNAL_SIGNAL_RECEIVED = "raspyrfm_signal_received"
+# per-device signal, format with the device id
+SIGNAL_DEVICE_SIGNAL_RECEIVED = SIGNAL_SIGNAL_RECEIVED + "_{}"
 SIGNAL_LEARNING_STATE = "raspyrfm_learning_state"
+# versioned device changes of a hub, format with the config entry id
+SIGNAL_DEVICES_CHANGED = "raspyrfm_devices_changed_{}"
+
+# device deltas kept to bring a resubscribing client up to date without a full resync
+DEVICE_DELTA_HISTORY = 100
 
 PANEL_URL_PATH = "raspyrfm"
 PANEL_ICON = "mdi:radio-tower"
@@ -45,11 +78,15 @@ WS_TYPE_SIGNALS_SUBSCRIBE = WS_TYPE_PREFIX + "signals/subscribe"
 WS_TYPE_DEVICE_CREATE = WS_TYPE_PREFIX + "device/create"
 WS_TYPE_DEVICE_DELETE = WS_TYPE_PREFIX + "device/delete"
 WS_TYPE_DEVICE_LIST = WS_TYPE_PREFIX + "devices/list"
+WS_TYPE_DEVICE_SUBSCRIBE = WS_TYPE_PREFIX + "devices/subscribe"
+WS_TYPE_DEVICE_IMPORT = WS_TYPE_PREFIX + "devices/import"
+WS_TYPE_DEVICE_EXPORT = WS_TYPE_PREFIX + "devices/export"
 WS_TYPE_DEVICE_RELOAD = WS_TYPE_PREFIX + "devices/reload"
 WS_TYPE_DEVICE_SEND = WS_TYPE_PREFIX + "device/send"
 WS_TYPE_SIGNAL_MAP_LIST = WS_TYPE_PREFIX + "signals/map/list"
 WS_TYPE_SIGNAL_MAP_UPDATE = WS_TYPE_PREFIX + "signals/map/update"
 WS_TYPE_SIGNAL_MAP_DELETE = WS_TYPE_PREFIX + "signals/map/delete"
+WS_TYPE_STATS = WS_TYPE_PREFIX + "stats"
 
 SERVICE_SEND_ACTION = "send_action"
 ATTR_DEVICE_ID = "device_id"
@@ -1,6 +1,7 @@
 const { LitElement, html, css } = window;
 
 const MAX_SIGNAL_HISTORY = 200;
+const SIGNAL_BATCH_WINDOW = 0.1;
 
 class RaspyRFMPanel extends LitElement {
   static get properties() {
@@ -350,6 +351,9 @@ class RaspyRFMPanel extends LitElement {
     this._signalUnsub = null;
     this._learningUnsub = null;
     this._persistedMappings = {};
+    this._signalCursor = 0;
+    this._deviceUnsub = null;
+    this._deviceVersion = null;
   }
 
   connectedCallback() {
@@ -367,20 +371,34 @@ class RaspyRFMPanel extends LitElement {
       this._learningUnsub();
       this._learningUnsub = null;
     }
+    if (this._deviceUnsub) {
+      this._deviceUnsub();
+      this._deviceUnsub = null;
+    }
   }
 
   async _initialize() {
     await this._loadState();
     await this._subscribeSignals();
     await this._subscribeLearning();
-    await this._refreshDevices();
+    await this._subscribeDevices();
+    await this._loadMappings();
   }
 
   async _loadState() {
     const status = await this.hass.callWS({ type: "raspyrfm/learning/status" });
     this.learning = status.active;
-    const signals = await this.hass.callWS({ type: "raspyrfm/signals/list" });
-    this.signals = this._normaliseSignals(signals.signals || []);
+    let response = await this.hass.callWS({ type: "raspyrfm/signals/list", since: this._signalCursor });
+    if ((response.latest ?? 0) < this._signalCursor) {
+      // The backend restarted and its sequence numbers started over.
+      this.signals = [];
+      this._signalCursor = 0;
+      response = await this.hass.callWS({ type: "raspyrfm/signals/list", since: 0 });
+    }
+    if (response.cursor !== undefined) {
+      this._signalCursor = response.cursor;
+    }
+    this.signals = this._normaliseSignals([...this.signals, ...(response.signals || [])]);
   }
 
   async _loadMappings() {
@@ -412,10 +430,16 @@ class RaspyRFMPanel extends LitElement {
       if (message.type !== "event") {
         return;
       }
-      const signal = message.event;
-      this.signals = this._normaliseSignals([...this.signals, signal]);
+      const received = Array.isArray(message.event) ? message.event : [message.event];
+      received.forEach((signal) => {
+        if (signal?.seq > this._signalCursor) {
+          this._signalCursor = signal.seq;
+        }
+      });
+      this.signals = this._normaliseSignals([...this.signals, ...received]);
     }, {
-      type: "raspyrfm/signals/subscribe"
+      type: "raspyrfm/signals/subscribe",
+      batch_window: SIGNAL_BATCH_WINDOW
     });
   }
 
@@ -430,9 +454,61 @@ class RaspyRFMPanel extends LitElement {
     });
   }
 
+  async _subscribeDevices() {
+    if (this._deviceUnsub) {
+      this._deviceUnsub();
+      this._deviceUnsub = null;
+    }
+    const request = { type: "raspyrfm/devices/subscribe" };
+    if (this._deviceVersion !== null) {
+      request.version = this._deviceVersion;
+    }
+    this._deviceUnsub = await this.hass.connection.subscribeMessage((message) => {
+      if (message.type !== "event") {
+        return;
+      }
+      this._applyDeviceDelta(message.event);
+    }, request);
+  }
+
+  _applyDeviceDelta(delta) {
+    if (delta.resync) {
+      this.devices = delta.devices || [];
+      this._deviceVersion = delta.version;
+      return;
+    }
+    if (this._deviceVersion !== null && delta.version <= this._deviceVersion) {
+      return;
+    }
+    if (this._deviceVersion === null || delta.version !== this._deviceVersion + 1) {
+      // A version was missed, resubscribe to receive the missing deltas or a snapshot.
+      this._subscribeDevices();
+      return;
+    }
+    const devices = [...this.devices];
+    (delta.changes || []).forEach((change) => {
+      const deviceId = change.op === "delete" ? change.device_id : change.device?.device_id;
+      const index = devices.findIndex((device) => device.device_id === deviceId);
+      if (change.op === "delete") {
+        if (index >= 0) {
+          devices.splice(index, 1);
+        }
+      } else if (index >= 0) {
+        devices[index] = change.device;
+      } else {
+        devices.push(change.device);
+      }
+    });
+    this.devices = devices;
+    this._deviceVersion = delta.version;
+  }
+
   async _refreshDevices() {
     const response = await this.hass.callWS({ type: "raspyrfm/devices/list" });
     this.devices = response.devices || [];
+    if (response.version !== undefined) {
+      this._deviceVersion = response.version;
+    }
     await this._loadMappings();
   }
 
@@ -1079,7 +1155,7 @@ class RaspyRFMPanel extends LitElement {
         device_type: this.formType,
         signals,
       });
-      await this._refreshDevices();
+      await this._loadMappings();
       this.formName = "";
       this.formSignals = {};
       this.formCustomAction = "";
@@ -1097,7 +1173,7 @@ class RaspyRFMPanel extends LitElement {
     const unique = [];
     const seen = new Set();
     signals.forEach((signal) => {
-      const key = signal?.uid || `${signal?.payload}-${signal?.received}`;
+      const key = signal?.seq ?? signal?.uid ?? `${signal?.payload}-${signal?.received}`;
       if (!key || seen.has(key)) {
         return;
       }
@@ -1125,7 +1201,7 @@ class RaspyRFMPanel extends LitElement {
 
   async _deleteDevice(deviceId) {
     await this.hass.callWS({ type: "raspyrfm/device/delete", device_id: deviceId });
-    await this._refreshDevices();
+    await this._loadMappings();
   }
 
   async _invokeAction(deviceId, action) {
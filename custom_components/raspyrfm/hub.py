@@ -3,23 +3,38 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
-from datetime import datetime
+from collections import deque
 import logging
 import socket
 import uuid
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Deque, Dict, Iterable, List, Optional
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 
 from .const import (
+    CONF_DEDUP_WINDOW,
     CONF_HOST,
     CONF_PORT,
+    CONF_QUEUE_OVERFLOW,
+    CONF_QUEUE_SIZE,
+    CONF_SAVE_DELAY,
+    CONF_SIGNAL_BUFFER_BYTES,
+    CONF_SIGNAL_BUFFER_SIZE,
+    DEFAULT_DEDUP_WINDOW,
     DEFAULT_PORT,
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_SAVE_DELAY,
+    DEFAULT_SIGNAL_BUFFER_BYTES,
+    DEFAULT_SIGNAL_BUFFER_SIZE,
+    DEVICE_DELTA_HISTORY,
+    QUEUE_OVERFLOW_DROP_OLDEST,
+    QUEUE_OVERFLOW_POLICIES,
     SIGNAL_DEVICE_REGISTRY_UPDATED,
     SIGNAL_DEVICE_REMOVED,
+    SIGNAL_DEVICE_SIGNAL_RECEIVED,
+    SIGNAL_DEVICES_CHANGED,
     SIGNAL_LEARNING_STATE,
     SIGNAL_SIGNAL_RECEIVED,
 )
@@ -31,19 +46,11 @@ from .storage import (
 )
 from .gateway import RaspyRFMGateway
 from .learn import LearnManager, LearnedSignal
+from .signal_buffer import SignalRingBuffer
 
 _LOGGER = logging.getLogger(__name__)
 
 
-@dataclass(slots=True)
-class ActiveSignal:
-    """Representation of a signal currently known to the hub."""
-
-    signal: LearnedSignal
-    received_at: datetime
-    source: tuple[str, int]
-
-
 class RaspyRFMHub:
     """Bridge between Home Assistant and a RaspyRFM gateway."""
 
@@ -55,11 +62,32 @@ class RaspyRFMHub:
             entry.data.get(CONF_HOST, ""),
             entry.data.get(CONF_PORT, DEFAULT_PORT),
         )
-        self._storage = RaspyRFMDeviceStorage(hass)
-        self._map_storage = RaspyRFMSignalMapStorage(hass)
-        self._learn_manager = LearnManager(hass, self)
-        self._active_signals: Dict[str, ActiveSignal] = {}
-        self._signals_lock = asyncio.Lock()
+        self._options = dict(entry.options)
+        save_delay = entry.options.get(CONF_SAVE_DELAY, DEFAULT_SAVE_DELAY)
+        self._storage = RaspyRFMDeviceStorage(hass, save_delay)
+        self._map_storage = RaspyRFMSignalMapStorage(hass, save_delay)
+        overflow_policy = entry.options.get(CONF_QUEUE_OVERFLOW, QUEUE_OVERFLOW_DROP_OLDEST)
+        if overflow_policy not in QUEUE_OVERFLOW_POLICIES:
+            _LOGGER.warning(
+                "Unknown queue overflow policy %s, using %s", overflow_policy, QUEUE_OVERFLOW_DROP_OLDEST
+            )
+            overflow_policy = QUEUE_OVERFLOW_DROP_OLDEST
+        buffer_size = entry.options.get(CONF_SIGNAL_BUFFER_SIZE, DEFAULT_SIGNAL_BUFFER_SIZE)
+        buffer_bytes = entry.options.get(CONF_SIGNAL_BUFFER_BYTES, DEFAULT_SIGNAL_BUFFER_BYTES)
+        self._learn_manager = LearnManager(
+            hass,
+            self,
+            entry.options.get(CONF_QUEUE_SIZE, DEFAULT_QUEUE_SIZE),
+            overflow_policy,
+            entry.options.get(CONF_DEDUP_WINDOW, DEFAULT_DEDUP_WINDOW),
+            buffer_size,
+            buffer_bytes,
+        )
+        self._active_signals: SignalRingBuffer[LearnedSignal] = SignalRingBuffer(
+            buffer_size, buffer_bytes, LearnedSignal.approximate_size
+        )
+        self._device_version = 0
+        self._device_deltas: Deque[Dict[str, Any]] = deque(maxlen=DEVICE_DELTA_HISTORY)
 
     @property
     def gateway(self) -> RaspyRFMGateway:
@@ -92,6 +120,12 @@ class RaspyRFMHub:
         await self._storage.async_unload()
         await self._map_storage.async_unload()
 
+    @property
+    def options(self) -> Dict[str, Any]:
+        """Return the entry options the hub was created with."""
+
+        return self._options
+
     async def async_update_entry(self, entry: ConfigEntry) -> None:
         """Handle entry updates."""
 
@@ -103,8 +137,7 @@ class RaspyRFMHub:
     async def async_start_learning(self) -> None:
         """Start a learning session."""
 
-        async with self._signals_lock:
-            self._active_signals.clear()
+        self._active_signals.clear()
         await self._learn_manager.async_start()
 
     async def async_stop_learning(self) -> None:
@@ -145,13 +178,80 @@ class RaspyRFMHub:
         )
         await self._storage.async_add_or_update(device)
         async_dispatcher_send(self._hass, SIGNAL_DEVICE_REGISTRY_UPDATED, device.device_id)
+        self._publish_device_changes([{"op": "create", "device": device.to_dict()}])
         return device
 
+    async def async_import_devices(self, devices: List[Dict[str, Any]]) -> List[RaspyRFMDeviceEntry]:
+        """Create or update many devices with a single write and registry notification.
+
+        Devices keep their ``device_id`` if one is given, otherwise a new id is assigned.
+        """
+
+        entries = [
+            RaspyRFMDeviceEntry(
+                device_id=item.get("device_id") or str(uuid.uuid4()),
+                name=item["name"],
+                device_type=item["device_type"],
+                signals=item["signals"],
+                metadata=item.get("metadata") or {},
+            )
+            for item in devices
+        ]
+        changes = [
+            {
+                "op": "update" if self._storage.get_device(entry.device_id) else "create",
+                "device": entry.to_dict(),
+            }
+            for entry in entries
+        ]
+        await self._storage.async_add_or_update_many(entries)
+        async_dispatcher_send(self._hass, SIGNAL_DEVICE_REGISTRY_UPDATED, None)
+        self._publish_device_changes(changes)
+        return entries
+
     async def async_remove_device(self, device_id: str) -> None:
         """Remove a device entry."""
 
+        existed = self._storage.get_device(device_id) is not None
         await self._storage.async_remove(device_id)
         async_dispatcher_send(self._hass, SIGNAL_DEVICE_REMOVED, device_id)
+        if existed:
+            self._publish_device_changes([{"op": "delete", "device_id": device_id}])
+
+    @property
+    def entry_id(self) -> str:
+        """Return the id of the config entry the hub belongs to."""
+
+        return self._entry.entry_id
+
+    @property
+    def device_version(self) -> int:
+        """Return the version of the device registry, increased with every change."""
+
+        return self._device_version
+
+    def _publish_device_changes(self, changes: Optional[List[Dict[str, Any]]]) -> None:
+        """Announce a new device version with its changes, None requires clients to resync."""
+
+        self._device_version += 1
+        if changes is None:
+            # older deltas can not be replayed across an unknown change
+            self._device_deltas.clear()
+            delta: Dict[str, Any] = {"version": self._device_version, "resync": True}
+        else:
+            delta = {"version": self._device_version, "changes": changes}
+            self._device_deltas.append(delta)
+        async_dispatcher_send(self._hass, SIGNAL_DEVICES_CHANGED.format(self.entry_id), delta)
+
+    def get_device_deltas(self, version: int) -> Optional[List[Dict[str, Any]]]:
+        """Return the deltas following a version, None if they are no longer known."""
+
+        if version == self._device_version:
+            return []
+        deltas = self._device_deltas
+        if not deltas or version > self._device_version or version < deltas[0]["version"] - 1:
+            return None
+        return [delta for delta in deltas if delta["version"] > version]
 
     async def async_set_signal_mapping(
         self,
@@ -184,42 +284,57 @@ class RaspyRFMHub:
     async def async_handle_learned_signal(self, signal: LearnedSignal, addr: tuple[str, int]) -> None:
         """Handle a signal received during a learning session."""
 
-        async with self._signals_lock:
-            self._active_signals[signal.uid] = ActiveSignal(
-                signal=signal, received_at=datetime.utcnow(), source=addr
-            )
+        self._active_signals.append(signal)
+        event = signal.to_dict()
         async_dispatcher_send(
             self._hass,
             SIGNAL_SIGNAL_RECEIVED,
-            signal.to_dict(),
+            event,
         )
-        await self._maybe_match_devices(signal)
+        await self._maybe_match_devices(signal, event)
 
-    async def _maybe_match_devices(self, signal: LearnedSignal) -> None:
-        """Match a learned signal with configured devices and fire updates."""
+    async def _maybe_match_devices(self, signal: LearnedSignal, event: Dict[str, Any]) -> None:
+        """Match a learned signal with configured devices and notify their entities.
 
-        matched: List[str] = []
-        for device in self._storage.iter_devices():
-            if device.matches_signal(signal.payload):
-                matched.append(device.device_id)
+        The signal may differ from the stored one in its repetitions and pause, so the event sent
+        to a device carries the matched action and entities compare that instead of the payload.
+        """
 
-        if not matched:
-            return
+        matched: Dict[str, str] = {}
+        for device_id, action in self._storage.find_by_payload(signal.payload):
+            matched.setdefault(device_id, action)
 
-        for device_id in matched:
-            async_dispatcher_send(self._hass, SIGNAL_DEVICE_REGISTRY_UPDATED, device_id)
+        for device_id, action in matched.items():
+            async_dispatcher_send(
+                self._hass, SIGNAL_DEVICE_SIGNAL_RECEIVED.format(device_id), {**event, "action": action}
+            )
 
     async def async_list_active_signals(self) -> List[Dict[str, Any]]:
         """Return a snapshot of all active signals."""
 
-        async with self._signals_lock:
-            return [signal.signal.to_dict() for signal in self._active_signals.values()]
+        return [signal.to_dict() for signal in self._active_signals]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return runtime metrics of the hub."""
+
+        return {
+            "storage": {
+                "devices": self._storage.get_stats(),
+                "mappings": self._map_storage.get_stats(),
+            },
+            "receive_queue": self._learn_manager.get_stats(),
+            "signal_buffers": {
+                "learned": self._learn_manager.get_buffer_stats(),
+                "active": self._active_signals.get_stats(),
+            },
+        }
 
     async def async_reload_devices(self) -> None:
         """Reload device information from disk."""
 
         await self._storage.async_load()
         async_dispatcher_send(self._hass, SIGNAL_DEVICE_REGISTRY_UPDATED, None)
+        self._publish_device_changes(None)
 
     async def async_record_learning_state(self, active: bool) -> None:
         """Announce a change of the learning state."""
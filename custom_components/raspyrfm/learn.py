@@ -3,42 +3,101 @@
 from __future__ import annotations
 
 import asyncio
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import islice
 import logging
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
-
-from homeassistant.core import HomeAssistant
-
-from .classifier import classify_payload
-from .const import DEFAULT_LISTEN_PORT
+import math
+import sys
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+
+from .classifier import SignalClassification, classify_payload, frame_key
+from .const import (
+    DEFAULT_DEDUP_WINDOW,
+    DEFAULT_LISTEN_PORT,
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_SIGNAL_BUFFER_BYTES,
+    DEFAULT_SIGNAL_BUFFER_SIZE,
+    QUEUE_OVERFLOW_DROP_NEWEST,
+    QUEUE_OVERFLOW_DROP_OLDEST,
+    QUEUE_OVERFLOW_POLICIES,
+)
+from .signal_buffer import SignalRingBuffer
 
 if TYPE_CHECKING:
     from .hub import RaspyRFMHub
 
 _LOGGER = logging.getLogger(__name__)
 
+# rough size of a LearnedSignal and its fields excluding the payload and the source tally
+_SIGNAL_OVERHEAD_BYTES = 512
+_SOURCE_OVERHEAD_BYTES = 64
+
 
 @dataclass(slots=True)
 class LearnedSignal:
-    """Representation of a learned radio signal."""
+    """Representation of a learned radio signal.
+
+    The metadata is only built by to_dict, so a buffered signal holds no per-signal dict
+    besides the source tally.
+    """
 
     uid: str
+    seq: int
     payload: str
     received: datetime
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    source: str
+    port: int
+    repeat_count: int = 1
+    sources: Dict[str, int] = field(default_factory=dict)
+    classification: Optional[SignalClassification] = None
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Return the metadata reported to the frontend."""
+
+        metadata: Dict[str, Any] = {
+            "source": self.source,
+            "port": self.port,
+            "repeat_count": self.repeat_count,
+            "sources": self.sources,
+        }
+        if self.classification is not None:
+            metadata["classification"] = self.classification.to_dict()
+        return metadata
+
+    def approximate_size(self) -> int:
+        """Return the approximate memory used by the signal in bytes."""
+
+        return _SIGNAL_OVERHEAD_BYTES + len(self.payload) + _SOURCE_OVERHEAD_BYTES * len(self.sources)
 
     def to_dict(self) -> Dict[str, Any]:
         """Return a serialisable representation."""
 
         return {
             "uid": self.uid,
+            "seq": self.seq,
             "payload": self.payload,
             "received": self.received.isoformat(),
             "metadata": self.metadata,
         }
 
 
+@dataclass(slots=True)
+class PendingRepeat:
+    """First copy of a frame and the repeats received within the dedup window."""
+
+    payload: str
+    addr: Tuple[str, int]
+    received: datetime
+    deadline: float
+    repeat_count: int = 1
+    sources: Dict[str, int] = field(default_factory=dict)
+
+
 class RaspyRFMLearnProtocol(asyncio.DatagramProtocol):
     """Asyncio datagram protocol for capturing signals."""
 
@@ -50,20 +109,59 @@ class RaspyRFMLearnProtocol(asyncio.DatagramProtocol):
         if not payload:
             return
 
-        asyncio.create_task(self._manager.async_process_datagram(payload, addr))
+        self._manager.async_enqueue_datagram(payload, addr)
 
 
 class LearnManager:
-    """Manage RaspyRFM learning sessions."""
-
-    def __init__(self, hass: HomeAssistant, hub: RaspyRFMHub) -> None:
+    """Manage RaspyRFM learning sessions.
+
+    Datagrams are buffered in a bounded queue that a single consumer task drains, when the
+    queue is full the oldest or the newest datagram is dropped depending on the overflow policy.
+    Copies of the same frame received within the dedup window are collapsed into one signal that
+    carries the number of copies and how many of them each source reported.  Captured signals
+    are kept in a ring buffer capped by count and approximate size, the oldest are evicted first.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        hub: RaspyRFMHub,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow_policy: str = QUEUE_OVERFLOW_DROP_OLDEST,
+        dedup_window: float = DEFAULT_DEDUP_WINDOW,
+        buffer_size: int = DEFAULT_SIGNAL_BUFFER_SIZE,
+        buffer_bytes: int = DEFAULT_SIGNAL_BUFFER_BYTES,
+    ) -> None:
+        if overflow_policy not in QUEUE_OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown queue overflow policy: {overflow_policy}")
         self._hass = hass
         self._hub = hub
         self._transport: Optional[asyncio.transports.DatagramTransport] = None
         self._active = False
         self._listen_port = DEFAULT_LISTEN_PORT
-        self._signals: List[LearnedSignal] = []
-        self._lock = asyncio.Lock()
+        self._signals: SignalRingBuffer[LearnedSignal] = SignalRingBuffer(
+            buffer_size, buffer_bytes, LearnedSignal.approximate_size
+        )
+        self._signal_count = 0
+        # sequence numbers are never reset so that clients can keep their cursor across sessions
+        self._seq = 0
+        self._queue: asyncio.Queue[Tuple[str, Tuple[str, int]]] = asyncio.Queue(maxsize=max(1, queue_size))
+        self._overflow_policy = overflow_policy
+        self._consumer: Optional[asyncio.Task] = None
+        self._queue_stats: Dict[str, int] = {
+            "enqueued": 0,
+            "processed": 0,
+            "dropped_oldest": 0,
+            "dropped_newest": 0,
+            "errors": 0,
+            "max_depth": 0,
+        }
+        self._dedup_window = max(0.0, dedup_window)
+        self._pending: Dict[Any, PendingRepeat] = {}
+        self._dedup_stats: Dict[str, int] = {
+            "signals": 0,
+            "collapsed": 0,
+        }
 
     @property
     def is_active(self) -> bool:
@@ -82,6 +180,8 @@ class LearnManager:
             lambda: RaspyRFMLearnProtocol(self), local_addr=("0.0.0.0", self._listen_port)
         )
         self._signals.clear()
+        self._signal_count = 0
+        self._consumer = loop.create_task(self._async_consume())
         self._active = True
         try:
             await self._hub.async_send_raw("RXSTART")
@@ -98,6 +198,17 @@ class LearnManager:
         if self._transport is not None:
             self._transport.close()
             self._transport = None
+        if self._consumer is not None:
+            self._consumer.cancel()
+            try:
+                await self._consumer
+            except asyncio.CancelledError:
+                pass
+            self._consumer = None
+        # repeats still inside their dedup window were received before the stop
+        await self._async_flush_repeats(math.inf)
+        while not self._queue.empty():
+            self._queue.get_nowait()
         self._active = False
         try:
             await self._hub.async_send_raw("RXSTOP")
@@ -105,33 +216,165 @@ class LearnManager:
             _LOGGER.debug("Unable to send RXSTOP command to gateway")
         await self._hub.async_record_learning_state(False)
 
-    async def async_process_datagram(self, payload: str, addr: Tuple[str, int]) -> None:
-        """Process an incoming UDP datagram."""
+    @callback
+    def async_enqueue_datagram(self, payload: str, addr: Tuple[str, int]) -> None:
+        """Queue a received datagram for processing, applying the overflow policy."""
+
+        queue = self._queue
+        stats = self._queue_stats
+        if queue.full():
+            if self._overflow_policy == QUEUE_OVERFLOW_DROP_NEWEST:
+                stats["dropped_newest"] += 1
+                return
+            queue.get_nowait()
+            stats["dropped_oldest"] += 1
+        queue.put_nowait((payload, addr))
+        stats["enqueued"] += 1
+        if queue.qsize() > stats["max_depth"]:
+            stats["max_depth"] = queue.qsize()
+
+    async def _async_consume(self) -> None:
+        """Process queued datagrams one at a time, collapsing repeats within the dedup window."""
+
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        pending = self._pending
+        while True:
+            if not pending:
+                item = await queue.get()
+            else:
+                # the window has the same length for every frame, so the oldest entry expires first
+                timeout = next(iter(pending.values())).deadline - loop.time()
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout) if timeout > 0 else None
+                except asyncio.TimeoutError:
+                    item = None
+
+            if item is None:
+                await self._async_flush_repeats(loop.time())
+                continue
+
+            payload, addr = item
+            self._queue_stats["processed"] += 1
+            if self._dedup_window <= 0:
+                await self._async_process_queued(payload, addr, 1, {addr[0]: 1})
+                continue
+
+            key = frame_key(payload)
+            repeat = pending.get(key)
+            if repeat is None:
+                pending[key] = PendingRepeat(
+                    payload=payload,
+                    addr=addr,
+                    received=datetime.utcnow(),
+                    deadline=loop.time() + self._dedup_window,
+                    sources={addr[0]: 1},
+                )
+            else:
+                repeat.repeat_count += 1
+                repeat.sources[addr[0]] = repeat.sources.get(addr[0], 0) + 1
+                self._dedup_stats["collapsed"] += 1
+
+    async def _async_flush_repeats(self, now: float) -> None:
+        """Process the frames whose dedup window has closed."""
+
+        pending = self._pending
+        while pending:
+            key, repeat = next(iter(pending.items()))
+            if repeat.deadline > now:
+                break
+            del pending[key]
+            await self._async_process_queued(
+                repeat.payload, repeat.addr, repeat.repeat_count, repeat.sources, repeat.received
+            )
+
+    async def _async_process_queued(
+        self,
+        payload: str,
+        addr: Tuple[str, int],
+        repeat_count: int,
+        sources: Dict[str, int],
+        received: Optional[datetime] = None,
+    ) -> None:
+        """Process a (collapsed) datagram, counting errors instead of raising."""
+
+        try:
+            await self.async_process_datagram(payload, addr, repeat_count, sources, received)
+        except Exception:
+            self._queue_stats["errors"] += 1
+            _LOGGER.exception("Error processing datagram from %s", addr[0])
+        else:
+            self._dedup_stats["signals"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return queue and deduplication metrics of the receive path."""
+
+        return {
+            **self._queue_stats,
+            "depth": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            "overflow_policy": self._overflow_policy,
+            "dedup": {
+                **self._dedup_stats,
+                "pending": len(self._pending),
+                "window": self._dedup_window,
+            },
+        }
+
+    def get_buffer_stats(self) -> Dict[str, Any]:
+        """Return the fill level of the captured signal buffer."""
+
+        return self._signals.get_stats()
+
+    async def async_process_datagram(
+        self,
+        payload: str,
+        addr: Tuple[str, int],
+        repeat_count: int = 1,
+        sources: Optional[Dict[str, int]] = None,
+        received: Optional[datetime] = None,
+    ) -> None:
+        """Process an incoming UDP datagram and the number of copies received of it."""
 
         if not payload:
             return
 
+        self._signal_count += 1
+        self._seq += 1
         signal = LearnedSignal(
-            uid=f"sig_{len(self._signals)+1}",
-            payload=payload,
-            received=datetime.utcnow(),
-            metadata={"source": addr[0], "port": addr[1]},
+            uid=f"sig_{self._signal_count}",
+            seq=self._seq,
+            # repeated presses of a remote share one payload string
+            payload=sys.intern(payload),
+            received=received or datetime.utcnow(),
+            source=addr[0],
+            port=addr[1],
+            repeat_count=repeat_count,
+            sources=sources if sources is not None else {addr[0]: repeat_count},
+            classification=classify_payload(payload),
         )
-        classification = classify_payload(payload)
-        if classification:
-            signal.metadata["classification"] = classification.to_dict()
-        async with self._lock:
-            self._signals.append(signal)
+        self._signals.append(signal)
         await self._hub.async_handle_learned_signal(signal, addr)
 
-    async def async_list_signals(self) -> List[Dict[str, Any]]:
-        """Return a list of captured signals."""
+    async def async_list_signals(self, since: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Return the captured signals with a sequence number above the cursor, oldest first.
 
-        async with self._lock:
-            return [signal.to_dict() for signal in self._signals]
+        The result holds at most limit signals, the cursor to pass as since to fetch the next
+        page, whether more signals are available and the newest sequence number.
+        """
+
+        signals = self._signals
+        start = bisect_right(signals, since, key=lambda signal: signal.seq)
+        page = [signal.to_dict() for signal in islice(signals.iter_from(start), limit)]
+        return {
+            "signals": page,
+            "cursor": page[-1]["seq"] if page else since,
+            "has_more": start + len(page) < len(signals),
+            "latest": self._seq,
+        }
 
     async def async_clear_signals(self) -> None:
         """Clear the signal buffer."""
 
-        async with self._lock:
-            self._signals.clear()
+        self._signals.clear()
+        self._signal_count = 0
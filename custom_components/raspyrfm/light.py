@@ -8,7 +8,7 @@ from homeassistant.components.light import ColorMode, LightEntity
 from homeassistant.core import callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from .const import DOMAIN, SIGNAL_DEVICE_REGISTRY_UPDATED, SIGNAL_SIGNAL_RECEIVED
+from .const import DOMAIN, SIGNAL_DEVICE_REGISTRY_UPDATED, SIGNAL_DEVICE_SIGNAL_RECEIVED
 from .entity import RaspyRFMEntity
 from .hub import RaspyRFMHub
 from .storage import RaspyRFMDeviceEntry
@@ -58,14 +58,14 @@ class RaspyRFMLight(RaspyRFMEntity, LightEntity):
 
         @callback
         def handle_signal(event: Dict[str, Any]) -> None:
-            payload = event.get("payload")
-            if payload == self._device.signals.get("on"):
+            action = event.get("action")
+            if action == "on":
                 self._attr_is_on = True
-            elif payload == self._device.signals.get("off"):
+            elif action == "off":
                 self._attr_is_on = False
-            elif payload == self._device.signals.get("bright"):
+            elif action == "bright":
                 self._attr_is_on = True
-            elif payload == self._device.signals.get("dim") and "off" not in self._device.signals:
+            elif action == "dim" and "off" not in self._device.signals:
                 # Devices without an explicit OFF signal often dim to turn off.
                 self._attr_is_on = False
             else:
@@ -73,7 +73,7 @@ class RaspyRFMLight(RaspyRFMEntity, LightEntity):
             self.async_write_ha_state()
 
         self._signal_unsub = async_dispatcher_connect(
-            self.hass, SIGNAL_SIGNAL_RECEIVED, handle_signal
+            self.hass, SIGNAL_DEVICE_SIGNAL_RECEIVED.format(self._device.device_id), handle_signal
         )
 
     async def async_will_remove_from_hass(self) -> None:
@@ -8,7 +8,7 @@ from homeassistant.components.sensor import SensorEntity
 from homeassistant.core import callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from .const import DOMAIN, SIGNAL_DEVICE_REGISTRY_UPDATED, SIGNAL_SIGNAL_RECEIVED
+from .const import DOMAIN, SIGNAL_DEVICE_REGISTRY_UPDATED, SIGNAL_DEVICE_SIGNAL_RECEIVED
 from .entity import RaspyRFMEntity
 from .hub import RaspyRFMHub
 from .storage import RaspyRFMDeviceEntry
@@ -57,15 +57,13 @@ class RaspyRFMUniversalSensor(RaspyRFMEntity, SensorEntity):
 
         @callback
         def handle_signal(event: Dict[str, Any]) -> None:
-            payload = event.get("payload")
-            for action, stored_payload in self._device.signals.items():
-                if payload == stored_payload:
-                    self._attr_native_value = action
-                    self.async_write_ha_state()
-                    break
+            action = event.get("action")
+            if action in self._device.signals:
+                self._attr_native_value = action
+                self.async_write_ha_state()
 
         self._signal_unsub = async_dispatcher_connect(
-            self.hass, SIGNAL_SIGNAL_RECEIVED, handle_signal
+            self.hass, SIGNAL_DEVICE_SIGNAL_RECEIVED.format(self._device.device_id), handle_signal
         )
 
     async def async_will_remove_from_hass(self) -> None:
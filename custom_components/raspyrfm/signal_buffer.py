@@ -0,0 +1,88 @@
+"""Bounded buffer for signals captured by the RaspyRFM integration."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
+
+_T = TypeVar("_T")
+
+
+class SignalRingBuffer(Generic[_T]):
+    """Fixed-capacity ring buffer capped by entry count and approximate size in bytes.
+
+    When a cap is exceeded the oldest entries are evicted.  Entries are indexed from the oldest
+    (0) to the newest in constant time.  The buffer is only touched from the event loop, readers
+    iterate over it synchronously and therefore need neither a lock nor a copy.
+    """
+
+    __slots__ = ("_slots", "_start", "_count", "_size_func", "_max_bytes", "_bytes", "_evicted")
+
+    def __init__(self, max_entries: int, max_bytes: int, size_func: Callable[[_T], int]) -> None:
+        self._slots: List[Optional[Tuple[_T, int]]] = [None] * max(1, max_entries)
+        self._start = 0
+        self._count = 0
+        self._size_func = size_func
+        self._max_bytes = max(1, max_bytes)
+        self._bytes = 0
+        self._evicted = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> _T:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("SignalRingBuffer index out of range")
+        return self._slots[(self._start + index) % len(self._slots)][0]
+
+    def __iter__(self) -> Iterator[_T]:
+        return self.iter_from(0)
+
+    def iter_from(self, index: int) -> Iterator[_T]:
+        """Iterate over the entries from the given index to the newest."""
+
+        slots = self._slots
+        capacity = len(slots)
+        for offset in range(max(0, index), self._count):
+            yield slots[(self._start + offset) % capacity][0]
+
+    def append(self, entry: _T) -> None:
+        """Add an entry, evicting the oldest entries while a cap is exceeded."""
+
+        size = self._size_func(entry)
+        if self._count == len(self._slots):
+            self._evict_oldest()
+        self._slots[(self._start + self._count) % len(self._slots)] = (entry, size)
+        self._count += 1
+        self._bytes += size
+        # the newest entry is always kept, even if it exceeds the byte cap on its own
+        while self._count > 1 and self._bytes > self._max_bytes:
+            self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        _entry, size = self._slots[self._start]
+        self._slots[self._start] = None
+        self._start = (self._start + 1) % len(self._slots)
+        self._count -= 1
+        self._bytes -= size
+        self._evicted += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+
+        self._slots = [None] * len(self._slots)
+        self._start = 0
+        self._count = 0
+        self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the fill level and the number of evicted entries."""
+
+        return {
+            "entries": self._count,
+            "bytes": self._bytes,
+            "max_entries": len(self._slots),
+            "max_bytes": self._max_bytes,
+            "evicted": self._evicted,
+        }
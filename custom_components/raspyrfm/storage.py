@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.storage import Store
 
+from .classifier import frame_key
 from .const import (
+    DEFAULT_SAVE_DELAY,
     MAPPING_CATEGORIES,
     MAPPING_STORAGE_KEY,
     MAPPING_STORAGE_VERSION,
@@ -39,9 +41,10 @@ class RaspyRFMDeviceEntry:
         }
 
     def matches_signal(self, payload: str) -> bool:
-        """Return True if the payload matches this device."""
+        """Return True if the payload matches this device apart from repetitions and pause."""
 
-        return payload in self.signals.values()
+        key = frame_key(payload)
+        return any(frame_key(signal) == key for signal in self.signals.values())
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "RaspyRFMDeviceEntry":
@@ -91,18 +94,82 @@ class RaspyRFMSignalMapping:
         )
 
 
+class CoalescingStore:
+    """Store wrapper collecting mutations into a single delayed write."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        version: int,
+        key: str,
+        data_func: Callable[[], Dict[str, Any]],
+        save_delay: float,
+    ) -> None:
+        self._store: Store = Store(hass, version, key)
+        self._data_func = data_func
+        self._save_delay = save_delay
+        self._dirty = False
+        self._mutations = 0
+        self._writes = 0
+
+    async def async_load(self) -> Optional[Dict[str, Any]]:
+        """Load the stored data, pending changes are written first."""
+
+        await self.async_flush()
+        return await self._store.async_load()
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Mark the data as changed and (re)schedule the delayed write."""
+
+        self._dirty = True
+        self._mutations += 1
+        self._store.async_delay_save(self._async_write_data, self._save_delay)
+
+    async def async_flush(self) -> None:
+        """Write pending changes immediately."""
+
+        if self._dirty:
+            await self._store.async_save(self._async_write_data())
+
+    @callback
+    def _async_write_data(self) -> Dict[str, Any]:
+        """Return the data to write, called by the store when it writes."""
+
+        self._dirty = False
+        self._writes += 1
+        return self._data_func()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return write coalescing counters."""
+
+        return {
+            "mutations": self._mutations,
+            "writes": self._writes,
+            "writes_saved": max(0, self._mutations - self._writes - (1 if self._dirty else 0)),
+            "pending": self._dirty,
+            "save_delay": self._save_delay,
+        }
+
+
 class RaspyRFMDeviceStorage:
     """Storage helper managing device persistence."""
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(self, hass: HomeAssistant, save_delay: float = DEFAULT_SAVE_DELAY) -> None:
         self._hass = hass
-        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._store = CoalescingStore(hass, STORAGE_VERSION, STORAGE_KEY, self._data_to_save, save_delay)
         self._devices: Dict[str, RaspyRFMDeviceEntry] = {}
+        # frame key of a payload -> [(device_id, action)], kept in sync with _devices
+        self._payload_index: Dict[Any, List[Tuple[str, str]]] = {}
+        # device_id -> frame keys the device is indexed under, entries may be mutated in place
+        self._indexed_payloads: Dict[str, List[Any]] = {}
 
     async def async_load(self) -> None:
         """Load device information from disk."""
 
         data = await self._store.async_load()
+        self._payload_index = {}
+        self._indexed_payloads = {}
         if not data:
             self._devices = {}
             return
@@ -111,11 +178,23 @@ class RaspyRFMDeviceStorage:
             RaspyRFMDeviceEntry.from_dict(item) for item in data.get("devices", [])
         ]
         self._devices = {device.device_id: device for device in devices}
+        for device in devices:
+            self._index_device(device)
 
     async def async_unload(self) -> None:
         """Flush changes to disk."""
 
-        await self._store.async_save({"devices": [device.to_dict() for device in self._devices.values()]})
+        await self._store.async_flush()
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the serialisable store content."""
+
+        return {"devices": [device.to_dict() for device in self._devices.values()]}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return write coalescing counters."""
+
+        return self._store.get_stats()
 
     def iter_devices(self) -> Iterable[RaspyRFMDeviceEntry]:
         """Iterate over all devices."""
@@ -132,25 +211,69 @@ class RaspyRFMDeviceStorage:
 
         return self._devices.get(device_id)
 
+    def find_by_payload(self, payload: str) -> List[Tuple[str, str]]:
+        """Return (device_id, action) of every stored signal with the frame of the payload.
+
+        Payloads are compared by frame_key, i.e. independent of their repetitions and pause, the
+        same way the receive path collapses repeated copies of a frame.
+        """
+
+        return list(self._payload_index.get(frame_key(payload), ()))
+
     async def async_add_or_update(self, device: RaspyRFMDeviceEntry) -> None:
         """Persist a device entry."""
 
+        self._unindex_device(device.device_id)
         self._devices[device.device_id] = device
-        await self._store.async_save({"devices": [d.to_dict() for d in self._devices.values()]})
+        self._index_device(device)
+        self._store.async_schedule_save()
+
+    async def async_add_or_update_many(self, devices: Iterable[RaspyRFMDeviceEntry]) -> None:
+        """Persist multiple device entries with a single write."""
+
+        for device in devices:
+            self._unindex_device(device.device_id)
+            self._devices[device.device_id] = device
+            self._index_device(device)
+        self._store.async_schedule_save()
 
     async def async_remove(self, device_id: str) -> None:
         """Remove a device entry."""
 
         if device_id in self._devices:
             self._devices.pop(device_id)
-            await self._store.async_save({"devices": [d.to_dict() for d in self._devices.values()]})
+            self._unindex_device(device_id)
+            self._store.async_schedule_save()
+
+    def _index_device(self, device: RaspyRFMDeviceEntry) -> None:
+        """Add the signals of a device to the payload index."""
+
+        keys: List[Any] = []
+        for action, payload in device.signals.items():
+            key = frame_key(payload)
+            self._payload_index.setdefault(key, []).append((device.device_id, action))
+            keys.append(key)
+        self._indexed_payloads[device.device_id] = keys
+
+    def _unindex_device(self, device_id: str) -> None:
+        """Remove the signals of a device from the payload index."""
+
+        for key in self._indexed_payloads.pop(device_id, ()):
+            entries = self._payload_index.get(key)
+            if entries is None:
+                continue
+            entries[:] = [entry for entry in entries if entry[0] != device_id]
+            if not entries:
+                del self._payload_index[key]
 
 
 class RaspyRFMSignalMapStorage:
     """Storage helper for signal mapping metadata."""
 
-    def __init__(self, hass: HomeAssistant) -> None:
-        self._store = Store(hass, MAPPING_STORAGE_VERSION, MAPPING_STORAGE_KEY)
+    def __init__(self, hass: HomeAssistant, save_delay: float = DEFAULT_SAVE_DELAY) -> None:
+        self._store = CoalescingStore(
+            hass, MAPPING_STORAGE_VERSION, MAPPING_STORAGE_KEY, self._data_to_save, save_delay
+        )
         self._mappings: Dict[str, RaspyRFMSignalMapping] = {}
 
     async def async_load(self) -> None:
@@ -167,7 +290,17 @@ class RaspyRFMSignalMapStorage:
     async def async_unload(self) -> None:
         """Persist mapping state to disk."""
 
-        await self._store.async_save({"mappings": [entry.to_dict() for entry in self._mappings.values()]})
+        await self._store.async_flush()
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the serialisable store content."""
+
+        return {"mappings": [entry.to_dict() for entry in self._mappings.values()]}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return write coalescing counters."""
+
+        return self._store.get_stats()
 
     def iter_mappings(self) -> Iterable[RaspyRFMSignalMapping]:
         """Iterate over all known mappings."""
@@ -183,11 +316,11 @@ class RaspyRFMSignalMapStorage:
         """Store or update a mapping entry."""
 
         self._mappings[mapping.payload] = mapping
-        await self._store.async_save({"mappings": [entry.to_dict() for entry in self._mappings.values()]})
+        self._store.async_schedule_save()
 
     async def async_remove(self, payload: str) -> None:
         """Remove a mapping entry."""
 
         if payload in self._mappings:
             self._mappings.pop(payload)
-            await self._store.async_save({"mappings": [entry.to_dict() for entry in self._mappings.values()]})
+            self._store.async_schedule_save()
@@ -9,7 +9,7 @@ from homeassistant.components.switch import SwitchEntity
 from homeassistant.core import callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from .const import DOMAIN, SIGNAL_DEVICE_REGISTRY_UPDATED, SIGNAL_SIGNAL_RECEIVED
+from .const import DOMAIN, SIGNAL_DEVICE_REGISTRY_UPDATED, SIGNAL_DEVICE_SIGNAL_RECEIVED
 from .entity import RaspyRFMEntity
 from .hub import RaspyRFMHub
 from .storage import RaspyRFMDeviceEntry
@@ -59,16 +59,16 @@ class RaspyRFMSwitch(RaspyRFMEntity, SwitchEntity):
 
         @callback
         def handle_signal(event: Dict[str, Any]) -> None:
-            payload = event.get("payload")
-            if payload == self._device.signals.get("on"):
+            action = event.get("action")
+            if action == "on":
                 self._attr_is_on = True
                 self.async_write_ha_state()
-            elif payload == self._device.signals.get("off"):
+            elif action == "off":
                 self._attr_is_on = False
                 self.async_write_ha_state()
 
         self._signal_unsub = async_dispatcher_connect(
-            self.hass, SIGNAL_SIGNAL_RECEIVED, handle_signal
+            self.hass, SIGNAL_DEVICE_SIGNAL_RECEIVED.format(self._device.device_id), handle_signal
         )
 
     async def async_will_remove_from_hass(self) -> None:
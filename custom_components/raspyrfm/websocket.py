@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, Set
+from typing import Any, Callable, Dict, List, Optional, Set
 
 import voluptuous as vol
 
@@ -13,15 +14,22 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.components import websocket_api
 
 from .const import (
+    DEFAULT_SIGNAL_BATCH_SIZE,
     DOMAIN,
     MAPPING_CATEGORIES,
+    MAX_SIGNAL_BATCH_WINDOW,
+    SIGNAL_DEVICES_CHANGED,
     SIGNAL_LEARNING_STATE,
     SIGNAL_SIGNAL_RECEIVED,
+    STORAGE_VERSION,
     WS_TYPE_DEVICE_CREATE,
     WS_TYPE_DEVICE_DELETE,
+    WS_TYPE_DEVICE_EXPORT,
+    WS_TYPE_DEVICE_IMPORT,
     WS_TYPE_DEVICE_LIST,
     WS_TYPE_DEVICE_RELOAD,
     WS_TYPE_DEVICE_SEND,
+    WS_TYPE_DEVICE_SUBSCRIBE,
     WS_TYPE_LEARNING_START,
     WS_TYPE_LEARNING_STATUS,
     WS_TYPE_LEARNING_STOP,
@@ -31,12 +39,14 @@ from .const import (
     WS_TYPE_SIGNAL_MAP_UPDATE,
     WS_TYPE_SIGNALS_LIST,
     WS_TYPE_SIGNALS_SUBSCRIBE,
+    WS_TYPE_STATS,
 )
 from .hub import RaspyRFMHub
 
 _LOGGER = logging.getLogger(__name__)
 
 HANDLERS_REGISTERED = "_raspyrfm_ws_handlers"
+SUBSCRIPTION_STATS = "_raspyrfm_ws_subscription_stats"
 
 
 def async_register_websocket_handlers(hass: HomeAssistant) -> None:
@@ -54,11 +64,15 @@ def async_register_websocket_handlers(hass: HomeAssistant) -> None:
     websocket_api.async_register_command(hass, handle_device_create)
     websocket_api.async_register_command(hass, handle_device_delete)
     websocket_api.async_register_command(hass, handle_device_list)
+    websocket_api.async_register_command(hass, handle_device_subscribe)
+    websocket_api.async_register_command(hass, handle_device_import)
+    websocket_api.async_register_command(hass, handle_device_export)
     websocket_api.async_register_command(hass, handle_device_reload)
     websocket_api.async_register_command(hass, handle_device_send_action)
     websocket_api.async_register_command(hass, handle_signal_map_list)
     websocket_api.async_register_command(hass, handle_signal_map_update)
     websocket_api.async_register_command(hass, handle_signal_map_delete)
+    websocket_api.async_register_command(hass, handle_stats)
 
     hass.data[HANDLERS_REGISTERED] = True
 
@@ -126,41 +140,150 @@ def handle_learning_subscribe(hass: HomeAssistant, connection: websocket_api.Act
     connection.send_result(msg["id"])
 
 
-@websocket_api.websocket_command({vol.Required("type"): WS_TYPE_SIGNALS_LIST, vol.Optional("entry_id"): str})
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_SIGNALS_LIST,
+        vol.Optional("entry_id"): str,
+        vol.Optional("since", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional("limit"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
 @websocket_api.async_response
 async def handle_signals_list(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]) -> None:
-    """Return a list of currently captured signals."""
+    """Return the captured signals newer than the since cursor, at most limit of them."""
 
     hub = _get_hub(hass, msg)
-    signals = await hub.learn_manager.async_list_signals()
-    connection.send_result(msg["id"], {"signals": signals})
+    result = await hub.learn_manager.async_list_signals(msg["since"], msg.get("limit"))
+    connection.send_result(msg["id"], result)
+
+
+def _get_subscription_stats(hass: HomeAssistant) -> Dict[str, int]:
+    return hass.data.setdefault(SUBSCRIPTION_STATS, {"events": 0, "messages": 0})
+
+
+class SignalBatcher:
+    """Collect signal events of a subscription and send them as one array message.
+
+    A batch is sent when the window has passed since its first event or when it holds
+    max_events events, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        send: Callable[[List[Dict[str, Any]]], None],
+        window: float,
+        max_events: int,
+    ) -> None:
+        self._hass = hass
+        self._send = send
+        self._window = window
+        self._max_events = max_events
+        self._events: List[Dict[str, Any]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @callback
+    def async_add(self, event: Dict[str, Any]) -> None:
+        """Add an event to the current batch."""
 
+        self._events.append(event)
+        if len(self._events) >= self._max_events:
+            self.async_flush()
+        elif self._timer is None:
+            self._timer = self._hass.loop.call_later(self._window, self.async_flush)
 
-@websocket_api.websocket_command({vol.Required("type"): WS_TYPE_SIGNALS_SUBSCRIBE, vol.Optional("entry_id"): str})
+    @callback
+    def async_flush(self) -> None:
+        """Send the current batch."""
+
+        self.async_cancel()
+        if self._events:
+            events, self._events = self._events, []
+            self._send(events)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop the pending timer without sending."""
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_SIGNALS_SUBSCRIBE,
+        vol.Optional("entry_id"): str,
+        vol.Optional("batch_window"): vol.All(
+            vol.Coerce(float), vol.Range(min=0, min_included=False, max=MAX_SIGNAL_BATCH_WINDOW)
+        ),
+        vol.Optional("batch_size", default=DEFAULT_SIGNAL_BATCH_SIZE): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
 @callback
 def handle_signals_subscribe(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]) -> None:
-    """Subscribe to incoming signals."""
+    """Subscribe to incoming signals.
+
+    Without batch_window every signal is sent as its own event, with it the events are sent as
+    arrays of up to batch_size signals.
+    """
+
+    stats = _get_subscription_stats(hass)
 
     @callback
-    def forward(payload: Dict[str, Any]) -> None:
+    def send(payload: Any) -> None:
+        stats["messages"] += 1
         connection.send_message(websocket_api.event_message(msg["id"], payload))
 
-    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
-        hass, SIGNAL_SIGNAL_RECEIVED, forward
-    )
+    window = msg.get("batch_window")
+    if window is None:
+
+        @callback
+        def forward(payload: Dict[str, Any]) -> None:
+            stats["events"] += 1
+            send(payload)
+
+        connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+            hass, SIGNAL_SIGNAL_RECEIVED, forward
+        )
+        connection.send_result(msg["id"])
+        return
+
+    batcher = SignalBatcher(hass, send, window, msg["batch_size"])
+
+    @callback
+    def collect(payload: Dict[str, Any]) -> None:
+        stats["events"] += 1
+        batcher.async_add(payload)
+
+    unsubscribe = async_dispatcher_connect(hass, SIGNAL_SIGNAL_RECEIVED, collect)
+
+    @callback
+    def async_unsubscribe() -> None:
+        unsubscribe()
+        batcher.async_cancel()
+
+    connection.subscriptions[msg["id"]] = async_unsubscribe
     connection.send_result(msg["id"])
 
 
 SUPPORTED_DEVICE_TYPES = ["switch", "binary_sensor", "light", "button", "universal"]
 
 
-_DEVICE_CREATE_SCHEMA = websocket_api.BASE_COMMAND_MESSAGE_SCHEMA.extend(
+# a device as accepted by devices/create and, once per device, by devices/import
+_DEVICE_SCHEMA = vol.Schema(
     {
-        vol.Required("type"): WS_TYPE_DEVICE_CREATE,
         vol.Required("name"): cv.string,
         vol.Required("device_type"): vol.In(SUPPORTED_DEVICE_TYPES),
         vol.Required("signals"): {cv.string: cv.string},
         vol.Optional("metadata"): {cv.string: cv.Any()},
+    }
+)
+
+
+_DEVICE_CREATE_SCHEMA = websocket_api.BASE_COMMAND_MESSAGE_SCHEMA.extend(_DEVICE_SCHEMA.schema).extend(
+    {
+        vol.Required("type"): WS_TYPE_DEVICE_CREATE,
         vol.Optional("entry_id"): str,
     }
 )
@@ -200,7 +323,102 @@ async def handle_device_list(hass: HomeAssistant, connection: websocket_api.Acti
 
     hub = _get_hub(hass, msg)
     devices = [device.to_dict() for device in hub.iter_devices()]
-    connection.send_result(msg["id"], {"devices": devices})
+    connection.send_result(msg["id"], {"version": hub.device_version, "devices": devices})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_DEVICE_SUBSCRIBE,
+        vol.Optional("entry_id"): str,
+        vol.Optional("version"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    }
+)
+@callback
+def handle_device_subscribe(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]) -> None:
+    """Subscribe to versioned device changes.
+
+    The client first receives the deltas since the given version or, if they are no longer
+    known, a snapshot of all devices with ``resync`` set.  Afterwards every change is sent as a
+    delta with the next version; a client that misses a version resubscribes with its last one.
+    """
+
+    hub = _get_hub(hass, msg)
+
+    @callback
+    def send_snapshot() -> None:
+        devices = [device.to_dict() for device in hub.iter_devices()]
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"], {"version": hub.device_version, "resync": True, "devices": devices}
+            )
+        )
+
+    @callback
+    def forward(delta: Dict[str, Any]) -> None:
+        if delta.get("resync"):
+            send_snapshot()
+        else:
+            connection.send_message(websocket_api.event_message(msg["id"], delta))
+
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, SIGNAL_DEVICES_CHANGED.format(hub.entry_id), forward
+    )
+    connection.send_result(msg["id"])
+
+    deltas = hub.get_device_deltas(msg["version"]) if "version" in msg else None
+    if deltas is None:
+        send_snapshot()
+        return
+    for delta in deltas:
+        forward(delta)
+
+
+_IMPORT_DEVICE_SCHEMA = _DEVICE_SCHEMA.extend({vol.Optional("device_id"): cv.string}, extra=vol.REMOVE_EXTRA)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_DEVICE_IMPORT,
+        vol.Required("devices"): [dict],
+        vol.Optional("entry_id"): str,
+    }
+)
+@websocket_api.async_response
+async def handle_device_import(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]) -> None:
+    """Create or update a batch of devices, nothing is stored if any device is invalid."""
+
+    hub = _get_hub(hass, msg)
+    devices = []
+    device_ids: Set[str] = set()
+    for index, item in enumerate(msg["devices"]):
+        try:
+            device = _IMPORT_DEVICE_SCHEMA(item)
+            _validate_device_payload(device["device_type"], device["signals"])
+        except (vol.Invalid, websocket_api.HomeAssistantWebSocketError) as err:
+            raise websocket_api.HomeAssistantWebSocketError(
+                f"Invalid device {index} ({item.get('name', 'unnamed')}): {err}"
+            ) from err
+        device_id = device.get("device_id")
+        if device_id is not None:
+            if device_id in device_ids:
+                raise websocket_api.HomeAssistantWebSocketError(f"Duplicate device_id {device_id}")
+            device_ids.add(device_id)
+        devices.append(device)
+
+    entries = await hub.async_import_devices(devices)
+    connection.send_result(
+        msg["id"], {"imported": len(entries), "device_ids": [entry.device_id for entry in entries]}
+    )
+
+
+@websocket_api.websocket_command({vol.Required("type"): WS_TYPE_DEVICE_EXPORT, vol.Optional("entry_id"): str})
+@websocket_api.async_response
+async def handle_device_export(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]) -> None:
+    """Return all stored devices in the format accepted by devices/import."""
+
+    hub = _get_hub(hass, msg)
+    devices = [device.to_dict() for device in hub.iter_devices()]
+    connection.send_result(msg["id"], {"version": STORAGE_VERSION, "devices": devices})
 
 
 @websocket_api.websocket_command({vol.Required("type"): WS_TYPE_DEVICE_RELOAD, vol.Optional("entry_id"): str})
@@ -333,3 +551,22 @@ async def handle_signal_map_delete(hass: HomeAssistant, connection: websocket_ap
     hub = _get_hub(hass, msg)
     await hub.async_remove_signal_mapping(msg["payload"])
     connection.send_result(msg["id"], {})
+
+
+@websocket_api.websocket_command({vol.Required("type"): WS_TYPE_STATS, vol.Optional("entry_id"): str})
+@websocket_api.async_response
+async def handle_stats(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]) -> None:
+    """Return runtime metrics of the hub."""
+
+    hub = _get_hub(hass, msg)
+    stats = _get_subscription_stats(hass)
+    connection.send_result(
+        msg["id"],
+        {
+            **hub.get_stats(),
+            "signal_subscriptions": {
+                **stats,
+                "coalesced": stats["events"] - stats["messages"],
+            },
+        },
+    )
@@ -0,0 +1,4 @@
+from raspyrfm_client.cli import main
+import sys
+
+sys.exit(main())
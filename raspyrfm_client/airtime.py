@@ -0,0 +1,247 @@
+"""
+Airtime estimation and duty-cycle planning.
+
+The airtime of a command is derived from the pulse data the gateway transmits:
+every pulse pair (high, low) is measured in multiples of the timebase and the whole
+frame is repeated. The gateway additionally pauses after the frame before it accepts
+the next one.
+
+In the EU the 433 MHz band is limited to a duty cycle of 1%, i.e. a transmitter may be
+on air for at most 36 seconds per hour. The DutyCyclePlanner checks a schedule of
+commands against such a limit for every gateway.
+"""
+import math
+
+from raspyrfm_client.device_implementations.controlunit.actions import Action
+from raspyrfm_client.device_implementations.controlunit.base import ControlUnit
+from raspyrfm_client.device_implementations.gateway.base import Gateway
+
+EU_433MHZ_DUTY_CYCLE_LIMIT = 0.01
+
+
+class AirtimeEstimate(object):
+    """
+    Airtime of a single command, all times in µs.
+
+    frame_us is the duration of a single frame, carrier_us the time the carrier is
+    switched on over all repetitions and pause_us the pause of the gateway after the command.
+    """
+    __slots__ = ("frame_us", "carrier_us", "repetitions", "pause_us")
+
+    def __init__(self, frame_us: int, carrier_us: int, repetitions: int, pause_us: int):
+        self.frame_us = frame_us
+        self.carrier_us = carrier_us
+        self.repetitions = repetitions
+        self.pause_us = pause_us
+
+    @property
+    def on_air_us(self) -> int:
+        """
+        :return: time the command occupies the channel (all repetitions of the frame)
+        """
+        return self.frame_us * self.repetitions
+
+    @property
+    def total_us(self) -> int:
+        """
+        :return: time the gateway is busy with the command (on air time and gateway pause)
+        """
+        return self.on_air_us + self.pause_us
+
+    def __repr__(self):
+        return "AirtimeEstimate(frame_us=%d, carrier_us=%d, repetitions=%d, pause_us=%d)" % (
+            self.frame_us, self.carrier_us, self.repetitions, self.pause_us)
+
+
+def estimate_pulse_data_airtime(gateway: Gateway, pulsedata) -> AirtimeEstimate:
+    """
+    :param gateway: the gateway that transmits the pulse data
+    :param pulsedata: (pulse pairs, repetitions, timebase)
+    :return: the airtime of the pulse data on the given gateway
+    """
+    pulses, repetitions, timebase = pulsedata
+
+    high = 0
+    low = 0
+    for pulse in pulses:
+        high += pulse[0]
+        low += pulse[1]
+    if pulses:
+        # some gateways stretch the low time of the last pulse
+        low += pulses[-1][1] * (gateway.get_trailing_pause_factor() - 1)
+
+    return AirtimeEstimate((high + low) * timebase, high * timebase * repetitions, repetitions,
+                           gateway.get_pause_length())
+
+
+def estimate_airtime(gateway: Gateway, device: ControlUnit, action: Action) -> AirtimeEstimate:
+    """
+    :param gateway: the gateway that sends the command
+    :param device: the device to execute the action on
+    :param action: action to execute
+    :return: the airtime of the command
+    """
+    return estimate_pulse_data_airtime(gateway, gateway.get_pulse_data(device, action))
+
+
+def estimate_airtime_batch(commands) -> [AirtimeEstimate]:
+    """
+    Estimates the airtime of many commands. Identical commands are only encoded once.
+
+    :param commands: iterable of (gateway, device, action) tuples
+    :return: list of airtime estimates in the order of the commands
+    """
+    cache = {}
+    estimates = []
+    for gateway, device, action in commands:
+        key = _get_command_key(gateway, device, action)
+        estimate = cache.get(key)
+        if estimate is None:
+            estimate = estimate_airtime(gateway, device, action)
+            cache[key] = estimate
+        estimates.append(estimate)
+    return estimates
+
+
+def _get_command_key(gateway: Gateway, device: ControlUnit, action: Action):
+    channel_config = device.get_channel_config() or {}
+    return (type(gateway), type(device), device.get_repetitions(action), action,
+            tuple(sorted((key, str(value)) for key, value in channel_config.items())))
+
+
+class DutyCycleReport(object):
+    """
+    Duty-cycle utilisation of a single gateway
+    """
+
+    def __init__(self, gateway: Gateway, window: float, limit: float):
+        self.gateway = gateway
+        self.window = window
+        self.limit = limit
+        self.commands = 0
+        self.on_air_us = 0
+        self.busy_us = 0
+        self.peak_utilisation = 0.0
+        self.peak_window_start = None
+        self.windows_over_limit = 0
+
+    @property
+    def within_limit(self) -> bool:
+        """
+        :return: True if no window exceeds the duty-cycle limit
+        """
+        return self.windows_over_limit == 0
+
+    @property
+    def required_gateways(self) -> int:
+        """
+        :return: number of gateways needed to keep the peak window within the limit
+        """
+        return max(1, math.ceil(self.peak_utilisation / self.limit))
+
+    def to_dict(self) -> dict:
+        """
+        :return: a serialisable representation of the report
+        """
+        return {
+            "host": self.gateway.get_host(),
+            "port": self.gateway.get_port(),
+            "model": self.gateway.get_model().value,
+            "window": self.window,
+            "limit": self.limit,
+            "commands": self.commands,
+            "on_air_us": self.on_air_us,
+            "busy_us": self.busy_us,
+            "peak_utilisation": self.peak_utilisation,
+            "peak_window_start": self.peak_window_start,
+            "windows_over_limit": self.windows_over_limit,
+            "required_gateways": self.required_gateways,
+        }
+
+
+class DutyCyclePlanner(object):
+    """
+    Computes the duty-cycle utilisation of a command schedule per gateway over sliding windows.
+
+    Every window starts at the start time of a command and covers the airtime of all commands
+    that start within the window length, so the peak utilisation of the schedule is exact.
+    """
+
+    def __init__(self, window: float = 3600.0, limit: float = EU_433MHZ_DUTY_CYCLE_LIMIT):
+        """
+        :param window: length of the sliding window in seconds
+        :param limit: allowed fraction of the window a gateway may be on air
+        """
+        if window <= 0:
+            raise ValueError("window must be positive")
+        if not 0 < limit <= 1:
+            raise ValueError("limit must be within (0, 1]")
+
+        self._window = window
+        self._limit = limit
+        self._schedule = []
+
+    def add(self, timestamp: float, gateway: Gateway, device: ControlUnit, action: Action) -> None:
+        """
+        Adds a command to the schedule
+        :param timestamp: time in seconds the command is sent at
+        :param gateway: the gateway that sends the command
+        :param device: the device to execute the action on
+        :param action: action to execute
+        """
+        self._schedule.append((timestamp, gateway, device, action))
+
+    def extend(self, schedule) -> None:
+        """
+        Adds multiple commands to the schedule
+        :param schedule: iterable of (timestamp, gateway, device, action) tuples
+        """
+        for timestamp, gateway, device, action in schedule:
+            self.add(timestamp, gateway, device, action)
+
+    def report(self) -> dict:
+        """
+        :return: dictionary of (host, port) to DutyCycleReport for every gateway in the schedule
+        """
+        estimates = estimate_airtime_batch((gateway, device, action) for _, gateway, device, action in self._schedule)
+
+        timelines = {}
+        for (timestamp, gateway, _, _), estimate in zip(self._schedule, estimates):
+            key = (gateway.get_host(), gateway.get_port())
+            if key not in timelines:
+                timelines[key] = (gateway, [])
+            timelines[key][1].append((timestamp, estimate))
+
+        return {key: self._report_gateway(gateway, timeline) for key, (gateway, timeline) in timelines.items()}
+
+    def _report_gateway(self, gateway: Gateway, timeline) -> DutyCycleReport:
+        timeline.sort(key=lambda item: item[0])
+
+        report = DutyCycleReport(gateway, self._window, self._limit)
+        report.commands = len(timeline)
+
+        window_us = self._window * 1000000
+        window_on_air = 0
+        end = 0
+        for timestamp, estimate in timeline:
+            report.on_air_us += estimate.on_air_us
+            report.busy_us += estimate.total_us
+
+            while end < len(timeline) and timeline[end][0] < timestamp + self._window:
+                window_on_air += timeline[end][1].on_air_us
+                end += 1
+
+            # the last command of the window may not fit completely
+            last_timestamp, last_estimate = timeline[end - 1]
+            overflow = (last_timestamp - timestamp) * 1000000 + last_estimate.on_air_us - window_us
+            utilisation = (window_on_air - max(0, min(overflow, last_estimate.on_air_us))) / window_us
+
+            if utilisation > report.peak_utilisation:
+                report.peak_utilisation = utilisation
+                report.peak_window_start = timestamp
+            if utilisation > self._limit:
+                report.windows_over_limit += 1
+
+            window_on_air -= estimate.on_air_us
+
+        return report
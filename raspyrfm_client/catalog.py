@@ -0,0 +1,169 @@
+"""
+Static catalog of the gateway and control unit implementations.
+
+RaspyRFMClient finds implementations by importing every module of the manufacturer packages.
+The catalog maps (manufacturer, model) enum names to the module (relative to the manufacturer package)
+and class of the implementation, so that a single implementation can be loaded without importing the
+others (e.g. by the command line tool).
+
+The entries are generated from the dynamic discovery of RaspyRFMClient, run
+    python -m raspyrfm_client.catalog
+after adding or removing an implementation. tests/catalog_test.py checks that the catalog is up to date.
+"""
+import importlib
+
+# --- generated, do not edit ---
+GATEWAYS = {
+    ("INTERTECHNO", "ITGW"): "intertechno.ITGW:ITGW",
+    ("SEEGEL_SYSTEME", "RASPYRFM"): "seegel_systeme.RaspyRFM:RaspyRFM",
+    ("SIMPLE_SOLUTIONS", "CONNAIR"): "simple_solutions.ConnAir:ConnAir",
+}
+
+CONTROLUNITS = {
+    ("BAT", "RC3500_A_IP44_DE"): "bat.RC3500_A_IP44_DE:RC3500_A_IP44_DE",
+    ("BAT", "RC_AAA1000_A_IP44_Outdoor"): "bat.RC_AAA1000_A_IP44_Outdoor:RC_AAA1000_A_IP44_Outdoor",
+    ("BRENNENSTUHL", "RCS_1000_N_COMFORT"): "brennenstuhl.RCS1000NComfort:RCS1000NComfort",
+    ("BRENNENSTUHL", "RCS_1044_N_COMFORT"): "brennenstuhl.RCS1044NComfort:RCS1044NComfort",
+    ("ELRO", "AB440D_200W"): "elro.AB440D_200W:AB440D_200W",
+    ("ELRO", "AB440D_300W"): "elro.AB440D_300W:AB440D_300W",
+    ("ELRO", "AB440ID"): "elro.AB440ID:AB440ID",
+    ("ELRO", "AB440IS"): "elro.AB440IS:AB440IS",
+    ("ELRO", "AB440L"): "elro.AB440L:AB440L",
+    ("ELRO", "AB440S"): "elro.AB440S:AB440S",
+    ("ELRO", "AB440SC"): "elro.AB440SC:AB440SC",
+    ("ELRO", "AB440WD"): "elro.AB440WD:AB440WD",
+    ("HAMA", "MODEL_00121938"): "hama._121938:Hama121938",
+    ("INTERTECHNO", "CMR_1000"): "intertechno.CMR1000:CMR1000",
+    ("INTERTECHNO", "CMR_1224"): "intertechno.CMR1224:CMR1224",
+    ("INTERTECHNO", "CMR_300"): "intertechno.CMR300:CMR300",
+    ("INTERTECHNO", "CMR_500"): "intertechno.CMR500:CMR500",
+    ("INTERTECHNO", "GRR_300"): "intertechno.GRR300:GRR300",
+    ("INTERTECHNO", "ITR_300"): "intertechno.ITR300:ITR300",
+    ("INTERTECHNO", "ITR_3500"): "intertechno.ITR3500:ITR3500",
+    ("INTERTECHNO", "IT_1500"): "intertechno.IT1500:IT1500",
+    ("INTERTECHNO", "PA3_1000"): "intertechno.PA31000:PA31000",
+    ("INTERTECHNO", "PAR_1500"): "intertechno.PAR1500:PAR1500",
+    ("INTERTECHNO", "YCR_1000"): "intertechno.YCR1000:YCR1000",
+    ("INTERTEK", "MODEL_1919361"): "intertek.Model1919361:Model1919361",
+    ("LOGILINK", "EC000X"): "logilink.logilightec000x:Ec000x",
+    ("LUX_GMBH", "RCS_14G"): "lux.rcs14g:Rcs14G",
+    ("MUMBI", "M_FS300"): "mumbi.MFS300:MFS300",
+    ("M_E", "FLS100"): "m-e.FSL100:FSL100",
+    ("NONAME", "RSL366"): "noname.RSL366:RSL366",
+    ("POLLIN_ELECTRONIC", "SET_2605"): "pollin_electronic.Set2605:Set2605",
+    ("REV", "RITTER"): "rev.Ritter:Ritter",
+    ("REV", "TELECONTROL8342C"): "rev.Telecontrol8342C:Telecontrol",
+    ("REV", "TELECONTROL8342LC"): "rev.Telecontrol8342LC:Telecontrol2",
+    ("UNIVERSAL", "HX2262"): "universal.HX2262Compatible:HX2262Compatible",
+    ("VIVANCO", "FSS31000W"): "vivanco.FSS31000W:FSS31000W",
+    ("VIVANCO", "FSS33600W"): "vivanco.FSS33600W:FSS33600W",
+    ("VOLTCRAFT", "RC30"): "voltcraft.rc30:RC30",
+    ("WESTFALIA", "ZTC_S316A"): "westfalia.ztcs316a:ZtcS316A",
+}
+# --- end of generated entries ---
+
+_GATEWAY_PACKAGE = "raspyrfm_client.device_implementations.gateway.manufacturer"
+_CONTROLUNIT_PACKAGE = "raspyrfm_client.device_implementations.controlunit.manufacturer"
+
+_GENERATED_START = "# --- generated, do not edit ---\n"
+_GENERATED_END = "# --- end of generated entries ---\n"
+
+
+def _load_class(package: str, path: str):
+    module_name, class_name = path.split(":")
+    return getattr(importlib.import_module(package + "." + module_name), class_name)
+
+
+def _find(entries: dict, manufacturer: str or None, model: str) -> str:
+    from raspyrfm_client.device_implementations.manufacturer_constants import Manufacturer
+
+    normalized_manufacturer = _normalize(manufacturer) if manufacturer is not None else None
+    normalized_model = _normalize(model)
+    for (manufacturer_name, model_name), path in entries.items():
+        if normalized_manufacturer is not None and normalized_manufacturer not in (
+                _normalize(manufacturer_name), _normalize(Manufacturer[manufacturer_name].value)):
+            continue
+        if normalized_model in (_normalize(model_name), _normalize(_get_model_value(entries, model_name))):
+            return path
+    raise ValueError("Unsupported model: " + (manufacturer + " " if manufacturer else "") + model)
+
+
+def _get_model_value(entries: dict, model_name: str) -> str:
+    if entries is GATEWAYS:
+        from raspyrfm_client.device_implementations.gateway.manufacturer.gateway_constants import GatewayModel
+        return GatewayModel[model_name].value
+
+    from raspyrfm_client.device_implementations.controlunit.controlunit_constants import ControlUnitModel
+    return ControlUnitModel[model_name].value
+
+
+def _normalize(name: str) -> str:
+    return "".join(name.lower().split()).replace("_", "").replace("-", "")
+
+
+def get_gateway_class(manufacturer: str or None, model: str):
+    """
+    :param manufacturer: manufacturer enum name or value (case and whitespace insensitive), None to match any
+    :param model: gateway model enum name or value (case and whitespace insensitive)
+    :return: the gateway implementation class, only its module is imported
+    """
+    return _load_class(_GATEWAY_PACKAGE, _find(GATEWAYS, manufacturer, model))
+
+
+def get_controlunit_class(manufacturer: str, model: str):
+    """
+    :param manufacturer: manufacturer enum name or value (case and whitespace insensitive)
+    :param model: control unit model enum name or value (case and whitespace insensitive)
+    :return: the control unit implementation class, only its module is imported
+    """
+    return _load_class(_CONTROLUNIT_PACKAGE, _find(CONTROLUNITS, manufacturer, model))
+
+
+def generate_entries() -> (dict, dict):
+    """
+    :return: (gateways, control units) as found by the dynamic discovery of RaspyRFMClient
+    """
+    import contextlib
+    import io
+
+    from raspyrfm_client import RaspyRFMClient
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        rfm_client = RaspyRFMClient()
+
+    def collect(implementations: dict, package: str) -> dict:
+        entries = {}
+        for manufacturer, models in implementations.items():
+            for model, implementation in models.items():
+                module = implementation.__module__[len(package) + 1:]
+                entries[(manufacturer.name, model.name)] = module + ":" + implementation.__qualname__
+        return dict(sorted(entries.items()))
+
+    return (collect(rfm_client._GATEWAY_IMPLEMENTATIONS_DICT, _GATEWAY_PACKAGE),
+            collect(rfm_client._CONTROLUNIT_IMPLEMENTATIONS_DICT, _CONTROLUNIT_PACKAGE))
+
+
+def _format_entries(name: str, entries: dict) -> str:
+    lines = [name + " = {"]
+    for key, path in entries.items():
+        lines.append("    %r: %r," % (key, path))
+    lines.append("}")
+    return "\n".join(lines).replace("'", '"') + "\n"
+
+
+def main():
+    gateways, controlunits = generate_entries()
+
+    with open(__file__) as file:
+        source = file.read()
+    start = source.index(_GENERATED_START) + len(_GENERATED_START)
+    end = source.index(_GENERATED_END, start)
+    generated = _format_entries("GATEWAYS", gateways) + "\n" + _format_entries("CONTROLUNITS", controlunits)
+
+    with open(__file__, "w") as file:
+        file.write(source[:start] + generated + source[end:])
+    print("%d gateways, %d control units" % (len(gateways), len(controlunits)))
+
+
+if __name__ == "__main__":
+    main()
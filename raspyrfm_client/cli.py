@@ -0,0 +1,283 @@
+"""
+Command line tool.
+
+Commands name a device as MANUFACTURER MODEL ACTION [KEY=VALUE ...], e.g.
+    raspyrfm encode Intertechno "CMR 1000" ON master=A slave=1
+    raspyrfm send --host 192.168.2.10 Intertechno "CMR 1000" ON master=A slave=1
+
+Manufacturers, models and gateways are matched by enum name or value, ignoring case, spaces,
+dashes and underscores. Only the implementation modules a command needs are imported (see
+raspyrfm_client.catalog).
+
+With --stdin, encode and send read one device per line in the same format (shell quoting rules,
+empty lines and lines starting with # are ignored), which allows to send thousands of frames
+with a single invocation over a single socket.
+"""
+import argparse
+import shlex
+import socket
+import sys
+import time
+
+from raspyrfm_client import catalog
+
+DEFAULT_GATEWAY = "RaspyRFM"
+DEFAULT_PORT = 49880
+
+
+class CommandError(Exception):
+    """
+    An invalid device command
+    """
+
+
+def parse_command(tokens: [str]) -> (str, str, str, dict):
+    """
+    :param tokens: MANUFACTURER MODEL ACTION [KEY=VALUE ...]
+    :return: (manufacturer, model, action, channel config)
+    """
+    if len(tokens) < 3:
+        raise CommandError("expected MANUFACTURER MODEL ACTION [KEY=VALUE ...], got " + " ".join(tokens))
+
+    channel_config = {}
+    for token in tokens[3:]:
+        key, separator, value = token.partition("=")
+        if not separator or not key:
+            raise CommandError("expected KEY=VALUE, got " + token)
+        channel_config[key] = value
+    return tokens[0], tokens[1], tokens[2], channel_config
+
+
+class Encoder(object):
+    """
+    Generates signal codes for device commands, identical commands are only encoded once
+    """
+
+    def __init__(self, gateway):
+        """
+        :param gateway: the gateway to generate the codes for
+        """
+        self._gateway = gateway
+        self._codes = {}
+
+    def encode(self, tokens: [str]) -> str:
+        """
+        :param tokens: MANUFACTURER MODEL ACTION [KEY=VALUE ...]
+        :return: the signal code
+        """
+        from raspyrfm_client.device_implementations.controlunit.actions import Action
+
+        key = tuple(tokens)
+        code = self._codes.get(key)
+        if code is not None:
+            return code
+
+        manufacturer, model, action, channel_config = parse_command(tokens)
+        try:
+            action = Action[action.upper()]
+        except KeyError:
+            raise CommandError("unknown action " + action) from None
+
+        try:
+            device = catalog.get_controlunit_class(manufacturer, model)()
+            device.set_channel_config(**channel_config)
+            code = self._gateway.generate_code(device, action)
+        except (ValueError, TypeError) as e:
+            raise CommandError(str(e)) from e
+
+        self._codes[key] = code
+        return code
+
+
+def _read_commands(stream):
+    """
+    :return: generator of (line number, tokens) of the non empty lines of the stream
+    """
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            yield number, shlex.split(line)
+        except ValueError as e:
+            yield number, e
+
+
+def _get_commands(args):
+    if args.stdin:
+        if args.command_tokens:
+            raise CommandError("--stdin can not be combined with a command")
+        return _read_commands(sys.stdin)
+    return [(None, args.command_tokens)]
+
+
+def _create_gateway(args):
+    gateway_class = catalog.get_gateway_class(None, args.gateway)
+    return gateway_class(getattr(args, "host", None), getattr(args, "port", DEFAULT_PORT))
+
+
+def _report_error(number, error) -> None:
+    prefix = "line %d: " % number if number is not None else ""
+    print("error: " + prefix + str(error), file=sys.stderr)
+
+
+def cmd_list(args) -> int:
+    from raspyrfm_client.device_implementations.controlunit.controlunit_constants import ControlUnitModel
+    from raspyrfm_client.device_implementations.gateway.manufacturer.gateway_constants import GatewayModel
+    from raspyrfm_client.device_implementations.manufacturer_constants import Manufacturer
+
+    if args.kind in ("all", "gateways"):
+        print("Gateways:")
+        for manufacturer, model in catalog.GATEWAYS:
+            print("  %s | %s" % (Manufacturer[manufacturer].value, GatewayModel[model].value))
+    if args.kind in ("all", "controlunits"):
+        print("ControlUnits:")
+        for manufacturer, model in catalog.CONTROLUNITS:
+            print("  %s | %s" % (Manufacturer[manufacturer].value, ControlUnitModel[model].value))
+    return 0
+
+
+def cmd_encode(args) -> int:
+    encoder = Encoder(_create_gateway(args))
+    errors = 0
+    for number, tokens in _get_commands(args):
+        try:
+            if isinstance(tokens, Exception):
+                raise CommandError(str(tokens))
+            print(encoder.encode(tokens))
+        except CommandError as e:
+            _report_error(number, e)
+            errors += 1
+    return 1 if errors else 0
+
+
+def cmd_send(args) -> int:
+    encoder = Encoder(_create_gateway(args))
+    address = (args.host, args.port)
+    errors = 0
+    sent = 0
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:  # UDP
+        for number, tokens in _get_commands(args):
+            try:
+                if isinstance(tokens, Exception):
+                    raise CommandError(str(tokens))
+                code = encoder.encode(tokens)
+            except CommandError as e:
+                _report_error(number, e)
+                errors += 1
+                continue
+
+            if sent and args.interval:
+                time.sleep(args.interval)
+            sock.sendto(bytes(code, "utf-8"), address)
+            sent += 1
+            if args.verbose:
+                print(code)
+
+    if args.stdin:
+        print("%d frames sent, %d errors" % (sent, errors), file=sys.stderr)
+    return 1 if errors else 0
+
+
+def cmd_search(args) -> int:
+    from raspyrfm_client.client import RaspyRFMClient
+
+    gateways = [catalog.get_gateway_class(manufacturer, model)() for manufacturer, model in catalog.GATEWAYS]
+    found = RaspyRFMClient.search_gateways(gateways, args.timeout)
+    for gateway in found:
+        print("%s | %s | %s | firmware %s" % (gateway.get_host(), gateway.get_manufacturer().value,
+                                              gateway.get_model().value, gateway.get_firmware_version()))
+    if not found:
+        print("No gateways found", file=sys.stderr)
+    return 0
+
+
+def cmd_bench(args) -> int:
+    from raspyrfm_client.device_implementations.controlunit.actions import Action
+
+    manufacturer, model, action, channel_config = parse_command(args.command_tokens)
+    gateway = _create_gateway(args)
+    try:
+        device = catalog.get_controlunit_class(manufacturer, model)()
+        device.set_channel_config(**channel_config)
+        action = Action[action.upper()]
+        gateway.generate_code(device, action)
+    except (KeyError, ValueError, TypeError) as e:
+        raise CommandError(str(e)) from e
+
+    results = {}
+    for name, function in (("get_pulse_data", lambda: device.get_pulse_data(action)),
+                           ("generate_code", lambda: gateway.generate_code(device, action))):
+        best = None
+        for _ in range(5):
+            start = time.perf_counter_ns()
+            for _ in range(args.number):
+                function()
+            duration = (time.perf_counter_ns() - start) / args.number
+            best = duration if best is None else min(best, duration)
+        results[name] = best
+
+    for name, duration in results.items():
+        print("%-16s %10.1f ns/call" % (name, duration))
+    return 0
+
+
+def _add_gateway_argument(parser) -> None:
+    parser.add_argument("--gateway", default=DEFAULT_GATEWAY,
+                        help="gateway model the codes are generated for (default: %(default)s)")
+
+
+def _add_command_arguments(parser, stdin: bool = True) -> None:
+    parser.add_argument("command_tokens", nargs="*", metavar="MANUFACTURER MODEL ACTION [KEY=VALUE ...]")
+    if stdin:
+        parser.add_argument("--stdin", action="store_true", help="read one command per line from stdin")
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="raspyrfm", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="subcommand", required=True)
+
+    list_parser = subparsers.add_parser("list", help="list supported gateways and control units")
+    list_parser.add_argument("kind", nargs="?", default="all", choices=["all", "gateways", "controlunits"])
+    list_parser.set_defaults(handler=cmd_list)
+
+    encode_parser = subparsers.add_parser("encode", help="print the signal code of a command")
+    _add_gateway_argument(encode_parser)
+    _add_command_arguments(encode_parser)
+    encode_parser.set_defaults(handler=cmd_encode)
+
+    send_parser = subparsers.add_parser("send", help="send a command to a gateway")
+    send_parser.add_argument("--host", required=True, help="gateway host")
+    send_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="gateway port (default: %(default)s)")
+    send_parser.add_argument("--interval", type=float, default=0.0,
+                             help="seconds to wait between frames, gateways drop frames while transmitting")
+    send_parser.add_argument("-v", "--verbose", action="store_true", help="print every sent code")
+    _add_gateway_argument(send_parser)
+    _add_command_arguments(send_parser)
+    send_parser.set_defaults(handler=cmd_send)
+
+    search_parser = subparsers.add_parser("search", help="search gateways in the local network")
+    search_parser.add_argument("--timeout", type=float, default=1.0, help="seconds to wait for responses")
+    search_parser.set_defaults(handler=cmd_search)
+
+    bench_parser = subparsers.add_parser("bench", help="measure the encoding speed of a command")
+    bench_parser.add_argument("--number", type=int, default=10000, help="calls per measurement")
+    _add_gateway_argument(bench_parser)
+    _add_command_arguments(bench_parser, stdin=False)
+    bench_parser.set_defaults(handler=cmd_bench)
+
+    return parser
+
+
+def main(argv: [str] = None) -> int:
+    args = create_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except (CommandError, ValueError) as e:
+        _report_error(None, e)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
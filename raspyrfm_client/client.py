@@ -2,6 +2,7 @@
 Example usage of the RaspyRFMClient can be found in the example.py file
 """
 import socket
+import time
 
 from raspyrfm_client.device_implementations.controlunit.actions import Action
 from raspyrfm_client.device_implementations.controlunit.base import ControlUnit
@@ -27,6 +28,8 @@ class RaspyRFMClient:
         """
         Creates a new client object.
         """
+        self._repetition_policy = None
+        self._instrumentation = None
         self.reload_implementation_classes()
 
     def reload_implementation_classes(self):
@@ -150,7 +153,9 @@ class RaspyRFMClient:
         :param port: gateway port (optional)
         :return: gateway implementation
         """
-        return self._GATEWAY_IMPLEMENTATIONS_DICT[manufacturer][model](host, port)
+        if self._instrumentation is None:
+            return self._GATEWAY_IMPLEMENTATIONS_DICT[manufacturer][model](host, port)
+        return self._lookup_instrumented(self._GATEWAY_IMPLEMENTATIONS_DICT, manufacturer, model, host, port)
 
     def get_supported_controlunit_manufacturers(self) -> [str]:
         """
@@ -172,7 +177,20 @@ class RaspyRFMClient:
         :param model: device model
         :return: device implementation
         """
-        return self._CONTROLUNIT_IMPLEMENTATIONS_DICT[manufacturer][model]()
+        if self._instrumentation is None:
+            return self._CONTROLUNIT_IMPLEMENTATIONS_DICT[manufacturer][model]()
+        return self._lookup_instrumented(self._CONTROLUNIT_IMPLEMENTATIONS_DICT, manufacturer, model)
+
+    def _lookup_instrumented(self, implementations: dict, manufacturer: Manufacturer, model, *args):
+        instrumentation = self._instrumentation
+        start = time.perf_counter_ns()
+        try:
+            instance = implementations[manufacturer][model](*args)
+        except Exception as e:
+            instrumentation.error("lookup", e)
+            raise
+        instrumentation.record("lookup", time.perf_counter_ns() - start)
+        return instance
 
     def list_supported_gateways(self) -> None:
         """
@@ -192,6 +210,36 @@ class RaspyRFMClient:
             for model in self._CONTROLUNIT_IMPLEMENTATIONS_DICT[manufacturer].keys():
                 print("  " + model.value)
 
+    def set_repetition_policy(self, policy) -> None:
+        """
+        Sets a policy that chooses the repetitions of every frame sent by this client,
+        see raspyrfm_client.repetition.AdaptiveRepetitionPolicy.
+
+        :param policy: the policy to use or None to use the repetitions of the device implementations
+        """
+        self._repetition_policy = policy
+
+    def get_repetition_policy(self):
+        """
+        :return: the current repetition policy or None
+        """
+        return self._repetition_policy
+
+    def set_instrumentation(self, instrumentation) -> None:
+        """
+        Sets an instrumentation that records timings and counters of every stage of this client,
+        see raspyrfm_client.instrumentation.Instrumentation.
+
+        :param instrumentation: the instrumentation to use or None to disable instrumentation
+        """
+        self._instrumentation = instrumentation
+
+    def get_instrumentation(self):
+        """
+        :return: the current instrumentation or None
+        """
+        return self._instrumentation
+
     def search(self) -> [Gateway]:
         """
         Sends a local network broadcast with a specified message.
@@ -202,11 +250,6 @@ class RaspyRFMClient:
         :return: list of gateways
         """
 
-        import re
-        import socket
-        from socket import AF_INET, SOCK_DGRAM, SOL_SOCKET, SO_REUSEADDR, SO_BROADCAST
-
-        found_gateways = []
         all_gateways = []
 
         # get all gateway implementations in a list
@@ -214,6 +257,23 @@ class RaspyRFMClient:
             for model in self.get_supported_gateway_models(manufacturer):
                 all_gateways.append(self.get_gateway(manufacturer, model))
 
+        return RaspyRFMClient.search_gateways(all_gateways)
+
+    @staticmethod
+    def search_gateways(gateways: [Gateway], timeout: float = 1) -> [Gateway]:
+        """
+        Sends a local network broadcast and matches the responses against the given gateway implementations.
+
+        :param gateways: an instance of every gateway implementation to look for
+        :param timeout: seconds to wait for further responses
+        :return: list of gateways
+        """
+
+        import re
+        from socket import AF_INET, SOCK_DGRAM, SOL_SOCKET, SO_REUSEADDR, SO_BROADCAST
+
+        found_gateways = []
+
         # send the broadcast
         with socket.socket(AF_INET, SOCK_DGRAM) as cs:
             cs.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
@@ -224,7 +284,7 @@ class RaspyRFMClient:
             cs.sendto(_broadcast_message, ('255.255.255.255', 49880))
 
             cs.setblocking(True)
-            cs.settimeout(1)
+            cs.settimeout(timeout)
 
             # receive the message(s)
             try:
@@ -237,7 +297,7 @@ class RaspyRFMClient:
 
                     # for each device implementation, check if the response matches the expected pattern
                     # and add an instance of this gateway implementation to the found_gateways list
-                    for gateway in all_gateways:
+                    for gateway in gateways:
                         if re.match(gateway.get_search_response_regex_literal(), message) is not None:
                             found_gateways.append(gateway.create_from_broadcast(address[0], message))
 
@@ -262,7 +322,213 @@ class RaspyRFMClient:
             print("Missing host, nothing sent.")
             return
 
-        message = gateway.generate_code(device, action)
+        if self._repetition_policy is not None:
+            self._repetition_policy.apply(device)
+
+        if self._instrumentation is None:
+            message = gateway.generate_code(device, action)
+
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:  # UDP
+                sock.sendto(bytes(message, "utf-8"), (gateway.get_host(), gateway.get_port()))
+        else:
+            message = self._send_instrumented(gateway, device, action)
+
+        if self._repetition_policy is not None:
+            self._repetition_policy.register_sent(device, message, gateway)
+
+    def _send_instrumented(self, gateway: Gateway, device: ControlUnit, action: Action) -> str:
+        """
+        Same as the code generation and sending in send, but records every stage
+        :return: the sent signal code
+        """
+        instrumentation = self._instrumentation
+        stage = "encode"
+        start = time.perf_counter_ns()
+        try:
+            message = gateway.generate_code(device, action)
+            encoded = time.perf_counter_ns()
+            instrumentation.record(stage, encoded - start)
+            instrumentation.emit("on_encode", device, action, message)
+
+            stage = "socket"
+            # callbacks are not part of any stage
+            creating = time.perf_counter_ns()
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:  # UDP
+                created = time.perf_counter_ns()
+                instrumentation.record(stage, created - creating)
+
+                stage = "sendto"
+                payload = bytes(message, "utf-8")
+                sock.sendto(payload, (gateway.get_host(), gateway.get_port()))
+                sent = time.perf_counter_ns()
+                instrumentation.record(stage, sent - created)
+        except Exception as e:
+            instrumentation.error(stage, e)
+            raise
+
+        instrumentation.increment("frames_sent")
+        instrumentation.increment("bytes_sent", len(payload))
+        instrumentation.emit("on_send", gateway, message, (encoded - start) + (sent - creating))
+        return message
+
+    def send_batch(self, gateway: Gateway, devices: [ControlUnit], action: Action,
+                   use_group_commands: bool = False) -> int:
+        """
+        Executes the same action on multiple devices using a single socket.
+
+        If use_group_commands is enabled and multiple devices share a group (see ControlUnit.get_group_id)
+        they are switched with a single group frame instead of one frame per unit.
+        A group frame reaches every receiver that learned the group, including units that are not
+        part of the devices list, so only enable it if the list contains the whole group.
+
+        :param gateway: the gateway to generate the codes for
+        :param devices: the devices to execute the action on
+        :param action: action to execute
+        :param use_group_commands: collapse devices of the same group into a single group frame
+        :return: number of frames sent
+        """
+
+        if gateway.get_host() is None:
+            print("Missing host, nothing sent.")
+            return 0
+
+        if self._repetition_policy is not None:
+            for device in devices:
+                self._repetition_policy.apply(device)
+
+        if self._instrumentation is not None:
+            return self._send_batch_instrumented(gateway, devices, action, use_group_commands)
+
+        frames = self._generate_batch_frames(gateway, devices, action, use_group_commands)
 
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:  # UDP
-            sock.sendto(bytes(message, "utf-8"), (gateway.get_host(), gateway.get_port()))
+            for device, message in frames:
+                sock.sendto(bytes(message, "utf-8"), (gateway.get_host(), gateway.get_port()))
+                if self._repetition_policy is not None:
+                    self._repetition_policy.register_sent(device, message, gateway)
+
+        return len(frames)
+
+    def _send_batch_instrumented(self, gateway: Gateway, devices: [ControlUnit], action: Action,
+                                 use_group_commands: bool) -> int:
+        """
+        Same as send_batch, but records every stage.
+        The generation of all codes of the batch is recorded as a single encode sample.
+        :return: number of frames sent
+        """
+        instrumentation = self._instrumentation
+        stage = "encode"
+        # time spent in callbacks and the repetition policy, not part of any stage
+        excluded = 0
+        start = time.perf_counter_ns()
+        try:
+            frames = self._generate_batch_frames(gateway, devices, action, use_group_commands)
+            encoded = time.perf_counter_ns()
+            instrumentation.record(stage, encoded - start)
+
+            stage = "socket"
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:  # UDP
+                created = time.perf_counter_ns()
+                instrumentation.record(stage, created - encoded)
+
+                stage = "sendto"
+                for device, message in frames:
+                    payload = bytes(message, "utf-8")
+                    sending = time.perf_counter_ns()
+                    sock.sendto(payload, (gateway.get_host(), gateway.get_port()))
+                    sent = time.perf_counter_ns()
+                    instrumentation.record(stage, sent - sending)
+                    instrumentation.increment("frames_sent")
+                    instrumentation.increment("bytes_sent", len(payload))
+                    instrumentation.emit("on_send", gateway, message, sent - start - excluded)
+                    if self._repetition_policy is not None:
+                        self._repetition_policy.register_sent(device, message, gateway)
+                    excluded += time.perf_counter_ns() - sent
+        except Exception as e:
+            instrumentation.error(stage, e)
+            raise
+
+        return len(frames)
+
+    def send_codes(self, gateway: Gateway, codes: [str]) -> int:
+        """
+        Sends signal codes generated in advance (see Gateway.generate_code) using a single socket.
+        The codes are sent as they are, the repetition policy is not applied.
+
+        :param gateway: the gateway the codes were generated for
+        :param codes: the signal codes
+        :return: number of frames sent
+        """
+
+        if gateway.get_host() is None:
+            print("Missing host, nothing sent.")
+            return 0
+
+        instrumentation = self._instrumentation
+        stage = "socket"
+        start = time.perf_counter_ns()
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:  # UDP
+                if instrumentation is not None:
+                    instrumentation.record(stage, time.perf_counter_ns() - start)
+                stage = "sendto"
+                for code in codes:
+                    payload = bytes(code, "utf-8")
+                    sending = time.perf_counter_ns()
+                    sock.sendto(payload, (gateway.get_host(), gateway.get_port()))
+                    if instrumentation is not None:
+                        sent = time.perf_counter_ns()
+                        instrumentation.record(stage, sent - sending)
+                        instrumentation.increment("frames_sent")
+                        instrumentation.increment("bytes_sent", len(payload))
+                        instrumentation.emit("on_send", gateway, code, sent - start)
+        except Exception as e:
+            if instrumentation is not None:
+                instrumentation.error(stage, e)
+            raise
+
+        return len(codes)
+
+    @staticmethod
+    def generate_batch_codes(gateway: Gateway, devices: [ControlUnit], action: Action,
+                             use_group_commands: bool = False) -> [str]:
+        """
+        Generates the codes needed to execute the same action on multiple devices.
+        Devices sharing a group are collapsed into one group frame if use_group_commands is enabled,
+        all other devices get one frame each. The order of the devices is preserved.
+
+        :param gateway: the gateway to generate the codes for
+        :param devices: the devices to execute the action on
+        :param action: action to execute
+        :param use_group_commands: collapse devices of the same group into a single group frame
+        :return: list of signal codes
+        """
+        return [message for _device, message in
+                RaspyRFMClient._generate_batch_frames(gateway, devices, action, use_group_commands)]
+
+    @staticmethod
+    def _generate_batch_frames(gateway: Gateway, devices: [ControlUnit], action: Action,
+                               use_group_commands: bool) -> [tuple]:
+        """
+        Same as generate_batch_codes, but pairs every code with the device it was generated for
+        :return: list of (device, signal code) tuples, a group frame is paired with the first device of the group
+        """
+        groups = {}
+        if use_group_commands:
+            for device in devices:
+                group_id = device.get_group_id()
+                if group_id is not None:
+                    groups.setdefault(group_id, []).append(device)
+
+        messages = []
+        sent_groups = set()
+        for device in devices:
+            group_id = device.get_group_id() if use_group_commands else None
+            if group_id is not None and len(groups[group_id]) > 1:
+                if group_id not in sent_groups:
+                    sent_groups.add(group_id)
+                    messages.append((device, gateway.generate_group_code(device, action)))
+            else:
+                messages.append((device, gateway.generate_code(device, action)))
+
+        return messages
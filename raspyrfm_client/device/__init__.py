@@ -8,69 +8,96 @@ legacy modules.  Sphinx would therefore fail with ``ModuleNotFoundError``
 when building the API reference.
 
 This module repopulates the original namespace by re-exporting the new
-implementation packages.  The helper walks through the manufacturer
-subpackages and registers aliases inside :data:`sys.modules` so that direct
-imports such as ``raspyrfm_client.device.manufacturer.elro.AB440D_200W``
-continue to resolve correctly.
+implementation packages.  Instead of importing every manufacturer module up
+front, a finder on :data:`sys.meta_path` resolves legacy names such as
+``raspyrfm_client.device.manufacturer.elro.AB440D_200W`` when they are first
+imported and registers the implementation module under the alias in
+:data:`sys.modules`.  Attribute access (``raspyrfm_client.device.actions``)
+is resolved lazily by the module level ``__getattr__``.
 """
 
 from importlib import import_module
-import pkgutil
+from importlib.machinery import ModuleSpec
 import sys
 from types import ModuleType
-from typing import Dict
+from typing import Dict, Optional
 
 _BASE_MODULE = "raspyrfm_client.device_implementations.controlunit"
 _MANUFACTURER_BASE = f"{_BASE_MODULE}.manufacturer"
 _MANUFACTURER_CONSTANTS = "raspyrfm_client.device_implementations.manufacturer_constants"
 
+_MANUFACTURER_ALIAS = __name__ + ".manufacturer"
+_MANUFACTURER_CONSTANTS_ALIAS = _MANUFACTURER_ALIAS + ".manufacturer_constants"
 
-def _alias_modules(mapping: Dict[str, str]) -> None:
-    """Register aliases for modules that moved to new locations."""
+# Legacy modules that do not follow the ``manufacturer`` subpackage layout.
+_ALIASES: Dict[str, str] = {
+    __name__ + ".actions": f"{_BASE_MODULE}.actions",
+    __name__ + ".base": f"{_BASE_MODULE}.base",
+    __name__ + ".manufacturer_constants": _MANUFACTURER_CONSTANTS,
+    _MANUFACTURER_ALIAS: _MANUFACTURER_BASE,
+    _MANUFACTURER_CONSTANTS_ALIAS: _MANUFACTURER_CONSTANTS,
+}
 
-    for alias, target in mapping.items():
-        module = import_module(target)
-        sys.modules[alias] = module
-        globals()[alias.rsplit(".", 1)[-1]] = module
 
+def _resolve(alias: str) -> Optional[str]:
+    """Return the implementation module name for a legacy module name."""
 
-# Core control unit helpers -------------------------------------------------
-_alias_modules(
-    {
-        __name__ + ".actions": f"{_BASE_MODULE}.actions",
-        __name__ + ".base": f"{_BASE_MODULE}.base",
-        __name__ + ".manufacturer_constants": _MANUFACTURER_CONSTANTS,
-    }
-)
+    target = _ALIASES.get(alias)
+    if target is None and alias.startswith(_MANUFACTURER_ALIAS + "."):
+        target = _MANUFACTURER_BASE + alias[len(_MANUFACTURER_ALIAS):]
+    return target
 
 
-def _mirror_package(alias: str, target: str) -> ModuleType:
-    """Expose *target* package under *alias* in :data:`sys.modules`."""
+class _AliasLoader:
+    """Load a legacy module by importing its implementation module."""
 
-    module = import_module(target)
-    sys.modules[alias] = module
-    globals()[alias.rsplit(".", 1)[-1]] = module
-    return module
+    def __init__(self, target: str):
+        self._target = target
+        self._spec: Optional[ModuleSpec] = None
 
+    def create_module(self, spec: ModuleSpec) -> ModuleType:
+        module = import_module(self._target)
+        self._spec = module.__spec__
+        return module
 
-# Manufacturer subpackages --------------------------------------------------
-manufacturer = _mirror_package(__name__ + ".manufacturer", _MANUFACTURER_BASE)
+    def exec_module(self, module: ModuleType) -> None:
+        # The import system stamps the alias spec onto the shared module;
+        # restore the spec of the implementation module.
+        module.__spec__ = self._spec
+
+        if self._target == _MANUFACTURER_BASE:
+            # ``manufacturer_constants`` used to live under
+            # ``raspyrfm_client.device.manufacturer``.  Mirror that attribute
+            # onto the exported package so attribute imports keep working.
+            setattr(module, "manufacturer_constants", import_module(_MANUFACTURER_CONSTANTS))
+
+
+class _AliasFinder:
+    """Resolve legacy ``raspyrfm_client.device`` module names on first import."""
+
+    def find_spec(self, fullname: str, path=None, target=None) -> Optional[ModuleSpec]:
+        implementation = _resolve(fullname)
+        if implementation is None:
+            return None
+        return ModuleSpec(fullname, _AliasLoader(implementation))
+
+
+def _install_finder() -> None:
+    if not any(isinstance(finder, _AliasFinder) for finder in sys.meta_path):
+        sys.meta_path.insert(0, _AliasFinder())
+
+
+_install_finder()
 
-_MANUFACTURER_ALIAS = __name__ + ".manufacturer"
-_MANUFACTURER_CONSTANTS_ALIAS = _MANUFACTURER_ALIAS + ".manufacturer_constants"
 
-_alias_modules({_MANUFACTURER_CONSTANTS_ALIAS: _MANUFACTURER_CONSTANTS})
+def __getattr__(name: str) -> ModuleType:
+    if _resolve(__name__ + "." + name) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return import_module(__name__ + "." + name)
 
-# ``manufacturer_constants`` used to live under ``raspyrfm_client.device.manufacturer``.
-# Mirror that attribute onto the exported ``manufacturer`` package so attribute
-# imports (``from raspyrfm_client.device.manufacturer import manufacturer_constants``)
-# continue to work alongside module level aliases.
-setattr(manufacturer, "manufacturer_constants", sys.modules[_MANUFACTURER_CONSTANTS_ALIAS])
 
-for finder, name, ispkg in pkgutil.walk_packages(manufacturer.__path__, manufacturer.__name__ + "."):
-    alias = name.replace(manufacturer.__name__, __name__ + ".manufacturer", 1)
-    module = import_module(name)
-    sys.modules[alias] = module
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 
 __all__ = [
@@ -8,12 +8,16 @@ from raspyrfm_client.device_implementations.controlunit.actions import Action
 from raspyrfm_client.device_implementations.controlunit.controlunit_constants import ControlUnitModel
 from raspyrfm_client.device_implementations.manufacturer_constants import Manufacturer
 
+# implementation class -> compiled channel config validators, see ControlUnit._get_channel_config_validators
+_CHANNEL_CONFIG_VALIDATORS = {}
+
 
 class ControlUnit(object):
     def __init__(self, manufacturer: Manufacturer, model: ControlUnitModel):
         self._manufacturer = manufacturer
         self._model = model
         self._channel = None
+        self._repetitions_override = None
 
     def __str__(self):
         return ("Manufacturer: " + self._manufacturer.value + "\n" +
@@ -40,15 +44,28 @@ class ControlUnit(object):
 
         :param channel_arguments:
         """
-        argchecks = self.get_channel_config_args()
-        for arg in argchecks:
+        validators = self._get_channel_config_validators()
+        for arg, validator in validators.items():
             if arg not in channel_arguments:
                 raise ValueError("arguments should contain key \"" + arg + "\"")
-            if re.match(argchecks[arg], str(channel_arguments[arg])) is None:
-                raise ValueError("argument \"" + arg + "\" out of range, does not match to " + argchecks[arg])
+            if validator.match(str(channel_arguments[arg])) is None:
+                raise ValueError("argument \"" + arg + "\" out of range, does not match to " + validator.pattern)
 
         self._channel = channel_arguments
 
+    def _get_channel_config_validators(self) -> dict:
+        """
+        The channel config arguments are the same for all instances of an implementation,
+        their regular expressions are compiled once per implementation class.
+
+        :return: dictionary of arguments and their compiled regular expressions
+        """
+        validators = _CHANNEL_CONFIG_VALIDATORS.get(type(self))
+        if validators is None:
+            validators = {arg: re.compile(pattern) for arg, pattern in self.get_channel_config_args().items()}
+            _CHANNEL_CONFIG_VALIDATORS[type(self)] = validators
+        return validators
+
     def get_channel_config_args(self):
         """
         gets required config arguments and their regular expression to check the erguments
@@ -66,6 +83,26 @@ class ControlUnit(object):
         """
         return self._channel
 
+    def set_repetitions(self, repetitions: int or None) -> None:
+        """
+        Overrides the number of frame repetitions the implementation uses.
+        Pairing actions (PAIR, UNPAIR) always use the repetitions of the implementation.
+
+        :param repetitions: number of repetitions, None to use the implementation default
+        """
+        if repetitions is not None and repetitions < 1:
+            raise ValueError("repetitions must be at least 1, got " + str(repetitions))
+        self._repetitions_override = repetitions
+
+    def get_repetitions(self, action: Action = None) -> int or None:
+        """
+        :param action: the action the repetitions are requested for (optional)
+        :return: the repetitions override used for this action or None if the implementation default is used
+        """
+        if action in (Action.PAIR, Action.UNPAIR):
+            return None
+        return self._repetitions_override
+
     def get_supported_actions(self) -> [Action]:
         """
         :return: the supported actions of this device
@@ -78,3 +115,20 @@ class ControlUnit(object):
         :return: (pulse pairs, repetitions, timebase)
         """
         raise NotImplementedError
+
+    def get_group_id(self):
+        """
+        Protocols with group addressing (a single frame switching every unit of a group) override this
+        to return an identifier that is equal for all control units receiving the same group frame.
+
+        :return: hashable group identifier or None if group commands are not supported
+        """
+        return None
+
+    def get_group_pulse_data(self, action: Action):
+        """
+        generates pulse data for a group frame, has to be implemented by inheriting classes
+        that return a group id
+        :return: (pulse pairs, repetitions, timebase)
+        """
+        raise NotImplementedError
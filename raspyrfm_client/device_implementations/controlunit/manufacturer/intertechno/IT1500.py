@@ -24,6 +24,20 @@ class IT1500(ControlUnit):
         }
 
     def get_pulse_data(self, action: Action):
+        return self._build_pulse_data(action, False)
+
+    def get_group_id(self):
+        cfg = self.get_channel_config()
+        if cfg is None:
+            return None
+
+        # self-learning receivers react to the group bit of every CODE they have learned
+        return type(self), cfg['CODE']
+
+    def get_group_pulse_data(self, action: Action):
+        return self._build_pulse_data(action, True)
+
+    def _build_pulse_data(self, action: Action, group: bool):
         _sho = 1
         _lon = 5
         _d0 = [(_sho, _sho), (_sho, _lon)]
@@ -38,14 +52,15 @@ class IT1500(ControlUnit):
         for bit in cfg['CODE']:
             tuples += _d1 if bit == '1' else _d0
 
-        tuples += _d0  # all
+        tuples += _d1 if group else _d0  # all
 
         if action is Action.ON:
             tuples += _d1
         elif action is Action.OFF:
             tuples += _d0
 
-        unit = int(cfg['UNIT'])
+        # the unit bits are ignored by the receivers for group frames
+        unit = 0 if group else int(cfg['UNIT'])
         for i in range(4):
             tuples += _d1 if unit & 1 << i else _d0
 
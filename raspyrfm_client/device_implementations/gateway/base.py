@@ -9,6 +9,11 @@ class Gateway(object):
     Base gateway implementation
     """
 
+    # pause in µs the gateway inserts after a frame
+    _pause_length = 5600
+    # factor the low time of the last pulse is stretched by
+    _trailing_pause_factor = 1
+
     def __init__(self, manufacturer: Manufacturer, model: GatewayModel, host: str, port: int):
         self._manufacturer = manufacturer
         self._model = model
@@ -52,6 +57,18 @@ class Gateway(object):
         """
         return self._port
 
+    def get_pause_length(self) -> int:
+        """
+        :return: the pause in µs the gateway inserts after a frame
+        """
+        return self._pause_length
+
+    def get_trailing_pause_factor(self) -> int:
+        """
+        :return: the factor the low time of the last pulse of a frame is stretched by
+        """
+        return self._trailing_pause_factor
+
     def get_search_response_regex_literal(self) -> str:
         """
         :return: a regular expression that matches the response to a "search" broadcast 
@@ -68,4 +85,91 @@ class Gateway(object):
         raise NotImplementedError
 
     def generate_code(self, device: ControlUnit, action: Action) -> str:
+        """
+        Generates the gateway specific signal code for an action on a device
+        :param device: The device to generate the code for
+        :param action: action to execute
+        :return: signal code
+        """
+        return self.encode_pulse_data(self.get_pulse_data(device, action))
+
+    def generate_group_code(self, device: ControlUnit, action: Action) -> str:
+        """
+        Generates a single group frame that executes the action on every unit
+        sharing the group of the given device (see ControlUnit.get_group_id)
+        :param device: any device of the group
+        :param action: action to execute
+        :return: signal code
+        """
+        return self.encode_pulse_data(self.get_group_pulse_data(device, action))
+
+    def get_pulse_data(self, device: ControlUnit, action: Action):
+        """
+        Returns the pulse data this gateway sends for an action on a device,
+        including the repetitions override of the device
+        :param device: The device to generate the pulse data for
+        :param action: action to execute
+        :return: (pulse pairs, repetitions, timebase)
+        """
+        self._check_device_action(device, action)
+        return self._apply_repetitions(device, action, device.get_pulse_data(action))
+
+    def get_group_pulse_data(self, device: ControlUnit, action: Action):
+        """
+        Returns the pulse data of the group frame for an action on the group of a device
+        :param device: any device of the group
+        :param action: action to execute
+        :return: (pulse pairs, repetitions, timebase)
+        """
+        self._check_device_action(device, action)
+        if device.get_group_id() is None:
+            raise ValueError("Device does not support group commands: " + str(device.get_model()))
+        return self._apply_repetitions(device, action, device.get_group_pulse_data(action))
+
+    def encode_pulse_data(self, pulsedata, pause: int = None) -> str:
+        """
+        Encodes pulse data into the signal code format of this gateway
+        has to be implemented by inheriting classes
+
+        :param pulsedata: (pulse pairs, repetitions, timebase) as returned by ControlUnit.get_pulse_data
+        :param pause: pause after the frame, defaults to the pause of this gateway
+        :return: signal code
+        """
+        raise NotImplementedError
+
+    def decode_code(self, code: str):
+        """
+        Decodes a signal code in the format of this gateway, this is the inverse of encode_pulse_data
+        has to be implemented by inheriting classes
+
+        :param code: signal code
+        :return: ((pulse pairs, repetitions, timebase), pause)
+        :raises ValueError: if the code is not in the format of this gateway
+        """
         raise NotImplementedError
+
+    @staticmethod
+    def _apply_repetitions(device: ControlUnit, action: Action, pulsedata):
+        """
+        Replaces the repetitions of the pulse data if the device has a repetitions override
+        :param device: the device the pulse data was generated by
+        :param action: the action the pulse data was generated for
+        :param pulsedata: (pulse pairs, repetitions, timebase)
+        :return: (pulse pairs, repetitions, timebase)
+        """
+        repetitions = device.get_repetitions(action)
+        if repetitions is None:
+            return pulsedata
+        return pulsedata[0], repetitions, pulsedata[2]
+
+    @staticmethod
+    def _check_device_action(device: ControlUnit, action: Action) -> None:
+        """
+        Checks if a code can be generated for the given device and action
+        :param device: the device to check
+        :param action: the action to check
+        """
+        if device.get_channel_config() is None:
+            raise ValueError("Missing channel configuration :(")
+        if action not in device.get_supported_actions():
+            raise ValueError("Unsupported action: " + str(action))
@@ -1,9 +1,12 @@
-from raspyrfm_client.device_implementations.controlunit.actions import Action
-from raspyrfm_client.device_implementations.controlunit.base import ControlUnit
+from itertools import chain
+
 from raspyrfm_client.device_implementations.gateway.base import Gateway
 
 
 class ITGW(Gateway):
+    _pause_length = 11200
+    _trailing_pause_factor = 4
+
     def __init__(self, host: str = None, port: int = 49880):
         from raspyrfm_client.device_implementations.manufacturer_constants import Manufacturer
         from raspyrfm_client.device_implementations.gateway.manufacturer.gateway_constants import GatewayModel
@@ -24,30 +27,38 @@ class ITGW(Gateway):
     def get_search_response_regex_literal(self) -> str:
         return "HCGW:.*VC:ITECHNO;MC:(HCGW22|ITGW-433);FW:.+;IP:.+;;"
 
-    def generate_code(self, device: ControlUnit, action: Action) -> str:
-        """
-        This method can be implemented by inheriting classes if it does not implement get_pulse_data
-        :param device: The device to generate the code for
-        :param action: action to execute
-        :return: signal code
-        """
-        if device.get_channel_config() is None:
-            raise ValueError("Missing channel configuration :(")
-        if action not in device.get_supported_actions():
-            raise ValueError("Unsupported action: " + str(action))
-
-        pulsedata = device.get_pulse_data(action)
+    def encode_pulse_data(self, pulsedata, pause: int = None) -> str:
         _head_ = "0,0,"
-        _code = _head_
-        _code += str(pulsedata[1]) + ','  # add repetitions
-        _code += str(11200) + ','
-        _code += str(pulsedata[2]) + ','  # add timebase
-
-        _code = _code + str(len(pulsedata[0]) + 1) + ',0,'
-        for pulse in pulsedata[0]:
-            _code += str(pulse[0]) + ','
-            _code += str(pulse[1]) + ','
-
-        _code = _code[:-3] + str(pulsedata[0][len(pulsedata[0]) - 1][1] * 4)
-        _code += ',0'
-        return _code
+        pulses = pulsedata[0]
+        values = [
+            str(pulsedata[1]),  # add repetitions
+            str(self._pause_length if pause is None else pause),
+            str(pulsedata[2]),  # add timebase
+            str(len(pulses) + 1),
+            '0',
+        ]
+        values.extend(map(str, chain.from_iterable(pulses[:-1])))
+
+        values.append(str(pulses[-1][0]))
+        values.append(str(pulses[-1][1] * self._trailing_pause_factor))
+        values.append('0')
+        return _head_ + ','.join(values)
+
+    def decode_code(self, code: str):
+        from raspyrfm_client.frame import parse_frame
+
+        frame = parse_frame(code)
+        if frame.prefix is not None:
+            raise ValueError("Unexpected prefix")
+        values = frame.pulses
+        if frame.reserved != (0, 0) or frame.count < 2 or values[0] != 0 or values[-1] != 0:
+            raise ValueError("Invalid header")
+
+        # the pulses are shifted by half a pulse pair
+        pulses = list(zip(values[1:-1:2], values[2:-1:2]))
+        last_high, last_low = pulses[-1]
+        if last_low % self._trailing_pause_factor != 0:
+            raise ValueError("Invalid trailing pause " + str(last_low))
+        pulses[-1] = (last_high, last_low // self._trailing_pause_factor)
+
+        return (pulses, frame.repetitions, frame.timebase), frame.pause
@@ -1,5 +1,5 @@
-from raspyrfm_client.device_implementations.controlunit.actions import Action
-from raspyrfm_client.device_implementations.controlunit.base import ControlUnit
+from itertools import chain
+
 from raspyrfm_client.device_implementations.gateway.base import Gateway
 
 
@@ -24,27 +24,24 @@ class RaspyRFM(Gateway):
     def get_search_response_regex_literal(self) -> str:
         return "HCGW:.*VC:Seegel Systeme;MC:RaspyRFM;FW:.+;IP:.+;;"
 
-    def generate_code(self, device: ControlUnit, action: Action) -> str:
-        """
-        This method can be implemented by inheriting classes if it does not implement get_pulse_data
-        :param device: The device to generate the code for
-        :param action: action to execute
-        :return: signal code
-        """
-        if device.get_channel_config() is None:
-            raise ValueError("Missing channel configuration :(")
-        if action not in device.get_supported_actions():
-            raise ValueError("Unsupported action: " + str(action))
-
-        pulsedata = device.get_pulse_data(action)
+    def encode_pulse_data(self, pulsedata, pause: int = None) -> str:
         _head_connair = "TXP:0,0,"
-        _code = _head_connair
-        _code += str(pulsedata[1]) + ','  # add repetitions
-        _code += str(5600) + ','
-        _code += str(pulsedata[2]) + ','  # add timebase
-
-        _code = _code + str(len(pulsedata[0])) + ','
-        for pulse in pulsedata[0]:
-            _code += str(pulse[0]) + ','
-            _code += str(pulse[1]) + ','
-        return _code[:-1]
+        values = [
+            str(pulsedata[1]),  # add repetitions
+            str(self._pause_length if pause is None else pause),
+            str(pulsedata[2]),  # add timebase
+            str(len(pulsedata[0])),
+        ]
+        values.extend(map(str, chain.from_iterable(pulsedata[0])))
+        return _head_connair + ','.join(values)
+
+    def decode_code(self, code: str):
+        from raspyrfm_client.frame import parse_frame
+
+        frame = parse_frame(code)
+        if frame.prefix is None:
+            raise ValueError("Missing \"TXP:\" prefix")
+        if frame.reserved != (0, 0) or frame.count < 1:
+            raise ValueError("Invalid header")
+
+        return frame.to_pulse_data(), frame.pause
@@ -0,0 +1,669 @@
+"""
+Bulk loading of device fleets.
+
+A fleet file describes one control unit per record with the fields
+ * name: unique name of the device
+ * manufacturer, model: enum name or value of the implementation (see raspyrfm_client.catalog)
+ * gateway: name of the gateway the device is switched with (optional)
+ * tags: tags of the device, e.g. the zone or floor (optional, a list or a string separated by ";")
+ * config: the channel config (see ControlUnit.set_channel_config)
+
+Supported formats:
+ * csv: a header line followed by one device per line, every column other than name, manufacturer,
+   model, gateway and tags is a channel config argument, empty cells are ignored
+ * json: a list of records or an object with a "devices" list
+ * jsonl: one JSON record per line
+ * yaml: like json, requires PyYAML (pip install raspyrfm-client[yaml])
+
+CSV and JSON lines files are streamed. Invalid records do not abort the load, they are reported as
+FleetRowError per record. Implementation classes are looked up once per (manufacturer, model), the
+channel config is checked with validators compiled once per implementation and the ON and OFF codes
+of every device are generated for its gateway while loading.
+
+A Fleet keeps named devices with their tags and gateways and executes actions on all devices of a tag
+(see Fleet.send). Devices switched with their own frame are sent with the codes generated while loading
+as long as they are still valid (see FleetDevice.get_code). The fleet indexes its devices by group, change
+the channel config of a fleet device with Fleet.set_channel_config so that the index and codes follow.
+"""
+import csv
+import json
+import os
+
+from raspyrfm_client import catalog
+from raspyrfm_client.device_implementations.controlunit.actions import Action
+
+FORMATS = ("csv", "json", "jsonl", "yaml")
+
+# actions the codes are generated for while loading
+PRE_ENCODED_ACTIONS = (Action.ON, Action.OFF)
+
+# records passed to a worker process at once
+CHUNK_SIZE = 1000
+
+# seconds added to the busy period of every paced frame, covers network and gateway processing latency
+PACING_MARGIN = 0.02
+
+_EXTENSIONS = {
+    ".csv": "csv",
+    ".json": "json",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+}
+
+_CSV_FIELDS = ("name", "manufacturer", "model", "gateway", "tags")
+
+
+class FleetDevice(object):
+    """
+    A named control unit of a fleet
+    """
+    __slots__ = ("name", "device", "gateway", "codes", "tags", "encoded_repetitions", "encoded_config")
+
+    def __init__(self, name: str, device, gateway: str or None, codes: dict, tags: tuple = ()):
+        """
+        :param name: unique name of the device
+        :param device: the configured control unit
+        :param gateway: name of the gateway the device is switched with, None if not assigned
+        :param codes: signal codes per action generated for the gateway
+        :param tags: tags of the device
+        """
+        self.name = name
+        self.device = device
+        self.gateway = gateway
+        self.codes = codes
+        self.tags = tags
+        # repetitions override and channel config the codes were generated with
+        self.encoded_repetitions = device.get_repetitions()
+        self.encoded_config = dict(device.get_channel_config() or {})
+
+    def get_code(self, action: Action) -> str or None:
+        """
+        :param action: the action
+        :return: the signal code generated while loading or None if the action was not pre-encoded
+                 or the repetitions or the channel config of the device changed since
+        """
+        if self.device.get_repetitions(action) != self.encoded_repetitions:
+            return None
+        if (self.device.get_channel_config() or {}) != self.encoded_config:
+            return None
+        return self.codes.get(action)
+
+
+class FleetRowError(object):
+    """
+    An invalid record of a fleet file
+    """
+    __slots__ = ("row", "name", "message")
+
+    def __init__(self, row: int, name: str or None, message: str):
+        """
+        :param row: line number for csv and jsonl files, position in the device list (starting at 1) otherwise
+        :param name: name of the device if the record has one
+        :param message: description of the problem
+        """
+        self.row = row
+        self.name = name
+        self.message = message
+
+    def __str__(self):
+        return "row %d%s: %s" % (self.row, " (" + self.name + ")" if self.name else "", self.message)
+
+
+def get_format(path: str) -> str:
+    """
+    :param path: path of a fleet file
+    :return: the format of the file derived from its extension
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in _EXTENSIONS:
+        raise ValueError("Unknown fleet file format: " + path)
+    return _EXTENSIONS[extension]
+
+
+def read_records(stream, file_format: str):
+    """
+    :param stream: text stream of a fleet file
+    :param file_format: one of FORMATS
+    :return: generator of (row, record) with record being a dict with the keys
+             name, manufacturer, model, gateway, tags and config or the ValueError of an unreadable record
+    """
+    if file_format == "csv":
+        return _read_csv(stream)
+    if file_format == "jsonl":
+        return _read_json_lines(stream)
+    if file_format == "json":
+        return _read_list(json.load(stream))
+    if file_format == "yaml":
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("YAML fleet files require PyYAML: pip install raspyrfm-client[yaml]") from None
+        return _read_list(yaml.safe_load(stream))
+    raise ValueError("Unknown fleet file format: " + str(file_format))
+
+
+def _read_csv(stream):
+    reader = csv.reader(stream)
+    header = [column.strip() for column in next(reader, [])]
+    missing = [field for field in _CSV_FIELDS[:3] if field not in header]
+    if missing:
+        raise ValueError("Missing CSV columns: " + ", ".join(missing))
+
+    fields = [(index, column) for index, column in enumerate(header) if column in _CSV_FIELDS]
+    config_columns = [(index, column) for index, column in enumerate(header) if column not in _CSV_FIELDS]
+    for row in reader:
+        if not row:
+            continue
+        if len(row) != len(header):
+            yield reader.line_num, ValueError("expected %d columns, got %d" % (len(header), len(row)))
+            continue
+
+        record = {column: row[index].strip() or None for index, column in fields}
+        config = {}
+        for index, column in config_columns:
+            value = row[index].strip()
+            if value:
+                config[column] = value
+        record["config"] = config
+        yield reader.line_num, record
+
+
+def _read_json_lines(stream):
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError as e:
+            yield number, ValueError("invalid JSON: " + str(e))
+
+
+def _read_list(document):
+    if isinstance(document, dict):
+        document = document.get("devices")
+    if not isinstance(document, list):
+        raise ValueError("Expected a list of devices or an object with a \"devices\" list")
+    return enumerate(document, 1)
+
+
+class _RecordLoader(object):
+    """
+    Turns records into FleetDevices, caches the implementation class lookups
+    """
+
+    def __init__(self, gateways: dict, default_gateway: str or None, encode: bool):
+        self._gateways = gateways
+        self._default_gateway = default_gateway
+        self._encode = encode
+        self._classes = {}
+
+    def load(self, row: int, record) -> FleetDevice or FleetRowError:
+        if isinstance(record, Exception):
+            return FleetRowError(row, None, str(record))
+        if not isinstance(record, dict):
+            return FleetRowError(row, None, "expected an object, got " + type(record).__name__)
+
+        name = record.get("name")
+        if name is not None:
+            name = str(name)
+        try:
+            return self._load(record, name)
+        except (ValueError, TypeError) as e:
+            return FleetRowError(row, name, str(e))
+
+    def _load(self, record: dict, name: str or None) -> FleetDevice:
+        for field in ("name", "manufacturer", "model"):
+            if not record.get(field):
+                raise ValueError("missing " + field)
+
+        key = (str(record["manufacturer"]), str(record["model"]))
+        controlunit_class = self._classes.get(key)
+        if controlunit_class is None:
+            controlunit_class = catalog.get_controlunit_class(*key)
+            self._classes[key] = controlunit_class
+
+        config = record.get("config") or {}
+        if not isinstance(config, dict):
+            raise ValueError("config must be an object")
+        device = controlunit_class()
+        # YAML reads numeric keys as int
+        device.set_channel_config(**{str(arg): value for arg, value in config.items()})
+
+        gateway_name = record.get("gateway") or self._default_gateway
+        codes = {}
+        if gateway_name is not None:
+            gateway_name = str(gateway_name)
+            if gateway_name not in self._gateways:
+                raise ValueError("unknown gateway " + gateway_name)
+            if self._encode:
+                codes = encode_codes(self._gateways[gateway_name], device)
+
+        return FleetDevice(name, device, gateway_name, codes, parse_tags(record.get("tags")))
+
+
+def encode_codes(gateway, device) -> dict:
+    """
+    :param gateway: the gateway to generate the codes for
+    :param device: the device to generate the codes for
+    :return: signal codes per action of the PRE_ENCODED_ACTIONS the device supports
+    """
+    codes = {}
+    supported_actions = device.get_supported_actions()
+    for action in PRE_ENCODED_ACTIONS:
+        if action in supported_actions:
+            codes[action] = gateway.generate_code(device, action)
+    return codes
+
+
+def parse_tags(tags) -> tuple:
+    """
+    :param tags: None, an iterable of tags or a string of tags separated by ";"
+    :return: the distinct non empty tags in their original order
+    """
+    if not tags:
+        return ()
+    if isinstance(tags, str):
+        tags = tags.split(";")
+    elif not isinstance(tags, (list, tuple, set, frozenset)):
+        raise ValueError("tags must be a list or a string")
+    return tuple(dict.fromkeys(tag for tag in (str(tag).strip() for tag in tags) if tag))
+
+
+# loader of a worker process, see _init_worker
+_worker_loader = None
+
+
+def _init_worker(gateways: dict, default_gateway: str or None, encode: bool) -> None:
+    global _worker_loader
+    _worker_loader = _RecordLoader(gateways, default_gateway, encode)
+
+
+def _load_chunk(chunk: list) -> list:
+    return [(row, _worker_loader.load(row, record)) for row, record in chunk]
+
+
+def _chunks(records, size: int):
+    chunk = []
+    for item in records:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def load_fleet_records(records, gateways: dict = None, default_gateway: str = None, encode: bool = True,
+                       processes: int = None, taken_names=()) -> ([FleetDevice], [FleetRowError]):
+    """
+    Creates the devices of a fleet.
+
+    :param records: iterable of (row, record) as returned by read_records
+    :param gateways: gateways by name the records can refer to
+    :param default_gateway: name of the gateway of records without a gateway, None to leave them unassigned
+    :param encode: generate the ON and OFF codes of every device with an assigned gateway
+    :param processes: number of worker processes, None or 1 to load in the current process
+    :param taken_names: names of existing devices, records with these names are reported as duplicates
+    :return: (devices in record order, errors of the invalid records)
+    """
+    gateways = gateways or {}
+    if default_gateway is not None and default_gateway not in gateways:
+        raise ValueError("Unknown default gateway: " + default_gateway)
+
+    if processes is None or processes <= 1:
+        loader = _RecordLoader(gateways, default_gateway, encode)
+        results = ((row, loader.load(row, record)) for row, record in records)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(processes, initializer=_init_worker,
+                                       initargs=(gateways, default_gateway, encode))
+        with executor:
+            results = [result for chunk in executor.map(_load_chunk, _chunks(records, CHUNK_SIZE))
+                       for result in chunk]
+
+    devices = []
+    errors = []
+    names = set(taken_names)
+    for row, result in results:
+        if isinstance(result, FleetRowError):
+            errors.append(result)
+        elif result.name in names:
+            errors.append(FleetRowError(row, result.name, "duplicate device name"))
+        else:
+            names.add(result.name)
+            devices.append(result)
+    return devices, errors
+
+
+def load_fleet(source, file_format: str = None, gateways: dict = None, default_gateway: str = None,
+               encode: bool = True, processes: int = None, taken_names=()) -> ([FleetDevice], [FleetRowError]):
+    """
+    Loads a fleet file, see the module documentation for the supported formats.
+
+    :param source: path or text stream of the fleet file
+    :param file_format: one of FORMATS, derived from the file extension if None
+    :param gateways: gateways by name the records can refer to
+    :param default_gateway: name of the gateway of records without a gateway, None to leave them unassigned
+    :param encode: generate the ON and OFF codes of every device with an assigned gateway
+    :param processes: number of worker processes, None or 1 to load in the current process
+    :param taken_names: names of existing devices, records with these names are reported as duplicates
+    :return: (devices in file order, errors of the invalid records)
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if file_format is None:
+            file_format = get_format(os.fspath(source))
+        with open(source, newline="", encoding="utf-8") as stream:
+            return load_fleet(stream, file_format, gateways, default_gateway, encode, processes, taken_names)
+
+    if file_format is None:
+        raise ValueError("file_format is required for streams")
+    return load_fleet_records(read_records(source, file_format), gateways, default_gateway, encode, processes,
+                              taken_names)
+
+
+class Fleet(object):
+    """
+    Named devices with tags on top of a RaspyRFMClient.
+
+    Devices are indexed by tag, by gateway and by group, selecting the devices of a tag does not scan the fleet.
+    """
+
+    def __init__(self, rfm_client, gateways: dict = None):
+        """
+        :param rfm_client: the client the commands are sent with
+        :param gateways: gateways by name the devices can be assigned to
+        """
+        self._rfm_client = rfm_client
+        self._gateways = dict(gateways or {})
+        self._devices = {}
+        # tag -> {device name: None}, dicts keep the order the devices were added in
+        self._tag_index = {}
+        self._gateway_index = {}
+        # (gateway, group id) -> {device name: None}, see ControlUnit.get_group_id
+        self._group_index = {}
+        # device name -> the (gateway, group id) the device is indexed under
+        self._indexed_groups = {}
+
+    def __len__(self):
+        return len(self._devices)
+
+    def __contains__(self, name: str):
+        return name in self._devices
+
+    def __iter__(self):
+        return iter(list(self._devices.values()))
+
+    def add_gateway(self, name: str, gateway) -> None:
+        """
+        :param name: name the devices refer to the gateway with
+        :param gateway: the gateway
+        """
+        self._gateways[name] = gateway
+
+    def get_gateway(self, name: str):
+        """
+        :param name: name of the gateway
+        :return: the gateway
+        """
+        if name not in self._gateways:
+            raise ValueError("Unknown gateway: " + str(name))
+        return self._gateways[name]
+
+    def get_gateways(self) -> dict:
+        """
+        :return: gateways by name
+        """
+        return dict(self._gateways)
+
+    def add(self, name: str, device, gateway: str = None, tags=(), encode: bool = True) -> FleetDevice:
+        """
+        :param name: unique name of the device
+        :param device: the configured control unit
+        :param gateway: name of the gateway the device is switched with
+        :param tags: tags of the device, see parse_tags
+        :param encode: generate the ON and OFF codes of the device
+        :return: the added device
+        """
+        if gateway is not None:
+            self.get_gateway(gateway)
+        codes = encode_codes(self._gateways[gateway], device) if encode and gateway is not None else {}
+        fleet_device = FleetDevice(name, device, gateway, codes, parse_tags(tags))
+        self.add_device(fleet_device)
+        return fleet_device
+
+    def add_device(self, fleet_device: FleetDevice) -> None:
+        """
+        :param fleet_device: a device with a unique name, e.g. as returned by load_fleet
+        """
+        if fleet_device.name in self._devices:
+            raise ValueError("Duplicate device name: " + fleet_device.name)
+        if fleet_device.gateway is not None:
+            self.get_gateway(fleet_device.gateway)
+
+        self._devices[fleet_device.name] = fleet_device
+        self._index(fleet_device)
+
+    def load(self, source, file_format: str = None, default_gateway: str = None,
+             processes: int = None) -> [FleetRowError]:
+        """
+        Adds the devices of a fleet file, see load_fleet.
+        Records with the name of a device of the fleet are reported as duplicates.
+
+        :return: errors of the invalid records
+        """
+        devices, errors = load_fleet(source, file_format, self._gateways, default_gateway,
+                                     processes=processes, taken_names=self._devices.keys())
+        for fleet_device in devices:
+            self._devices[fleet_device.name] = fleet_device
+            self._index(fleet_device)
+        return errors
+
+    def remove(self, name: str) -> FleetDevice:
+        """
+        :param name: name of the device
+        :return: the removed device
+        """
+        fleet_device = self.get(name)
+        self._unindex(fleet_device)
+        del self._devices[name]
+        return fleet_device
+
+    def get(self, name: str) -> FleetDevice:
+        """
+        :param name: name of the device
+        :return: the device
+        """
+        if name not in self._devices:
+            raise ValueError("Unknown device: " + str(name))
+        return self._devices[name]
+
+    def set_tags(self, name: str, tags) -> None:
+        """
+        :param name: name of the device
+        :param tags: the new tags of the device, see parse_tags
+        """
+        fleet_device = self.get(name)
+        self._unindex(fleet_device)
+        fleet_device.tags = parse_tags(tags)
+        self._index(fleet_device)
+
+    def set_channel_config(self, name: str, **channel_config) -> None:
+        """
+        Changes the channel config of a device, moves it to its new group and regenerates its codes.
+        Changing the channel config of the control unit directly leaves the device in the group it was added with.
+
+        :param name: name of the device
+        :param channel_config: the new channel config, see ControlUnit.set_channel_config
+        """
+        fleet_device = self.get(name)
+        self._unindex(fleet_device)
+        try:
+            fleet_device.device.set_channel_config(**channel_config)
+        finally:
+            self._index(fleet_device)
+
+        if fleet_device.codes:
+            fleet_device.codes = encode_codes(self._gateways[fleet_device.gateway], fleet_device.device)
+        fleet_device.encoded_repetitions = fleet_device.device.get_repetitions()
+        fleet_device.encoded_config = dict(fleet_device.device.get_channel_config())
+
+    def get_tags(self) -> [str]:
+        """
+        :return: all tags of the fleet
+        """
+        return list(self._tag_index)
+
+    def find(self, tag: str = None, gateway: str = None) -> [FleetDevice]:
+        """
+        :param tag: only devices with this tag, None for any
+        :param gateway: only devices assigned to this gateway, None for any
+        :return: the matching devices
+        """
+        names = self._devices
+        if tag is not None:
+            names = self._tag_index.get(tag, {})
+        if gateway is not None:
+            assigned = self._gateway_index.get(gateway, {})
+            if len(assigned) < len(names):
+                names, assigned = assigned, names
+            names = [name for name in names if name in assigned]
+        return [self._devices[name] for name in names]
+
+    def send(self, action, tag: str = None, names: [str] = None, use_group_commands: bool = False,
+             pace: bool = True) -> int:
+        """
+        Executes an action on all devices of a tag, on the named devices or, if neither is given,
+        on the whole fleet.
+
+        If use_group_commands is enabled, devices sharing a group are switched with a single group frame
+        when every device of the fleet with that group on the same gateway is selected. A group frame
+        reaches every receiver of the group, so partially selected groups are sent per device. Receivers that
+        learned the group but are not part of the fleet are switched as well, so only enable it if the fleet
+        contains the whole group.
+        Every other device is sent with its pre-encoded code if it is still valid and
+        the client has no repetition policy, otherwise its code is generated with send_batch.
+        A gateway drops frames while it transmits, with pace enabled every gateway gets its next frame
+        once the airtime and pause of the previous one passed. The gateways are scheduled independently,
+        so that all of them transmit at the same time and the call takes as long as the busiest gateway.
+
+        :param action: action to execute
+        :param tag: only devices with this tag
+        :param names: only the devices with these names
+        :param use_group_commands: collapse completely selected groups into a single group frame
+        :param pace: wait for the airtime of every frame before sending the next one to the same gateway
+        :return: number of frames sent
+        """
+        if names is not None:
+            selected = [self.get(name) for name in names]
+            if tag is not None:
+                selected = [fleet_device for fleet_device in selected if tag in fleet_device.tags]
+        else:
+            selected = self.find(tag)
+
+        by_gateway = {}
+        for fleet_device in selected:
+            if fleet_device.gateway is None:
+                raise ValueError("Device without gateway: " + fleet_device.name)
+            by_gateway.setdefault(fleet_device.gateway, []).append(fleet_device)
+
+        # every unit is a single frame: a device or the devices sharing a group
+        pending = {gateway: self._get_frame_units(gateway, fleet_devices, use_group_commands)
+                   for gateway, fleet_devices in by_gateway.items()}
+        if not pace:
+            return sum(self._send_unit(self._gateways[gateway], unit, action)
+                       for gateway, units in pending.items() for unit in reversed(units))
+        return self._send_paced(pending, action)
+
+    def _get_frame_units(self, gateway: str, fleet_devices: list, use_group_commands: bool) -> list:
+        """
+        :return: the devices split into single frames in reverse send order (to pop from the end),
+                 devices of a completely selected group share a frame if use_group_commands is enabled
+        """
+        groups = {}
+        if use_group_commands:
+            for fleet_device in fleet_devices:
+                group_id = fleet_device.device.get_group_id()
+                if group_id is not None:
+                    groups.setdefault(group_id, {})[fleet_device.name] = fleet_device
+
+        units = []
+        sent_groups = set()
+        for fleet_device in fleet_devices:
+            group_id = fleet_device.device.get_group_id() if use_group_commands else None
+            selected = groups.get(group_id)
+            complete = (selected is not None and len(selected) > 1
+                        and selected.keys() == self._group_index.get((gateway, group_id), {}).keys())
+            if not complete:
+                units.append([fleet_device])
+            elif group_id not in sent_groups:
+                sent_groups.add(group_id)
+                units.append(list(selected.values()))
+        units.reverse()
+        return units
+
+    def _send_unit(self, gateway, unit: [FleetDevice], action) -> int:
+        """
+        :param unit: a single device or the devices switched with one group frame
+        :return: number of frames sent
+        """
+        if len(unit) == 1 and self._rfm_client.get_repetition_policy() is None:
+            code = unit[0].get_code(action)
+            if code is not None:
+                return self._rfm_client.send_codes(gateway, [code])
+        return self._rfm_client.send_batch(gateway, [fleet_device.device for fleet_device in unit], action,
+                                           use_group_commands=len(unit) > 1)
+
+    def _send_paced(self, pending: dict, action) -> int:
+        import heapq
+        import time
+
+        from raspyrfm_client.airtime import estimate_pulse_data_airtime
+
+        # (time the gateway accepts the next frame, order, gateway)
+        schedule = [(0.0, order, gateway) for order, gateway in enumerate(pending)]
+        frames = 0
+        start = time.monotonic()
+        while schedule:
+            ready, order, name = heapq.heappop(schedule)
+            delay = start + ready - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            gateway = self._gateways[name]
+            unit = pending[name].pop()
+            sent = time.monotonic() - start
+            frames += self._send_unit(gateway, unit, action)
+
+            if pending[name]:
+                if len(unit) > 1:
+                    pulsedata = gateway.get_group_pulse_data(unit[0].device, action)
+                else:
+                    pulsedata = gateway.get_pulse_data(unit[0].device, action)
+                estimate = estimate_pulse_data_airtime(gateway, pulsedata)
+                heapq.heappush(schedule, (sent + estimate.total_us / 1000000 + PACING_MARGIN, order, name))
+        return frames
+
+    def _index(self, fleet_device: FleetDevice) -> None:
+        for tag in fleet_device.tags:
+            self._tag_index.setdefault(tag, {})[fleet_device.name] = None
+        if fleet_device.gateway is not None:
+            self._gateway_index.setdefault(fleet_device.gateway, {})[fleet_device.name] = None
+            group_id = fleet_device.device.get_group_id()
+            if group_id is not None:
+                key = (fleet_device.gateway, group_id)
+                self._group_index.setdefault(key, {})[fleet_device.name] = None
+                self._indexed_groups[fleet_device.name] = key
+
+    def _unindex(self, fleet_device: FleetDevice) -> None:
+        for index, key in [(self._tag_index, tag) for tag in fleet_device.tags] + [
+                (self._gateway_index, fleet_device.gateway),
+                (self._group_index, self._indexed_groups.pop(fleet_device.name, None))]:
+            names = index.get(key)
+            if names is not None:
+                names.pop(fleet_device.name, None)
+                if not names:
+                    del index[key]
@@ -0,0 +1,138 @@
+"""
+Parser for signal code frames.
+
+All gateway dialects share the same frame layout::
+
+    [PREFIX:]0,0,repetitions,pause,timebase,count,value_1,...,value_2count
+
+parse_frame parses such a frame in a single pass into a PulseTrain. The values are stored in an
+array instead of a list of int objects and frames given as bytes or memoryview (e.g. straight
+from a datagram) are never decoded into a str.
+"""
+from array import array
+
+_HEADER_LENGTH = 6
+
+
+class PulseTrain(object):
+    """
+    A parsed frame, the pulse values are stored as unsigned 16 bit values
+    """
+    __slots__ = ("prefix", "reserved", "repetitions", "pause", "timebase", "pulses")
+
+    def __init__(self, prefix, reserved: tuple, repetitions: int, pause: int, timebase: int, pulses: array):
+        """
+        :param prefix: the frame prefix without colon (e.g. "TXP") or None
+        :param reserved: the two leading header fields
+        :param repetitions: number of frame repetitions
+        :param pause: pause after the frame
+        :param timebase: timebase of the pulse values in µs
+        :param pulses: flat array of the pulse values (high, low, high, low, ...)
+        """
+        self.prefix = prefix
+        self.reserved = reserved
+        self.repetitions = repetitions
+        self.pause = pause
+        self.timebase = timebase
+        self.pulses = pulses
+
+    @property
+    def count(self) -> int:
+        """
+        :return: number of pulse pairs
+        """
+        return len(self.pulses) // 2
+
+    def pairs(self) -> [tuple]:
+        """
+        :return: the pulse values as list of (high, low) tuples
+        """
+        pulses = self.pulses
+        return list(zip(pulses[::2], pulses[1::2]))
+
+    def to_pulse_data(self):
+        """
+        :return: (pulse pairs, repetitions, timebase) like ControlUnit.get_pulse_data
+        """
+        return self.pairs(), self.repetitions, self.timebase
+
+    def signature(self):
+        """
+        :return: a hashable key identifying the pulse train independent of repetitions and pause
+        """
+        return self.timebase, self.pulses.tobytes()
+
+    def __eq__(self, other):
+        if not isinstance(other, PulseTrain):
+            return NotImplemented
+        return (self.prefix == other.prefix and self.reserved == other.reserved
+                and self.repetitions == other.repetitions and self.pause == other.pause
+                and self.timebase == other.timebase and self.pulses == other.pulses)
+
+    def __repr__(self):
+        return "PulseTrain(prefix=%r, repetitions=%d, pause=%d, timebase=%d, count=%d)" % (
+            self.prefix, self.repetitions, self.pause, self.timebase, self.count)
+
+
+def parse_frame(data, strict: bool = True) -> PulseTrain or None:
+    """
+    Parses a frame.
+
+    In strict mode the frame has to match the layout exactly, otherwise a ValueError is raised.
+    In lenient mode surrounding whitespace, empty values (e.g. a trailing comma) and values beyond
+    the announced count are ignored, a frame with less values than announced is truncated to
+    complete pairs. None is returned if the frame can not be parsed at all.
+
+    :param data: the frame as str, bytes, bytearray or memoryview
+    :param strict: whether to reject frames that do not match the layout exactly
+    :return: the parsed pulse train (or None in lenient mode)
+    """
+    try:
+        return _parse_frame(data, strict)
+    except ValueError:
+        if strict:
+            raise
+        return None
+    except OverflowError as err:
+        if strict:
+            raise ValueError("Pulse value out of range") from err
+        return None
+
+
+def _parse_frame(data, strict: bool) -> PulseTrain:
+    if isinstance(data, str):
+        separator, colon = ",", ":"
+    else:
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        separator, colon = b",", b":"
+
+    if not strict:
+        data = data.strip()
+
+    prefix = None
+    start = data.find(colon)
+    if start >= 0:
+        prefix = data[:start]
+        if not isinstance(prefix, str):
+            prefix = prefix.decode("ascii")
+        if strict and not prefix.isalpha():
+            raise ValueError("Invalid prefix " + repr(prefix))
+
+    tokens = data[start + 1:].split(separator)
+    if not strict:
+        tokens = [token for token in tokens if token]
+    if len(tokens) < _HEADER_LENGTH:
+        raise ValueError("Expected at least " + str(_HEADER_LENGTH) + " header values, got " + str(len(tokens)))
+
+    reserved_1, reserved_2, repetitions, pause, timebase, count = map(int, tokens[:_HEADER_LENGTH])
+
+    end = _HEADER_LENGTH + count * 2
+    if strict and len(tokens) != end:
+        raise ValueError("Expected " + str(count) + " pulse pairs, got " + str((len(tokens) - _HEADER_LENGTH) / 2))
+    if not strict and len(tokens) < end:
+        end = _HEADER_LENGTH + (len(tokens) - _HEADER_LENGTH) // 2 * 2
+
+    pulses = array("H", map(int, tokens[_HEADER_LENGTH:end]))
+
+    return PulseTrain(prefix, (reserved_1, reserved_2), repetitions, pause, timebase, pulses)
@@ -0,0 +1,184 @@
+"""
+Instrumentation of the encode and send pipeline.
+
+The following stages are timed:
+ * lookup: catalog lookup of the gateway and control unit implementations (get_gateway, get_controlunit)
+ * encode: Gateway.generate_code, i.e. validation, pulse data and encoding into the signal code
+ * socket: creation of the UDP socket
+ * sendto: sending the signal code
+
+The stages do not cover the whole send path: validation and pulse data generation are only timed as
+part of encode, applying the repetition policy and the callbacks are not timed at all.
+
+Set an Instrumentation on the client (RaspyRFMClient.set_instrumentation) to record the duration of
+every stage in a histogram, count sent frames and bytes and get notified through callbacks.
+Without an instrumentation the client only checks a single attribute per call.
+"""
+STAGES = ("lookup", "encode", "socket", "sendto")
+
+EVENTS = ("on_encode", "on_send", "on_error")
+
+# bucket i counts durations in [2^(i-1), 2^i) ns, bucket 0 counts durations of 0 ns
+_BUCKETS = 48
+
+
+class Histogram(object):
+    """
+    Histogram of durations in ns with power of two buckets
+    """
+    __slots__ = ("count", "total_ns", "min_ns", "max_ns", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = None
+        self.buckets = [0] * _BUCKETS
+
+    def record(self, duration_ns: int) -> None:
+        """
+        :param duration_ns: a measured duration
+        """
+        self.count += 1
+        self.total_ns += duration_ns
+        if self.min_ns is None or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        if self.max_ns is None or duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+        self.buckets[min(duration_ns.bit_length(), _BUCKETS - 1)] += 1
+
+    @property
+    def mean_ns(self) -> float:
+        """
+        :return: the mean duration or 0 if nothing was recorded
+        """
+        return self.total_ns / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> int:
+        """
+        :param percentile: percentile within [0, 100]
+        :return: upper bound of the bucket containing the percentile, limited to the maximum duration
+        """
+        if not self.count:
+            return 0
+        rank = max(1, percentile / 100 * self.count)
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min((1 << index) - 1 if index else 0, self.max_ns)
+        return self.max_ns
+
+    def to_dict(self) -> dict:
+        """
+        :return: a serialisable summary of the histogram
+        """
+        return {
+            "count": self.count,
+            "total_ns": self.total_ns,
+            "mean_ns": round(self.mean_ns, 1),
+            "min_ns": self.min_ns,
+            "max_ns": self.max_ns,
+            "p50_ns": self.percentile(50),
+            "p99_ns": self.percentile(99),
+        }
+
+
+class Instrumentation(object):
+    """
+    Collects per-stage timings and counters of a RaspyRFMClient and dispatches callbacks.
+
+    Callbacks:
+     * on_encode(device, action, message): a signal code was generated
+     * on_send(gateway, message, duration_ns): a signal code was sent, duration_ns is the time spent in the
+       encode, socket and sendto stages up to this frame, without the time spent in callbacks
+     * on_error(stage, error): a stage raised an exception, the exception is raised again afterwards
+
+    Exceptions raised by callbacks are not caught.
+    """
+
+    def __init__(self):
+        self._histograms = {stage: Histogram() for stage in STAGES}
+        self._counters = {}
+        self._callbacks = {event: [] for event in EVENTS}
+
+    def add_callback(self, event: str, callback) -> None:
+        """
+        :param event: one of EVENTS
+        :param callback: callable to invoke on the event
+        """
+        if event not in self._callbacks:
+            raise ValueError("Unknown event: " + str(event))
+        self._callbacks[event].append(callback)
+
+    def remove_callback(self, event: str, callback) -> None:
+        """
+        :param event: one of EVENTS
+        :param callback: a previously added callback
+        """
+        if event not in self._callbacks:
+            raise ValueError("Unknown event: " + str(event))
+        self._callbacks[event].remove(callback)
+
+    def record(self, stage: str, duration_ns: int) -> None:
+        """
+        :param stage: one of STAGES
+        :param duration_ns: duration of the stage
+        """
+        self._histograms[stage].record(duration_ns)
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        """
+        :param counter: name of the counter
+        :param value: value to add
+        """
+        self._counters[counter] = self._counters.get(counter, 0) + value
+
+    def emit(self, event: str, *args) -> None:
+        """
+        Invokes the callbacks of an event
+        :param event: one of EVENTS
+        :param args: arguments passed to the callbacks
+        """
+        for callback in self._callbacks[event]:
+            callback(*args)
+
+    def error(self, stage: str, error: Exception) -> None:
+        """
+        Counts a failed stage and notifies the on_error callbacks
+        :param stage: the failed stage
+        :param error: the raised exception
+        """
+        self.increment("errors")
+        self.increment("errors." + stage)
+        self.emit("on_error", stage, error)
+
+    def get_histogram(self, stage: str) -> Histogram:
+        """
+        :param stage: one of STAGES
+        :return: the histogram of the stage
+        """
+        return self._histograms[stage]
+
+    def get_counter(self, counter: str) -> int:
+        """
+        :param counter: name of the counter
+        :return: current value of the counter
+        """
+        return self._counters.get(counter, 0)
+
+    def snapshot(self) -> dict:
+        """
+        :return: a serialisable summary of all stages and counters
+        """
+        return {
+            "stages": {stage: histogram.to_dict() for stage, histogram in self._histograms.items()},
+            "counters": dict(self._counters),
+        }
+
+    def reset(self) -> None:
+        """
+        Clears all timings and counters, callbacks are kept
+        """
+        self._histograms = {stage: Histogram() for stage in STAGES}
+        self._counters = {}
@@ -0,0 +1,192 @@
+"""
+Adaptive frame repetitions.
+
+Device implementations use a fixed number of repetitions per frame which is chosen to reach
+receivers in bad conditions. Most installations get away with fewer repetitions, which
+reduces the airtime of each command. The AdaptiveRepetitionPolicy learns the lowest number
+of repetitions per device that is still confirmed to work and never goes below a floor.
+"""
+from array import array
+from collections import OrderedDict
+from itertools import chain
+
+from raspyrfm_client.device_implementations.controlunit.actions import Action
+from raspyrfm_client.device_implementations.controlunit.base import ControlUnit
+from raspyrfm_client.device_implementations.gateway.base import Gateway
+from raspyrfm_client.frame import parse_frame
+
+
+class _RepetitionState(object):
+    __slots__ = ("default", "current", "confirmations", "locked")
+
+    def __init__(self, default: int, current: int):
+        self.default = default
+        self.current = current
+        self.confirmations = 0
+        self.locked = False
+
+
+class AdaptiveRepetitionPolicy(object):
+    """
+    Learns a lower safe number of repetitions for each device from feedback.
+
+    Feedback is either an explicit confirmation/rejection (e.g. by the user) or the echo of a
+    sent frame heard on the receive path of a gateway (see observe_echo).
+    After the configured number of consecutive confirmations the repetitions are lowered by one.
+    A rejection raises them again by one and stops further probing for this device.
+    """
+
+    def __init__(self, floor: int = 2, confirmations: int = 3, max_pending_echoes: int = 64):
+        """
+        :param floor: the repetitions are never lowered below this value
+        :param confirmations: consecutive confirmations needed before the repetitions are lowered
+        :param max_pending_echoes: number of sent frames remembered for echo matching
+        """
+        if floor < 1:
+            raise ValueError("floor must be at least 1, got " + str(floor))
+        if confirmations < 1:
+            raise ValueError("confirmations must be at least 1, got " + str(confirmations))
+
+        self._floor = floor
+        self._confirmations = confirmations
+        self._max_pending_echoes = max_pending_echoes
+        self._states = {}
+        self._pending_echoes = OrderedDict()
+
+    @staticmethod
+    def _get_device_key(device: ControlUnit):
+        channel_config = device.get_channel_config() or {}
+        return (device.get_manufacturer(), device.get_model(),
+                tuple(sorted((key, str(value)) for key, value in channel_config.items())))
+
+    @staticmethod
+    def _get_default_repetitions(device: ControlUnit) -> int:
+        for action in device.get_supported_actions():
+            if action not in (Action.PAIR, Action.UNPAIR):
+                Gateway._check_device_action(device, action)
+                return device.get_pulse_data(action)[1]
+        raise ValueError("Device has no action that supports repetition overrides: " + str(device.get_model()))
+
+    def _get_state(self, device: ControlUnit) -> _RepetitionState:
+        key = self._get_device_key(device)
+        state = self._states.get(key)
+        if state is None:
+            default = self._get_default_repetitions(device)
+            state = _RepetitionState(default, default)
+            self._states[key] = state
+        return state
+
+    def get_repetitions(self, device: ControlUnit) -> int:
+        """
+        :param device: a configured device
+        :return: the number of repetitions currently considered safe for this device
+        """
+        return self._get_state(device).current
+
+    def apply(self, device: ControlUnit) -> int:
+        """
+        Sets the learned repetitions as repetitions override on the device
+        :param device: a configured device
+        :return: the applied number of repetitions
+        """
+        repetitions = self.get_repetitions(device)
+        device.set_repetitions(repetitions)
+        return repetitions
+
+    def confirm(self, device: ControlUnit) -> None:
+        """
+        Reports that the last command reached the device.
+        :param device: the device that executed the command
+        """
+        self._confirm_state(self._get_state(device))
+
+    def reject(self, device: ControlUnit) -> None:
+        """
+        Reports that the last command did not reach the device.
+        The repetitions are raised again and will not be lowered for this device anymore.
+        :param device: the device that did not execute the command
+        """
+        state = self._get_state(device)
+        state.confirmations = 0
+        state.current = min(state.default, state.current + 1)
+        state.locked = True
+
+    def reset(self, device: ControlUnit = None) -> None:
+        """
+        Forgets the learned repetitions
+        :param device: the device to reset, all devices if None
+        """
+        if device is None:
+            self._states.clear()
+        else:
+            self._states.pop(self._get_device_key(device), None)
+
+    def register_sent(self, device: ControlUnit, message: str, gateway: Gateway = None) -> None:
+        """
+        Remembers a sent frame so that its echo can be attributed to the device
+        :param device: the device the frame was sent to
+        :param message: the signal code that was sent
+        :param gateway: the gateway the code was generated for, if given the code is decoded first so that
+                        gateway specific encodings (e.g. the shifted pulses of the ITGW) match the echo
+        """
+        if gateway is None:
+            signature = self._get_pulse_signature(message)
+        else:
+            signature = self._get_code_signature(gateway, message)
+        if signature is None:
+            return
+
+        self._pending_echoes[signature] = self._get_device_key(device)
+        self._pending_echoes.move_to_end(signature)
+        while len(self._pending_echoes) > self._max_pending_echoes:
+            self._pending_echoes.popitem(last=False)
+
+    def observe_echo(self, payload: str) -> bool:
+        """
+        Feeds a payload received by a gateway into the policy.
+        If it is the echo of a recently sent frame the corresponding device is confirmed.
+        :param payload: the received payload
+        :return: True if the payload confirmed a device
+        """
+        signature = self._get_pulse_signature(payload)
+        key = self._pending_echoes.pop(signature, None) if signature is not None else None
+        if key is None:
+            return False
+
+        state = self._states.get(key)
+        if state is None:
+            return False
+
+        self._confirm_state(state)
+        return True
+
+    def _confirm_state(self, state: _RepetitionState) -> None:
+        if state.locked:
+            return
+
+        state.confirmations += 1
+        if state.confirmations >= self._confirmations:
+            state.confirmations = 0
+            state.current = max(min(self._floor, state.default), state.current - 1)
+
+    @staticmethod
+    def _get_pulse_signature(payload: str):
+        """
+        :param payload: a signal code or received frame
+        :return: a key of the pulse train independent of the repetitions or None if the payload can not be parsed
+        """
+        frame = parse_frame(payload, strict=False)
+        return frame.signature() if frame is not None else None
+
+    @staticmethod
+    def _get_code_signature(gateway: Gateway, code: str):
+        """
+        :param gateway: the gateway the code was generated for
+        :param code: a signal code in the format of the gateway
+        :return: the pulse signature of the decoded pulse data or None if the code can not be decoded
+        """
+        try:
+            (pulses, _repetitions, timebase), _pause = gateway.decode_code(code)
+        except (ValueError, NotImplementedError):
+            return None
+        return timebase, array("H", chain.from_iterable(pulses)).tobytes()
@@ -0,0 +1,288 @@
+"""
+Local stand-in for a gateway, e.g. for load tests without RF hardware.
+
+The GatewaySimulator listens on a UDP port like a real gateway and
+ * answers "SEARCH HCGW" with the search response of the simulated gateway model
+ * accepts signal codes in the dialect of the simulated gateway model (TXP or ITGW)
+ * is busy while it transmits a frame: the airtime of the frame and the pause after it are derived
+   from the pulse data, frames arriving in that period are dropped like on the real hardware
+ * emits "RXP:" receive frames at a configurable rate to every host that sent "RXSTART"
+
+Run it from the command line with:
+    python -m raspyrfm_client.simulator --model RaspyRFM --port 49880 --rx-rate 5
+"""
+import argparse
+import socket
+import threading
+import time
+from collections import deque
+
+from raspyrfm_client.airtime import estimate_pulse_data_airtime
+from raspyrfm_client.device_implementations.gateway.manufacturer.gateway_constants import GatewayModel
+
+DEFAULT_PORT = 49880
+DEFAULT_RX_PORT = 49881
+
+SEARCH_REQUEST = b"SEARCH HCGW"
+
+# vendor and model code the gateways report in their search response
+_SEARCH_IDENTITIES = {
+    GatewayModel.RASPYRFM: ("Seegel Systeme", "RaspyRFM"),
+    GatewayModel.CONNAIR: ("Simple Solutions", "ConnAir"),
+    GatewayModel.ITGW: ("ITECHNO", "ITGW-433"),
+}
+
+# Intertechno CMR 1000, master A, slave 1, ON
+DEFAULT_RX_PAYLOAD = ("RXP:0,0,1,5600,350,25,"
+                      "1,3,1,3,1,3,1,3,1,3,1,3,1,3,1,3,1,3,1,3,1,3,1,3,1,3,1,3,1,3,1,3,1,3,1,3,1,3,"
+                      "3,1,1,3,3,1,1,3,3,1,1,31")
+
+
+class SimulatorStats(object):
+    """
+    Counters of a GatewaySimulator
+    """
+    __slots__ = ("received", "accepted", "dropped_busy", "invalid", "searches", "rx_sent", "on_air_us")
+
+    def __init__(self):
+        self.received = 0
+        self.accepted = 0
+        self.dropped_busy = 0
+        self.invalid = 0
+        self.searches = 0
+        self.rx_sent = 0
+        self.on_air_us = 0
+
+    def to_dict(self) -> dict:
+        """
+        :return: a serialisable representation of the counters
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class GatewaySimulator(object):
+    """
+    A UDP gateway stand-in, see the module documentation
+    """
+
+    def __init__(self, gateway_model: GatewayModel = GatewayModel.RASPYRFM, host: str = "127.0.0.1",
+                 port: int = DEFAULT_PORT, rx_port: int = DEFAULT_RX_PORT, firmware_version: str = "1.00",
+                 rx_rate: float = 0.0, rx_payloads: [str] = None, airtime_scale: float = 1.0,
+                 history_size: int = 1000):
+        """
+        :param gateway_model: the simulated gateway model
+        :param host: address to listen on
+        :param port: port to listen on, 0 to use a free port (see get_address)
+        :param rx_port: port of the hosts that sent "RXSTART" the receive frames are sent to
+        :param firmware_version: firmware version reported in the search response
+        :param rx_rate: receive frames emitted per second while a host is subscribed
+        :param rx_payloads: receive frames that are emitted in turn
+        :param airtime_scale: factor applied to the busy period of every frame, 0 disables busy periods
+        :param history_size: number of accepted codes kept (see get_history)
+        """
+        from raspyrfm_client.transcode import _get_gateway
+
+        if rx_rate < 0:
+            raise ValueError("rx_rate must not be negative")
+        if airtime_scale < 0:
+            raise ValueError("airtime_scale must not be negative")
+
+        self._gateway = _get_gateway(gateway_model)
+        self._gateway_model = gateway_model
+        self._host = host
+        self._port = port
+        self._rx_port = rx_port
+        self._firmware_version = firmware_version
+        self._rx_rate = rx_rate
+        self._rx_payloads = list(rx_payloads or [DEFAULT_RX_PAYLOAD])
+        self._airtime_scale = airtime_scale
+
+        self._stats = SimulatorStats()
+        self._history = deque(maxlen=history_size)
+        self._subscribers = set()
+        self._busy_until = 0.0
+        self._lock = threading.Lock()
+        self._sock = None
+        self._thread = None
+        self._running = threading.Event()
+
+    def get_address(self) -> (str, int):
+        """
+        :return: (host, port) the simulator listens on
+        """
+        if self._sock is not None:
+            return self._sock.getsockname()[:2]
+        return self._host, self._port
+
+    def get_search_response(self, ip: str = None) -> str:
+        """
+        :param ip: the ip address to report, the listen address if None
+        :return: the response to a "SEARCH HCGW" request
+        """
+        vendor, model = _SEARCH_IDENTITIES[self._gateway_model]
+        return "HCGW:VC:%s;MC:%s;FW:%s;IP:%s;;" % (vendor, model, self._firmware_version,
+                                                   ip or self.get_address()[0])
+
+    def get_stats(self) -> SimulatorStats:
+        """
+        :return: the counters of the simulator
+        """
+        return self._stats
+
+    def get_history(self) -> [str]:
+        """
+        :return: the most recently accepted codes, oldest first
+        """
+        with self._lock:
+            return list(self._history)
+
+    def handle_datagram(self, data: bytes, address, now: float = None) -> bytes or None:
+        """
+        Processes a single datagram as the gateway would
+        :param data: the received datagram
+        :param address: (host, port) of the sender
+        :param now: the receive time (time.monotonic), the current time if None
+        :return: the response to send back to the sender or None
+        """
+        if now is None:
+            now = time.monotonic()
+
+        message = data.strip()
+        if message == SEARCH_REQUEST:
+            self._stats.searches += 1
+            return self.get_search_response().encode()
+        if message == b"RXSTART":
+            with self._lock:
+                self._subscribers.add((address[0], self._rx_port))
+            return None
+        if message == b"RXSTOP":
+            with self._lock:
+                self._subscribers.discard((address[0], self._rx_port))
+            return None
+
+        self._stats.received += 1
+        try:
+            code = message.decode("ascii")
+            pulsedata, pause = self._gateway.decode_code(code)
+        except ValueError:
+            self._stats.invalid += 1
+            return None
+
+        with self._lock:
+            if now < self._busy_until:
+                self._stats.dropped_busy += 1
+                return None
+
+            estimate = estimate_pulse_data_airtime(self._gateway, pulsedata)
+            self._busy_until = now + (estimate.on_air_us + pause) * self._airtime_scale / 1000000
+            self._stats.accepted += 1
+            self._stats.on_air_us += estimate.on_air_us
+            self._history.append(code)
+        return None
+
+    def start(self) -> None:
+        """
+        Binds the socket and starts serving in a background thread
+        """
+        if self._thread is not None:
+            return
+
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((self._host, self._port))
+        self._running.set()
+        self._thread = threading.Thread(target=self._serve, name="GatewaySimulator", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops serving and closes the socket
+        """
+        if self._thread is None:
+            return
+
+        self._running.clear()
+        self._thread.join()
+        self._thread = None
+        self._sock.close()
+        self._sock = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _serve(self) -> None:
+        rx_interval = 1 / self._rx_rate if self._rx_rate > 0 else None
+        next_rx = time.monotonic()
+        rx_index = 0
+
+        while self._running.is_set():
+            timeout = 0.1
+            if rx_interval is not None and self._subscribers:
+                timeout = min(timeout, max(0.0, next_rx - time.monotonic()))
+            self._sock.settimeout(timeout)
+
+            try:
+                data, address = self._sock.recvfrom(4096)
+            except socket.timeout:
+                pass
+            except OSError:
+                if not self._running.is_set():
+                    break
+                raise
+            else:
+                response = self.handle_datagram(data, address)
+                if response is not None:
+                    self._sock.sendto(response, address)
+
+            if rx_interval is None:
+                continue
+
+            now = time.monotonic()
+            with self._lock:
+                subscribers = list(self._subscribers)
+            if not subscribers:
+                next_rx = now
+                continue
+
+            while next_rx <= now:
+                payload = self._rx_payloads[rx_index % len(self._rx_payloads)].encode()
+                rx_index += 1
+                for subscriber in subscribers:
+                    self._sock.sendto(payload, subscriber)
+                    self._stats.rx_sent += 1
+                next_rx += rx_interval
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=GatewayModel.RASPYRFM.value,
+                        choices=[model.value for model in GatewayModel], help="simulated gateway model")
+    parser.add_argument("--host", default="0.0.0.0", help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on")
+    parser.add_argument("--rx-port", type=int, default=DEFAULT_RX_PORT, help="port receive frames are sent to")
+    parser.add_argument("--rx-rate", type=float, default=0.0, help="receive frames per second after RXSTART")
+    parser.add_argument("--rx-payload", action="append", help="receive frame to emit (repeatable)")
+    parser.add_argument("--airtime-scale", type=float, default=1.0,
+                        help="factor applied to the busy period of every frame, 0 disables busy periods")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between statistics output")
+    args = parser.parse_args()
+
+    simulator = GatewaySimulator(GatewayModel(args.model), args.host, args.port, args.rx_port,
+                                 rx_rate=args.rx_rate, rx_payloads=args.rx_payload,
+                                 airtime_scale=args.airtime_scale)
+    with simulator:
+        print("Simulating %s on %s:%d" % ((args.model,) + tuple(simulator.get_address())))
+        try:
+            while True:
+                time.sleep(args.interval)
+                print(simulator.get_stats().to_dict())
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
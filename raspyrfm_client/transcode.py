@@ -0,0 +1,110 @@
+"""
+Conversion of signal codes between gateway dialects.
+
+RaspyRFM and ConnAir gateways expect "TXP:0,0,repetitions,pause,timebase,count,pulses..." codes,
+the Intertechno gateway expects the same pulse train shifted by half a pulse
+("0,0,repetitions,pause,timebase,count+1,0,pulses...,last*4,0"). A code learned through one
+gateway can be replayed through any other gateway by decoding it with the gateway of its
+dialect and encoding the pulse data again with the target gateway.
+"""
+import importlib
+import pkgutil
+from functools import lru_cache
+
+from raspyrfm_client.device_implementations.gateway.base import Gateway
+from raspyrfm_client.device_implementations.gateway.manufacturer.gateway_constants import GatewayModel
+
+
+@lru_cache(maxsize=1)
+def _get_gateways() -> dict:
+    """
+    :return: dictionary of gateway model to a gateway instance of every available gateway implementation
+    """
+    from raspyrfm_client.device_implementations.gateway import manufacturer
+
+    for _, name, _ in pkgutil.walk_packages(manufacturer.__path__, manufacturer.__name__ + "."):
+        importlib.import_module(name)
+
+    gateways = {}
+    pending = list(Gateway.__subclasses__())
+    while pending:
+        gateway_implementation = pending.pop(0)
+        pending.extend(gateway_implementation.__subclasses__())
+        if getattr(gateway_implementation, "DISABLED", False) is True:
+            continue
+        gateway = gateway_implementation()
+        gateways[gateway.get_model()] = gateway
+
+    return gateways
+
+
+def _get_gateway(gateway_model: GatewayModel) -> Gateway:
+    try:
+        return _get_gateways()[gateway_model]
+    except KeyError:
+        raise ValueError("Unsupported gateway model: " + str(gateway_model)) from None
+
+
+def decode(code: str, gateway_model: GatewayModel = None):
+    """
+    Decodes a signal code of any supported gateway dialect.
+
+    :param code: the signal code
+    :param gateway_model: the gateway model the code was generated for, detected automatically if None
+    :return: (gateway model, (pulse pairs, repetitions, timebase), pause)
+    :raises ValueError: if the code does not match any (or the given) gateway dialect
+    """
+    code = code.strip()
+
+    if gateway_model is not None:
+        pulsedata, pause = _get_gateway(gateway_model).decode_code(code)
+        return gateway_model, pulsedata, pause
+
+    for model, gateway in _get_gateways().items():
+        try:
+            pulsedata, pause = gateway.decode_code(code)
+        except ValueError:
+            continue
+        return model, pulsedata, pause
+
+    raise ValueError("Unknown signal code format: " + code)
+
+
+def transcode(code: str, target_gateway_model: GatewayModel, source_gateway_model: GatewayModel = None) -> str:
+    """
+    Converts a signal code into the dialect of another gateway.
+    The pause is scaled from the pause convention of the source gateway to the one of the target gateway.
+
+    :param code: the signal code
+    :param target_gateway_model: the gateway model the code should be sent with
+    :param source_gateway_model: the gateway model the code was generated for, detected automatically if None
+    :return: the signal code for the target gateway
+    """
+    source_model, pulsedata, pause = decode(code, source_gateway_model)
+
+    source = _get_gateway(source_model)
+    target = _get_gateway(target_gateway_model)
+    pause = round(pause * target.get_pause_length() / source.get_pause_length())
+
+    return target.encode_pulse_data(pulsedata, pause)
+
+
+def transcode_all(codes, target_gateway_model: GatewayModel, source_gateway_model: GatewayModel = None) -> [str]:
+    """
+    Converts many signal codes into the dialect of another gateway, e.g. when importing stored codes.
+    Duplicate codes are only converted once.
+
+    :param codes: iterable of signal codes
+    :param target_gateway_model: the gateway model the codes should be sent with
+    :param source_gateway_model: the gateway model the codes were generated for, detected automatically if None
+    :return: list of signal codes for the target gateway in the order of the input
+    """
+    converted = {}
+    results = []
+    for code in codes:
+        result = converted.get(code)
+        if result is None:
+            result = transcode(code, target_gateway_model, source_gateway_model)
+            converted[code] = result
+        results.append(result)
+    return results
@@ -0,0 +1,83 @@
+import math
+import unittest
+
+from raspyrfm_client import RaspyRFMClient
+from raspyrfm_client.airtime import DutyCyclePlanner, estimate_airtime, estimate_airtime_batch
+from raspyrfm_client.device_implementations.controlunit.actions import Action
+from raspyrfm_client.device_implementations.controlunit.controlunit_constants import ControlUnitModel
+from raspyrfm_client.device_implementations.gateway.manufacturer.gateway_constants import GatewayModel
+from raspyrfm_client.device_implementations.manufacturer_constants import Manufacturer
+
+
+class TestAirtime(unittest.TestCase):
+    def setUp(self):
+        self.rfm_client = RaspyRFMClient()
+        self.raspyrfm = self.rfm_client.get_gateway(Manufacturer.SEEGEL_SYSTEME, GatewayModel.RASPYRFM, "10.0.0.1")
+        self.itgw = self.rfm_client.get_gateway(Manufacturer.INTERTECHNO, GatewayModel.ITGW, "10.0.0.2")
+
+        self.device = self.rfm_client.get_controlunit(Manufacturer.INTERTECHNO, ControlUnitModel.CMR_1000)
+        self.device.set_channel_config(master='A', slave=1)
+
+    def test_estimate_matches_pulse_data(self):
+        pulses, repetitions, timebase = self.device.get_pulse_data(Action.ON)
+        frame_us = sum(high + low for high, low in pulses) * timebase
+
+        estimate = estimate_airtime(self.raspyrfm, self.device, Action.ON)
+
+        self.assertEqual(estimate.frame_us, frame_us)
+        self.assertEqual(estimate.repetitions, repetitions)
+        self.assertEqual(estimate.on_air_us, frame_us * repetitions)
+        self.assertEqual(estimate.total_us, frame_us * repetitions + 5600)
+        self.assertEqual(estimate.carrier_us, sum(high for high, _ in pulses) * timebase * repetitions)
+
+    def test_itgw_stretches_trailing_pause(self):
+        pulses, _, timebase = self.device.get_pulse_data(Action.ON)
+
+        raspyrfm = estimate_airtime(self.raspyrfm, self.device, Action.ON)
+        itgw = estimate_airtime(self.itgw, self.device, Action.ON)
+
+        self.assertEqual(itgw.frame_us - raspyrfm.frame_us, pulses[-1][1] * 3 * timebase)
+        self.assertEqual(itgw.pause_us, 11200)
+
+    def test_repetitions_override(self):
+        self.device.set_repetitions(2)
+        self.assertEqual(estimate_airtime(self.raspyrfm, self.device, Action.ON).repetitions, 2)
+
+    def test_batch(self):
+        commands = [(self.raspyrfm, self.device, Action.ON), (self.itgw, self.device, Action.OFF)] * 3
+        estimates = estimate_airtime_batch(commands)
+
+        self.assertEqual(len(estimates), 6)
+        for (gateway, device, action), estimate in zip(commands, estimates):
+            self.assertEqual(estimate.total_us, estimate_airtime(gateway, device, action).total_us)
+
+    def test_duty_cycle_planner(self):
+        on_air_us = estimate_airtime(self.raspyrfm, self.device, Action.ON).on_air_us
+
+        planner = DutyCyclePlanner(window=10.0, limit=0.01)
+        # burst of commands within one window on the first gateway
+        for i in range(10):
+            planner.add(i * 0.5, self.raspyrfm, self.device, Action.ON)
+        # a single command every minute on the second gateway
+        for i in range(3):
+            planner.add(i * 60.0, self.itgw, self.device, Action.OFF)
+
+        reports = planner.report()
+        burst = reports[("10.0.0.1", 49880)]
+        sparse = reports[("10.0.0.2", 49880)]
+
+        self.assertEqual(burst.commands, 10)
+        self.assertAlmostEqual(burst.peak_utilisation, 10 * on_air_us / 10000000)
+        self.assertEqual(burst.peak_window_start, 0)
+        self.assertEqual(burst.windows_over_limit, 10)
+        self.assertEqual(burst.required_gateways, math.ceil(burst.peak_utilisation / 0.01))
+
+        self.assertEqual(sparse.commands, 3)
+        # the commands are further apart than the window
+        self.assertAlmostEqual(sparse.peak_utilisation,
+                               estimate_airtime(self.itgw, self.device, Action.OFF).on_air_us / 10000000)
+        self.assertEqual(sparse.to_dict()["model"], GatewayModel.ITGW.value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+
+from raspyrfm_client import catalog
+
+
+class TestCatalog(unittest.TestCase):
+    def test_catalog_is_up_to_date(self):
+        gateways, controlunits = catalog.generate_entries()
+
+        self.assertEqual(catalog.GATEWAYS, gateways, "run python -m raspyrfm_client.catalog")
+        self.assertEqual(catalog.CONTROLUNITS, controlunits, "run python -m raspyrfm_client.catalog")
+
+    def test_lookup(self):
+        from raspyrfm_client.device_implementations.controlunit.manufacturer.intertechno.CMR1000 import CMR1000
+
+        self.assertIs(catalog.get_controlunit_class("Intertechno", "CMR 1000"), CMR1000)
+        self.assertIs(catalog.get_controlunit_class("INTERTECHNO", "cmr_1000"), CMR1000)
+        self.assertEqual(catalog.get_gateway_class(None, "Intertechno Gateway").__name__, "ITGW")
+        self.assertRaises(ValueError, catalog.get_controlunit_class, "Intertechno", "CMR 9999")
+
+
+if __name__ == '__main__':
+    unittest.main()
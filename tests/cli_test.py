@@ -0,0 +1,56 @@
+import contextlib
+import io
+import socket
+import sys
+import unittest
+
+from raspyrfm_client import cli
+
+
+class TestCli(unittest.TestCase):
+    COMMAND = ["Intertechno", "CMR 1000", "ON", "master=A", "slave=1"]
+
+    def run_cli(self, argv, stdin: str = ""):
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        old_stdin = sys.stdin
+        sys.stdin = io.StringIO(stdin)
+        try:
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                result = cli.main(argv)
+        finally:
+            sys.stdin = old_stdin
+        return result, stdout.getvalue(), stderr.getvalue()
+
+    def test_encode(self):
+        result, stdout, _ = self.run_cli(["encode"] + self.COMMAND)
+        self.assertEqual(result, 0)
+        self.assertTrue(stdout.startswith("TXP:0,0,5,5600,350,25,"))
+
+        result, stdout, _ = self.run_cli(["encode", "--gateway", "ITGW"] + self.COMMAND)
+        self.assertTrue(stdout.startswith("0,0,5,11200,350,26,"))
+
+    def test_errors(self):
+        self.assertEqual(self.run_cli(["encode", "Intertechno", "CMR 1000"])[0], 1)
+        self.assertEqual(self.run_cli(["encode", "Intertechno", "CMR 1000", "DANCE", "master=A", "slave=1"])[0], 1)
+        self.assertEqual(self.run_cli(["encode", "Intertechno", "CMR 1000", "ON", "master=Z", "slave=1"])[0], 1)
+
+    def test_send_stdin(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as receiver:
+            receiver.bind(("127.0.0.1", 0))
+            receiver.settimeout(2)
+            host, port = receiver.getsockname()
+
+            lines = "# comment\n\n" + 'Intertechno "CMR 1000" ON master=A slave=%d\n' * 3 + "unknown\n"
+            result, _, stderr = self.run_cli(["send", "--host", host, "--port", str(port), "--stdin"],
+                                             lines % (1, 2, 3))
+
+            self.assertEqual(result, 1)
+            self.assertIn("line 6", stderr)
+            self.assertIn("3 frames sent, 1 errors", stderr)
+            codes = [receiver.recv(4096).decode() for _ in range(3)]
+            self.assertEqual(len(set(codes)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,230 @@
+import io
+import json
+import time
+import unittest
+
+from raspyrfm_client import RaspyRFMClient, catalog, fleet
+from raspyrfm_client.device_implementations.controlunit.actions import Action
+from raspyrfm_client.device_implementations.gateway.manufacturer.intertechno.ITGW import ITGW
+from raspyrfm_client.device_implementations.gateway.manufacturer.seegel_systeme.RaspyRFM import RaspyRFM
+from raspyrfm_client.simulator import GatewaySimulator
+
+
+class TestFleet(unittest.TestCase):
+    GATEWAYS = {"living": RaspyRFM("127.0.0.1"), "garage": ITGW("127.0.0.2")}
+
+    CSV = ("name,manufacturer,model,gateway,master,slave,CODE,UNIT\n"
+           "lamp,Intertechno,CMR 1000,living,A,1,,\n"
+           "heater,intertechno,IT_1500,garage,,,10101010101010101010101010,3\n"
+           "broken,Intertechno,CMR 1000,living,Z,1,,\n"
+           "lamp,Intertechno,CMR 1000,living,A,2,,\n"
+           "unknown,Acme,Rocket,living,,,,\n"
+           "remote,Intertechno,CMR 1000,attic,A,3,,\n"
+           "spare,Intertechno,CMR 1000,,B,1,,\n")
+
+    def test_csv(self):
+        devices, errors = fleet.load_fleet(io.StringIO(self.CSV), "csv", self.GATEWAYS)
+
+        self.assertEqual([device.name for device in devices], ["lamp", "heater", "spare"])
+        self.assertEqual([(error.row, error.name) for error in errors],
+                         [(4, "broken"), (5, "lamp"), (6, "unknown"), (7, "remote")])
+        self.assertIn("duplicate", errors[1].message)
+
+        lamp, heater, spare = devices
+        self.assertEqual(lamp.device.get_channel_config(), {"master": "A", "slave": "1"})
+        self.assertEqual(lamp.get_code(Action.ON), self.GATEWAYS["living"].generate_code(lamp.device, Action.ON))
+        self.assertEqual(heater.get_code(Action.OFF),
+                         self.GATEWAYS["garage"].generate_code(heater.device, Action.OFF))
+        self.assertIsNone(spare.gateway)
+        self.assertEqual(spare.codes, {})
+
+    def test_json_formats(self):
+        records = [
+            {"name": "lamp", "manufacturer": "INTERTECHNO", "model": "CMR_1000", "config": {"master": "A", "slave": 1}},
+            {"name": "dimmer", "manufacturer": "Elro", "model": "AB440S",
+             "config": {"1": 1, "2": 0, "3": 1, "4": 0, "5": 1, "CH": "A"}},
+            ["not", "an", "object"],
+        ]
+        jsonl = "\n".join(json.dumps(record) for record in records) + "\n{invalid\n"
+
+        for file_format, text in (("json", json.dumps({"devices": records})), ("jsonl", jsonl)):
+            devices, errors = fleet.load_fleet(io.StringIO(text), file_format, self.GATEWAYS,
+                                               default_gateway="living")
+            self.assertEqual([device.name for device in devices], ["lamp", "dimmer"])
+            self.assertEqual([device.gateway for device in devices], ["living", "living"])
+            self.assertEqual(errors[0].row, 3)
+            if file_format == "jsonl":
+                self.assertEqual(errors[1].row, 4)
+
+    def test_yaml(self):
+        try:
+            import yaml  # noqa: F401
+        except ImportError:
+            self.skipTest("PyYAML is not installed")
+
+        text = ("devices:\n"
+                "  - name: lamp\n"
+                "    manufacturer: Intertechno\n"
+                "    model: CMR 1000\n"
+                "    config: {master: A, slave: 1}\n")
+        devices, errors = fleet.load_fleet(io.StringIO(text), "yaml", self.GATEWAYS, default_gateway="living")
+        self.assertEqual(len(devices), 1)
+        self.assertEqual(errors, [])
+
+    def test_processes(self):
+        expected = fleet.load_fleet(io.StringIO(self.CSV), "csv", self.GATEWAYS)
+        devices, errors = fleet.load_fleet(io.StringIO(self.CSV), "csv", self.GATEWAYS, processes=2)
+
+        self.assertEqual([(device.name, device.codes) for device in devices],
+                         [(device.name, device.codes) for device in expected[0]])
+        self.assertEqual([str(error) for error in errors], [str(error) for error in expected[1]])
+
+    def test_invalid_files(self):
+        self.assertRaises(ValueError, fleet.get_format, "fleet.txt")
+        self.assertRaises(ValueError, fleet.load_fleet, io.StringIO("name,model\n"), "csv")
+        self.assertRaises(ValueError, fleet.load_fleet, io.StringIO("{}"), "json")
+        self.assertRaises(ValueError, fleet.load_fleet, io.StringIO(self.CSV), "csv", self.GATEWAYS, "unknown")
+
+
+class TestFleetManager(unittest.TestCase):
+    def setUp(self):
+        self.simulators = [GatewaySimulator(port=0), GatewaySimulator(port=0)]
+        for simulator in self.simulators:
+            simulator.start()
+            self.addCleanup(simulator.stop)
+
+        self.fleet = fleet.Fleet(RaspyRFMClient(), {"a": RaspyRFM(*self.simulators[0].get_address()),
+                                                    "b": RaspyRFM(*self.simulators[1].get_address())})
+
+    @staticmethod
+    def create_device(model: str, **channel_config):
+        device = catalog.get_controlunit_class("Intertechno", model)()
+        device.set_channel_config(**channel_config)
+        return device
+
+    def wait_for_frames(self, simulator: GatewaySimulator, count: int) -> None:
+        deadline = time.monotonic() + 2
+        while simulator.get_stats().received < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_tag_index(self):
+        self.fleet.add("lamp", self.create_device("CMR 1000", master="A", slave=1), "a", "floor1;living")
+        self.fleet.add("heater", self.create_device("CMR 1000", master="A", slave=2), "b", ["floor2"])
+        self.fleet.add("fan", self.create_device("CMR 1000", master="A", slave=3), tags=("floor2", "living"))
+
+        self.assertEqual([device.name for device in self.fleet.find("living")], ["lamp", "fan"])
+        self.assertEqual([device.name for device in self.fleet.find("floor2", gateway="b")], ["heater"])
+        self.assertEqual(self.fleet.find("attic"), [])
+        self.assertIsNotNone(self.fleet.get("lamp").get_code(Action.ON))
+        self.assertEqual(self.fleet.get("fan").codes, {})
+
+        self.fleet.set_tags("lamp", "floor2")
+        self.fleet.remove("fan")
+        self.assertEqual(sorted(self.fleet.get_tags()), ["floor2"])
+        self.assertEqual([device.name for device in self.fleet.find("floor2")], ["heater", "lamp"])
+        self.assertEqual(len(self.fleet), 2)
+
+        self.assertRaises(ValueError, self.fleet.add, "lamp", self.create_device("CMR 1000", master="B", slave=1))
+        self.assertRaises(ValueError, self.fleet.add, "new", self.create_device("CMR 1000", master="B", slave=1),
+                          "unknown")
+
+    def test_load(self):
+        self.fleet.add("lamp", self.create_device("CMR 1000", master="A", slave=1), "a")
+        errors = self.fleet.load(io.StringIO("name,manufacturer,model,gateway,tags,master,slave\n"
+                                             "lamp,Intertechno,CMR 1000,a,,A,1\n"
+                                             "heater,Intertechno,CMR 1000,b,floor2; zone 1,A,2\n"), "csv")
+
+        self.assertEqual([(error.row, error.name) for error in errors], [(2, "lamp")])
+        self.assertEqual(self.fleet.get("heater").tags, ("floor2", "zone 1"))
+        self.assertEqual([device.name for device in self.fleet.find("zone 1")], ["heater"])
+
+    def test_send_paced(self):
+        for slave in (1, 2):
+            self.fleet.add("a%d" % slave, self.create_device("CMR 1000", master="A", slave=slave), "a", "floor2")
+            self.fleet.add("b%d" % slave, self.create_device("CMR 1000", master="B", slave=slave), "b", "floor2")
+            # a single group frame switches both units
+            self.fleet.add("g%d" % slave, self.create_device("IT_1500", CODE="10" * 13, UNIT=slave), "a", "floor2")
+        self.fleet.add("other", self.create_device("CMR 1000", master="C", slave=1), "b", "floor1")
+
+        frames = self.fleet.send(tag="floor2", action=Action.OFF, use_group_commands=True)
+
+        self.assertEqual(frames, 5)
+        self.wait_for_frames(self.simulators[0], 3)
+        self.wait_for_frames(self.simulators[1], 2)
+        self.assertEqual([simulator.get_stats().accepted for simulator in self.simulators], [3, 2])
+        self.assertEqual([simulator.get_stats().dropped_busy for simulator in self.simulators], [0, 0])
+
+    def test_send_partial_group(self):
+        for unit, tag in ((1, "floor2"), (2, "floor2"), (3, "floor3")):
+            self.fleet.add("g%d" % unit, self.create_device("IT_1500", CODE="10" * 13, UNIT=unit), "a", tag)
+        # the same group on another gateway does not belong to the group on gateway a
+        self.fleet.add("other", self.create_device("IT_1500", CODE="10" * 13, UNIT=4), "b", "floor2")
+
+        # a group frame would switch g3 as well
+        self.assertEqual(self.fleet.send(Action.OFF, tag="floor2", use_group_commands=True), 3)
+        self.wait_for_frames(self.simulators[0], 2)
+        gateway = self.fleet.get_gateway("a")
+        self.assertEqual(self.simulators[0].get_history(),
+                         [gateway.generate_code(self.fleet.get(name).device, Action.OFF) for name in ("g1", "g2")])
+
+        # wait until the simulator finished transmitting the last frame (about 0.5 s of airtime)
+        time.sleep(0.7)
+        self.assertEqual(self.fleet.send(Action.OFF, names=["g1", "g2", "g3"], use_group_commands=True), 1)
+        self.wait_for_frames(self.simulators[0], 3)
+        self.assertEqual(self.simulators[0].get_history()[-1],
+                         gateway.generate_group_code(self.fleet.get("g1").device, Action.OFF))
+
+    def test_group_commands_are_opt_in(self):
+        for unit in (1, 2):
+            self.fleet.add("g%d" % unit, self.create_device("IT_1500", CODE="10" * 13, UNIT=unit), "a")
+
+        self.assertEqual(self.fleet.send(Action.OFF), 2)
+
+    def test_set_channel_config(self):
+        for unit in (1, 2, 3):
+            self.fleet.add("g%d" % unit, self.create_device("IT_1500", CODE="10" * 13, UNIT=unit), "a")
+        g3 = self.fleet.get("g3")
+
+        # changed behind the back of the fleet: the code is stale and g3 still counts as part of the group
+        g3.device.set_channel_config(CODE="01" * 13, UNIT=3)
+        self.assertIsNone(g3.get_code(Action.OFF))
+        self.assertEqual(self.fleet.send(Action.OFF, names=["g1", "g2"], use_group_commands=True, pace=False), 2)
+
+        self.fleet.set_channel_config("g3", CODE="01" * 13, UNIT=3)
+        self.assertEqual(g3.get_code(Action.OFF), self.fleet.get_gateway("a").generate_code(g3.device, Action.OFF))
+        # wait until the simulator finished transmitting the last frame (about 0.5 s of airtime)
+        time.sleep(0.7)
+        self.assertEqual(self.fleet.send(Action.OFF, names=["g1", "g2"], use_group_commands=True), 1)
+        self.assertRaises(ValueError, self.fleet.set_channel_config, "g3", CODE="2", UNIT=3)
+        self.assertEqual(self.fleet.find(gateway="a"), [self.fleet.get("g1"), self.fleet.get("g2"), g3])
+
+    def test_send_unpaced(self):
+        self.fleet.add("lamp", self.create_device("CMR 1000", master="A", slave=1), "a", "floor1")
+        self.fleet.add("heater", self.create_device("CMR 1000", master="A", slave=2), "a", "floor1")
+        self.fleet.add("fan", self.create_device("CMR 1000", master="A", slave=3))
+
+        self.assertEqual(self.fleet.send(Action.ON, names=["lamp", "heater"], pace=False), 2)
+        self.wait_for_frames(self.simulators[0], 2)
+        self.assertEqual(self.simulators[0].get_stats().dropped_busy, 1)
+        self.assertRaises(ValueError, self.fleet.send, Action.ON, names=["fan"])
+
+    def test_send_pre_encoded(self):
+        lamp = self.fleet.add("lamp", self.create_device("CMR 1000", master="A", slave=1), "a")
+
+        self.assertEqual(self.fleet.send(Action.ON, names=["lamp"]), 1)
+        self.wait_for_frames(self.simulators[0], 1)
+        self.assertEqual(self.simulators[0].get_history(), [lamp.get_code(Action.ON)])
+
+        # codes generated with other repetitions are not sent anymore
+        lamp.device.set_repetitions(2)
+        self.assertIsNone(lamp.get_code(Action.ON))
+        # wait until the simulator finished transmitting the first frame
+        time.sleep(0.5)
+        self.fleet.send(Action.ON, names=["lamp"])
+        self.wait_for_frames(self.simulators[0], 2)
+        self.assertEqual(self.simulators[0].get_history()[-1],
+                         self.fleet.get_gateway("a").generate_code(lamp.device, Action.ON))
+
+
+if __name__ == '__main__':
+    unittest.main()
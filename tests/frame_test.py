@@ -0,0 +1,54 @@
+import unittest
+from array import array
+
+from raspyrfm_client.frame import PulseTrain, parse_frame
+
+
+class TestFrameParser(unittest.TestCase):
+    FRAME = "TXP:0,0,5,5600,350,3,1,3,3,1,1,31"
+
+    def test_parse(self):
+        frame = parse_frame(self.FRAME)
+
+        self.assertEqual(frame.prefix, "TXP")
+        self.assertEqual(frame.reserved, (0, 0))
+        self.assertEqual((frame.repetitions, frame.pause, frame.timebase, frame.count), (5, 5600, 350, 3))
+        self.assertEqual(frame.pulses, array("H", [1, 3, 3, 1, 1, 31]))
+        self.assertEqual(frame.to_pulse_data(), ([(1, 3), (3, 1), (1, 31)], 5, 350))
+
+    def test_input_types_are_equivalent(self):
+        data = self.FRAME.encode()
+        expected = parse_frame(self.FRAME)
+
+        for frame in [data, bytearray(data), memoryview(data), memoryview(b"xx" + data)[2:]]:
+            self.assertEqual(parse_frame(frame), expected)
+
+    def test_without_prefix(self):
+        frame = parse_frame(b"0,0,6,11200,275,2,0,1,164,0")
+
+        self.assertIsNone(frame.prefix)
+        self.assertEqual(frame.pairs(), [(0, 1), (164, 0)])
+
+    def test_strict_mode(self):
+        for data in ["", "TXP:0,0,5", "TXP:0,0,5,5600,350,3,1,3,3,1,1", "TXP:0,0,5,5600,350,1,1,31,",
+                     "TXP:0,0,5,5600,350,1,1,x", "1X:0,0,5,5600,350,1,1,31", "TXP:0,0,5,5600,350,1,1,70000",
+                     " TXP:0,0,5,5600,350,1,1,31\n"]:
+            self.assertRaises(ValueError, parse_frame, data)
+            self.assertIsInstance(parse_frame(data, strict=False), (PulseTrain, type(None)))
+
+    def test_lenient_mode(self):
+        self.assertEqual(parse_frame(" TXP:0,0,5,5600,350,3,1,3,3,1,1,31,\r\n", strict=False), parse_frame(self.FRAME))
+        self.assertEqual(parse_frame("TXP:0,0,5,5600,350,2,1,3,3", strict=False).pairs(), [(1, 3)])
+        self.assertEqual(parse_frame("TXP:0,0,5,5600,350,1,1,3,3,1", strict=False).pairs(), [(1, 3)])
+        self.assertIsNone(parse_frame("RXSTART", strict=False))
+        self.assertIsNone(parse_frame("TXP:0,0,5,5600,350,1,1,x", strict=False))
+
+    def test_signature_ignores_repetitions(self):
+        self.assertEqual(parse_frame(self.FRAME).signature(),
+                         parse_frame("RXP:0,0,1,4000,350,3,1,3,3,1,1,31").signature())
+        self.assertNotEqual(parse_frame(self.FRAME).signature(),
+                            parse_frame("TXP:0,0,5,5600,300,3,1,3,3,1,1,31").signature())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,332 @@
+"""
+Golden vectors of the signal encoders.
+
+The corpus maps (control unit, channel config, action, gateway) to the exact payload that is sent to the
+gateway. It is stored as xz compressed JSON lines next to this file, one line per control unit and
+channel config::
+
+    {"manufacturer": "Elro", "model": "AB440S", "config": {"1": "0", ..., "CH": "A"},
+     "codes": {"ON": {"RaspyRFM": "TXP:...", ...}, "OFF": {...}}}
+
+The channel configs cover the full address space of a model (enumerated from its channel config regexes)
+if it has at most MAX_CONFIGS_PER_MODEL configurations, otherwise a deterministic sample of it.
+
+Regenerate the corpus only when an encoder output is changed on purpose:
+    python -m tests.golden.corpus generate
+
+Verify the current encoders against the corpus:
+    python -m tests.golden.corpus check [--processes N]
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import lzma
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus.jsonl.xz")
+
+MAX_VALUES_PER_ARG = 64
+MAX_CONFIGS_PER_MODEL = 1024
+SAMPLES_PER_MODEL = 512
+
+
+def _count(items) -> int:
+    """
+    :param items: a parsed regex (sequence of (op, argument) tuples)
+    :return: number of strings matched by the regex
+    """
+    count = 1
+    for op, av in items:
+        if op is sre_constants.LITERAL or op is sre_constants.AT:
+            continue
+        elif op is sre_constants.IN:
+            count *= len(_charset(av))
+        elif op is sre_constants.SUBPATTERN:
+            count *= _count(av[-1])
+        elif op is sre_constants.BRANCH:
+            count *= sum(_count(branch) for branch in av[1])
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            low, high, sub = _repeat(av)
+            count *= sum(_count(sub) ** n for n in range(low, high + 1))
+        else:
+            raise ValueError("Unsupported regex element: " + str(op))
+    return count
+
+
+def _enumerate(items) -> [str]:
+    """
+    :param items: a parsed regex
+    :return: all strings matched by the regex
+    """
+    parts = []
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            parts.append([chr(av)])
+        elif op is sre_constants.AT:
+            continue
+        elif op is sre_constants.IN:
+            parts.append(_charset(av))
+        elif op is sre_constants.SUBPATTERN:
+            parts.append(_enumerate(av[-1]))
+        elif op is sre_constants.BRANCH:
+            parts.append([value for branch in av[1] for value in _enumerate(branch)])
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            low, high, sub = _repeat(av)
+            values = _enumerate(sub)
+            parts.append(["".join(product) for n in range(low, high + 1)
+                          for product in itertools.product(values, repeat=n)])
+        else:
+            raise ValueError("Unsupported regex element: " + str(op))
+    return ["".join(product) for product in itertools.product(*parts)]
+
+
+def _sample(items, rng: random.Random) -> str:
+    """
+    :param items: a parsed regex
+    :param rng: random number generator
+    :return: a random string matched by the regex
+    """
+    result = []
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            result.append(chr(av))
+        elif op is sre_constants.AT:
+            continue
+        elif op is sre_constants.IN:
+            result.append(rng.choice(_charset(av)))
+        elif op is sre_constants.SUBPATTERN:
+            result.append(_sample(av[-1], rng))
+        elif op is sre_constants.BRANCH:
+            result.append(_sample(rng.choice(av[1]), rng))
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            low, high, sub = _repeat(av)
+            result.extend(_sample(sub, rng) for _ in range(rng.randint(low, high)))
+        else:
+            raise ValueError("Unsupported regex element: " + str(op))
+    return "".join(result)
+
+
+def _charset(av) -> [str]:
+    chars = []
+    for op, value in av:
+        if op is sre_constants.LITERAL:
+            chars.append(chr(value))
+        elif op is sre_constants.RANGE:
+            chars.extend(chr(c) for c in range(value[0], value[1] + 1))
+        else:
+            raise ValueError("Unsupported character set element: " + str(op))
+    return chars
+
+
+def _repeat(av):
+    low, high, sub = av
+    if high is sre_constants.MAXREPEAT:
+        raise ValueError("Unbounded repetitions are not supported")
+    return low, high, sub
+
+
+def get_arg_values(pattern: str, rng: random.Random) -> [str]:
+    """
+    :param pattern: a channel config regex
+    :param rng: random number generator used if the regex matches too many values
+    :return: all values matched by the regex, or a sample of MAX_VALUES_PER_ARG values including the first and last
+    """
+    items = sre_parse.parse(pattern)
+    if _count(items) <= MAX_VALUES_PER_ARG:
+        return _enumerate(items)
+
+    values = {_sample(items, rng) for _ in range(MAX_VALUES_PER_ARG * 4)}
+    values = rng.sample(sorted(values), MAX_VALUES_PER_ARG - 2)
+    # the extremes of the address space (e.g. all zero/all one codes) are always included
+    values += [_extreme(items, min), _extreme(items, max)]
+    return sorted(set(values))
+
+
+def _extreme(items, pick) -> str:
+    result = []
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            result.append(chr(av))
+        elif op is sre_constants.IN:
+            result.append(pick(_charset(av)))
+        elif op is sre_constants.SUBPATTERN:
+            result.append(_extreme(av[-1], pick))
+        elif op is sre_constants.BRANCH:
+            result.append(pick(_extreme(branch, pick) for branch in av[1]))
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            low, high, sub = _repeat(av)
+            result.append(_extreme(sub, pick) * (high if pick is max else low))
+    return "".join(result)
+
+
+def get_channel_configs(device) -> ([dict], bool):
+    """
+    :param device: a control unit
+    :return: the channel configs to cover and whether they cover the full address space
+    """
+    rng = random.Random("%s/%s" % (device.get_manufacturer().value, device.get_model().value))
+    args = device.get_channel_config_args()
+    names = list(args)
+    values = [get_arg_values(args[name], rng) for name in names]
+
+    total = 1
+    for arg_values in values:
+        total *= len(arg_values)
+
+    if total <= MAX_CONFIGS_PER_MODEL:
+        combinations = itertools.product(*values)
+    else:
+        combinations = sorted({tuple(rng.choice(arg_values) for arg_values in values)
+                               for _ in range(SAMPLES_PER_MODEL)})
+
+    full = total <= MAX_CONFIGS_PER_MODEL and all(
+        _count(sre_parse.parse(args[name])) <= MAX_VALUES_PER_ARG for name in names)
+    return [dict(zip(names, combination)) for combination in combinations], full
+
+
+def _create_client():
+    from raspyrfm_client import RaspyRFMClient
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return RaspyRFMClient()
+
+
+def _get_gateways(rfm_client) -> dict:
+    return {model.value: rfm_client.get_gateway(manufacturer, model)
+            for manufacturer in rfm_client.get_supported_gateway_manufacturers()
+            for model in rfm_client.get_supported_gateway_models(manufacturer)}
+
+
+def _generate_codes(device, gateways: dict, config: dict) -> dict:
+    device.set_channel_config(**config)
+    return {action.name: {name: gateway.generate_code(device, action) for name, gateway in gateways.items()}
+            for action in device.get_supported_actions()}
+
+
+def generate(path: str = CORPUS_FILE) -> dict:
+    """
+    Generates the corpus from the current encoders
+    :param path: the corpus file
+    :return: dictionary of "manufacturer model" to (number of configs, full address space covered)
+    """
+    rfm_client = _create_client()
+    gateways = _get_gateways(rfm_client)
+
+    summary = {}
+    with lzma.open(path, "wb", preset=9) as file:
+        for manufacturer in sorted(rfm_client.get_supported_controlunit_manufacturers(), key=lambda m: m.value):
+            for model in sorted(rfm_client.get_supported_controlunit_models(manufacturer), key=lambda m: m.value):
+                device = rfm_client.get_controlunit(manufacturer, model)
+                configs, full = get_channel_configs(device)
+                for config in configs:
+                    record = {
+                        "manufacturer": manufacturer.value,
+                        "model": model.value,
+                        "config": config,
+                        "codes": _generate_codes(device, gateways, config),
+                    }
+                    file.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+                summary[manufacturer.value + " " + model.value] = (len(configs), full)
+    return summary
+
+
+def load(path: str = CORPUS_FILE) -> [dict]:
+    """
+    :param path: the corpus file
+    :return: list of corpus records
+    """
+    with lzma.open(path, "rb") as file:
+        return [json.loads(line) for line in file]
+
+
+_worker_state = None
+
+
+def _init_worker():
+    global _worker_state
+    rfm_client = _create_client()
+    _worker_state = (rfm_client, _get_gateways(rfm_client))
+
+
+def _check_chunk(records: [dict]) -> [str]:
+    """
+    :param records: corpus records
+    :return: a description of every mismatching payload
+    """
+    from raspyrfm_client.device_implementations.controlunit.actions import Action
+    from raspyrfm_client.device_implementations.controlunit.controlunit_constants import ControlUnitModel
+    from raspyrfm_client.device_implementations.manufacturer_constants import Manufacturer
+
+    if _worker_state is None:
+        _init_worker()
+    rfm_client, gateways = _worker_state
+
+    mismatches = []
+    for record in records:
+        device = rfm_client.get_controlunit(Manufacturer(record["manufacturer"]), ControlUnitModel(record["model"]))
+        device.set_channel_config(**record["config"])
+        for action_name, codes in record["codes"].items():
+            action = Action[action_name]
+            for gateway_name, expected in codes.items():
+                actual = gateways[gateway_name].generate_code(device, action)
+                if actual.encode() != expected.encode():
+                    mismatches.append("%s %s %s %s @ %s: expected %r, got %r" % (
+                        record["manufacturer"], record["model"], record["config"], action_name, gateway_name,
+                        expected, actual))
+    return mismatches
+
+
+def check(path: str = CORPUS_FILE, processes: int = None) -> ([str], int):
+    """
+    Verifies the current encoders against the corpus using a process pool
+    :param path: the corpus file
+    :param processes: number of worker processes, one per CPU if None, in-process if 1
+    :return: (list of mismatch descriptions, number of checked payloads)
+    """
+    records = load(path)
+    payloads = sum(len(codes) for record in records for codes in record["codes"].values())
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        return _check_chunk(records), payloads
+
+    chunk_size = max(1, -(-len(records) // (processes * 4)))
+    chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker) as executor:
+        mismatches = [mismatch for result in executor.map(_check_chunk, chunks) for mismatch in result]
+    return mismatches, payloads
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["generate", "check"])
+    parser.add_argument("--corpus", default=CORPUS_FILE, help="corpus file")
+    parser.add_argument("--processes", type=int, help="number of worker processes for check")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        for name, (count, full) in generate(args.corpus).items():
+            print("%-50s %5d configs (%s)" % (name, count, "full" if full else "sampled"))
+        return 0
+
+    mismatches, payloads = check(args.corpus, args.processes)
+    for mismatch in mismatches:
+        print(mismatch)
+    print("%d of %d payloads match" % (payloads - len(mismatches), payloads))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+import unittest
+
+from tests.golden import corpus
+
+
+class TestGoldenCorpus(unittest.TestCase):
+    def test_encoders_match_corpus(self):
+        mismatches, payloads = corpus.check()
+
+        self.assertGreater(payloads, 0)
+        self.assertEqual(mismatches[:10], [])
+
+    def test_arg_values(self):
+        import random
+
+        rng = random.Random(0)
+        self.assertEqual(corpus.get_arg_values("^([1-9]|0[1-9]|1[0-6])$", rng),
+                         [str(i) for i in range(1, 10)] + ["0" + str(i) for i in range(1, 10)]
+                         + [str(i) for i in range(10, 17)])
+
+        values = corpus.get_arg_values("[01]{26}$", rng)
+        self.assertEqual(len(values), corpus.MAX_VALUES_PER_ARG)
+        self.assertIn("0" * 26, values)
+        self.assertIn("1" * 26, values)
+
+
+if __name__ == '__main__':
+    unittest.main()
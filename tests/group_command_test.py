@@ -0,0 +1,64 @@
+import unittest
+
+from raspyrfm_client import RaspyRFMClient
+from raspyrfm_client.device_implementations.controlunit.actions import Action
+from raspyrfm_client.device_implementations.controlunit.controlunit_constants import ControlUnitModel
+from raspyrfm_client.device_implementations.gateway.manufacturer.gateway_constants import GatewayModel
+from raspyrfm_client.device_implementations.manufacturer_constants import Manufacturer
+
+
+class TestGroupCommands(unittest.TestCase):
+    CODE_A = "10" * 13
+    CODE_B = "01" * 13
+
+    def setUp(self):
+        self.rfm_client = RaspyRFMClient()
+        self.gateway = self.rfm_client.get_gateway(Manufacturer.SEEGEL_SYSTEME, GatewayModel.RASPYRFM)
+
+    def create_it1500(self, code: str, unit: str):
+        device = self.rfm_client.get_controlunit(Manufacturer.INTERTECHNO, ControlUnitModel.IT_1500)
+        device.set_channel_config(CODE=code, UNIT=unit)
+        return device
+
+    def test_group_frame_sets_all_bit(self):
+        device = self.create_it1500(self.CODE_A, "3")
+
+        pulses, repetitions, timebase = device.get_pulse_data(Action.OFF)
+        group_pulses, group_repetitions, group_timebase = device.get_group_pulse_data(Action.OFF)
+
+        self.assertEqual(len(pulses), len(group_pulses))
+        self.assertEqual((repetitions, timebase), (group_repetitions, group_timebase))
+        # the "all" bit directly follows the preamble and the 26 CODE bits
+        self.assertEqual(pulses[53:55], [(1, 1), (1, 5)])
+        self.assertEqual(group_pulses[53:55], [(1, 5), (1, 1)])
+
+    def test_devices_of_same_code_are_collapsed(self):
+        devices = [self.create_it1500(self.CODE_A, str(unit)) for unit in range(1, 11)]
+        devices.append(self.create_it1500(self.CODE_B, "1"))
+
+        codes = self.rfm_client.generate_batch_codes(self.gateway, devices, Action.OFF, use_group_commands=True)
+
+        self.assertEqual(len(codes), 2)
+        self.assertEqual(codes[0], self.gateway.generate_group_code(devices[0], Action.OFF))
+        self.assertEqual(codes[1], self.gateway.generate_code(devices[-1], Action.OFF))
+
+    def test_group_commands_are_opt_in(self):
+        devices = [self.create_it1500(self.CODE_A, str(unit)) for unit in range(1, 4)]
+
+        codes = self.rfm_client.generate_batch_codes(self.gateway, devices, Action.ON)
+
+        self.assertEqual(codes, [self.gateway.generate_code(device, Action.ON) for device in devices])
+
+    def test_devices_without_group_support(self):
+        device = self.rfm_client.get_controlunit(Manufacturer.INTERTECHNO, ControlUnitModel.CMR_1000)
+        device.set_channel_config(master='A', slave=1)
+
+        self.assertIsNone(device.get_group_id())
+        self.assertRaises(ValueError, self.gateway.generate_group_code, device, Action.ON)
+        self.assertEqual(self.rfm_client.generate_batch_codes(self.gateway, [device, device], Action.ON,
+                                                              use_group_commands=True),
+                         [self.gateway.generate_code(device, Action.ON)] * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
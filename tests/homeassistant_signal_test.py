@@ -0,0 +1,65 @@
+import asyncio
+import unittest
+from unittest import mock
+
+try:
+    from custom_components.raspyrfm import entity, hub, switch
+    from custom_components.raspyrfm.storage import RaspyRFMDeviceEntry
+except ImportError:
+    hub = None
+
+
+@unittest.skipIf(hub is None, "homeassistant is not installed")
+class TestDeviceSignalMatching(unittest.TestCase):
+    ON = "TXP:0,0,5,5600,350,2,1,3,1,3"
+    OFF = "TXP:0,0,5,5600,350,2,1,3,3,1"
+
+    def setUp(self):
+        self.handlers = {}
+
+        def connect(hass, signal, target):
+            self.handlers.setdefault(signal, []).append(target)
+            return mock.Mock()
+
+        def send(hass, signal, *args):
+            for target in self.handlers.get(signal, []):
+                target(*args)
+
+        for patcher in (
+            mock.patch.object(entity, "async_dispatcher_connect", connect),
+            mock.patch.object(switch, "async_dispatcher_connect", connect),
+            mock.patch.object(hub, "async_dispatcher_send", send),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def _receive(self, payloads):
+        hass = mock.MagicMock()
+        rfm_hub = hub.RaspyRFMHub(hass, mock.Mock(data={}, options={}))
+        rfm_hub.storage._store = mock.Mock()
+        device = RaspyRFMDeviceEntry("lamp", "Lamp", "switch", {"on": self.ON, "off": self.OFF})
+        await rfm_hub.storage.async_add_or_update(device)
+
+        lamp = switch.RaspyRFMSwitch(rfm_hub, device)
+        lamp.hass = hass
+        lamp.async_write_ha_state = mock.Mock()
+        await lamp.async_added_to_hass()
+
+        states = []
+        for payload in payloads:
+            await rfm_hub._learn_manager.async_process_datagram(payload, ("192.168.0.2", 49880))
+            states.append(lamp.is_on)
+        return states
+
+    def test_copy_with_other_repetitions_switches_entity(self):
+        on_copy = self.ON.replace(",5,", ",7,", 1)
+        off_copy = self.OFF.replace(",5,5600,", ",5,9000,", 1)
+
+        states = asyncio.run(self._receive([on_copy, off_copy, self.ON]))
+
+        self.assertEqual(states, [True, False, True])
+
+    def test_other_frame_is_ignored(self):
+        states = asyncio.run(self._receive(["TXP:0,0,5,5600,350,2,1,3,1,1"]))
+
+        self.assertEqual(states, [False])
@@ -0,0 +1,104 @@
+import socket
+import time
+import unittest
+
+from raspyrfm_client import RaspyRFMClient
+from raspyrfm_client.device_implementations.controlunit.actions import Action
+from raspyrfm_client.device_implementations.controlunit.controlunit_constants import ControlUnitModel
+from raspyrfm_client.device_implementations.gateway.manufacturer.gateway_constants import GatewayModel
+from raspyrfm_client.device_implementations.manufacturer_constants import Manufacturer
+from raspyrfm_client.instrumentation import Histogram, Instrumentation
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.receiver.bind(("127.0.0.1", 0))
+        self.receiver.settimeout(2)
+
+        self.rfm_client = RaspyRFMClient()
+        self.instrumentation = Instrumentation()
+        self.rfm_client.set_instrumentation(self.instrumentation)
+
+        self.gateway = self.rfm_client.get_gateway(Manufacturer.SEEGEL_SYSTEME, GatewayModel.RASPYRFM,
+                                                   *self.receiver.getsockname())
+        self.device = self.rfm_client.get_controlunit(Manufacturer.INTERTECHNO, ControlUnitModel.CMR_1000)
+        self.device.set_channel_config(master='A', slave=1)
+
+    def tearDown(self):
+        self.receiver.close()
+
+    def test_send_records_stages(self):
+        encoded = []
+        sent = []
+        self.instrumentation.add_callback("on_encode", lambda device, action, message: encoded.append(message))
+        self.instrumentation.add_callback("on_send", lambda gateway, message, duration: sent.append(message))
+
+        self.rfm_client.send(self.gateway, self.device, Action.ON)
+        message = self.receiver.recv(4096).decode()
+
+        self.assertEqual(message, self.gateway.generate_code(self.device, Action.ON))
+        self.assertEqual(encoded, [message])
+        self.assertEqual(sent, [message])
+
+        snapshot = self.instrumentation.snapshot()
+        self.assertEqual(snapshot["stages"]["lookup"]["count"], 2)
+        for stage in ("encode", "socket", "sendto"):
+            self.assertEqual(snapshot["stages"][stage]["count"], 1, stage)
+        self.assertEqual(snapshot["counters"], {"frames_sent": 1, "bytes_sent": len(message)})
+
+    def test_send_batch(self):
+        devices = []
+        for slave in range(1, 4):
+            device = self.rfm_client.get_controlunit(Manufacturer.INTERTECHNO, ControlUnitModel.CMR_1000)
+            device.set_channel_config(master='B', slave=slave)
+            devices.append(device)
+
+        self.assertEqual(self.rfm_client.send_batch(self.gateway, devices, Action.OFF), 3)
+        self.assertEqual(self.instrumentation.get_counter("frames_sent"), 3)
+        self.assertEqual(self.instrumentation.get_histogram("sendto").count, 3)
+        self.assertEqual(self.instrumentation.get_histogram("encode").count, 1)
+
+    def test_callbacks_not_timed(self):
+        delay = 0.05
+        durations = []
+        self.instrumentation.add_callback("on_encode", lambda device, action, message: time.sleep(delay))
+        self.instrumentation.add_callback("on_send", lambda gateway, message, duration: durations.append(duration))
+        self.instrumentation.add_callback("on_send", lambda gateway, message, duration: time.sleep(delay))
+
+        self.rfm_client.send(self.gateway, self.device, Action.ON)
+        self.rfm_client.send_batch(self.gateway, [self.device] * 3, Action.OFF)
+
+        self.assertEqual(len(durations), 4)
+        for duration in durations:
+            self.assertLess(duration, delay * 1e9)
+
+    def test_errors(self):
+        errors = []
+        self.instrumentation.add_callback("on_error", lambda stage, error: errors.append(stage))
+
+        self.assertRaises(ValueError, self.rfm_client.send, self.gateway, self.device, Action.PAIR)
+        self.assertEqual(errors, ["encode"])
+        self.assertEqual(self.instrumentation.get_counter("errors.encode"), 1)
+        self.assertRaises(ValueError, self.instrumentation.add_callback, "on_unknown", print)
+
+    def test_disabled(self):
+        self.rfm_client.set_instrumentation(None)
+        self.rfm_client.send(self.gateway, self.device, Action.ON)
+        self.receiver.recv(4096)
+
+        self.assertEqual(self.instrumentation.get_counter("frames_sent"), 0)
+
+    def test_histogram(self):
+        histogram = Histogram()
+        for duration in [0, 1, 100, 1000, 1000, 1000, 5000]:
+            histogram.record(duration)
+
+        self.assertEqual((histogram.count, histogram.min_ns, histogram.max_ns), (7, 0, 5000))
+        self.assertEqual(histogram.percentile(50), 1023)
+        self.assertEqual(histogram.percentile(100), 5000)
+        self.assertEqual(Histogram().percentile(50), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import subprocess
+import sys
+import unittest
+
+from raspyrfm_client.device_implementations.controlunit.actions import Action
+
+
+class TestLegacyNamespace(unittest.TestCase):
+    def test_import_is_lazy(self):
+        script = ("import sys, raspyrfm_client.device; "
+                  "print(sum(1 for name in sys.modules if '.controlunit.manufacturer.' in name))")
+        output = subprocess.check_output([sys.executable, "-c", script])
+        self.assertEqual(int(output), 0)
+
+    def test_module_aliases(self):
+        import raspyrfm_client.device.manufacturer.elro.AB440D_200W as legacy
+        from raspyrfm_client.device_implementations.controlunit.manufacturer.elro import AB440D_200W
+
+        self.assertIs(legacy, AB440D_200W)
+        self.assertEqual(legacy.__spec__.name, AB440D_200W.__name__)
+        self.assertIs(sys.modules["raspyrfm_client.device.manufacturer.elro.AB440D_200W"], AB440D_200W)
+
+    def test_attribute_aliases(self):
+        import raspyrfm_client.device as device
+        from raspyrfm_client.device.actions import Action as LegacyAction
+        from raspyrfm_client.device.manufacturer import manufacturer_constants
+
+        self.assertIs(LegacyAction, Action)
+        self.assertIs(device.manufacturer.manufacturer_constants, manufacturer_constants)
+        self.assertEqual(device.base.ControlUnit.__module__, "raspyrfm_client.device_implementations.controlunit.base")
+        self.assertRaises(AttributeError, getattr, device, "unknown")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import socket
+import unittest
+
+from raspyrfm_client import RaspyRFMClient
+from raspyrfm_client.device_implementations.controlunit.actions import Action
+from raspyrfm_client.device_implementations.controlunit.controlunit_constants import ControlUnitModel
+from raspyrfm_client.device_implementations.gateway.manufacturer.gateway_constants import GatewayModel
+from raspyrfm_client.device_implementations.manufacturer_constants import Manufacturer
+from raspyrfm_client.instrumentation import Instrumentation
+from raspyrfm_client.repetition import AdaptiveRepetitionPolicy
+
+
+class TestRepetitionPolicy(unittest.TestCase):
+    def setUp(self):
+        self.rfm_client = RaspyRFMClient()
+        self.gateway = self.rfm_client.get_gateway(Manufacturer.SEEGEL_SYSTEME, GatewayModel.RASPYRFM)
+
+        self.device = self.rfm_client.get_controlunit(Manufacturer.INTERTECHNO, ControlUnitModel.CMR_1000)
+        self.device.set_channel_config(master='A', slave=1)
+
+    @staticmethod
+    def get_repetitions(code: str) -> int:
+        return int(code.split(":", 1)[1].split(",")[2])
+
+    def test_override(self):
+        self.assertEqual(self.get_repetitions(self.gateway.generate_code(self.device, Action.ON)), 5)
+
+        self.device.set_repetitions(2)
+        self.assertEqual(self.get_repetitions(self.gateway.generate_code(self.device, Action.ON)), 2)
+
+        self.device.set_repetitions(None)
+        self.assertEqual(self.get_repetitions(self.gateway.generate_code(self.device, Action.ON)), 5)
+
+        self.assertRaises(ValueError, self.device.set_repetitions, 0)
+
+    def test_override_ignored_for_pairing(self):
+        device = self.rfm_client.get_controlunit(Manufacturer.LOGILINK, ControlUnitModel.EC000X)
+        device.set_channel_config(CODE='12ABC', CH='1')
+        device.set_repetitions(2)
+
+        self.assertEqual(self.get_repetitions(self.gateway.generate_code(device, Action.ON)), 2)
+        self.assertEqual(self.get_repetitions(self.gateway.generate_code(device, Action.PAIR)), 15)
+
+    def test_confirmations_lower_repetitions_down_to_floor(self):
+        policy = AdaptiveRepetitionPolicy(floor=3, confirmations=2)
+        self.assertEqual(policy.apply(self.device), 5)
+
+        for _ in range(10):
+            policy.confirm(self.device)
+
+        self.assertEqual(policy.apply(self.device), 3)
+        self.assertEqual(self.get_repetitions(self.gateway.generate_code(self.device, Action.ON)), 3)
+
+    def test_reject_raises_and_locks(self):
+        policy = AdaptiveRepetitionPolicy(floor=1, confirmations=1)
+        policy.confirm(self.device)
+        policy.confirm(self.device)
+        self.assertEqual(policy.get_repetitions(self.device), 3)
+
+        policy.reject(self.device)
+        policy.confirm(self.device)
+        self.assertEqual(policy.get_repetitions(self.device), 4)
+
+    def test_echo_confirms_device(self):
+        policy = AdaptiveRepetitionPolicy(floor=1, confirmations=1)
+        policy.apply(self.device)
+        message = self.gateway.generate_code(self.device, Action.ON)
+        policy.register_sent(self.device, message)
+
+        echo = "RXP:" + message.split(":", 1)[1]
+        self.assertFalse(policy.observe_echo("RXP:0,0,1,5600,350,1,1,31"))
+        self.assertTrue(policy.observe_echo(echo))
+        self.assertFalse(policy.observe_echo(echo))
+        self.assertEqual(policy.get_repetitions(self.device), 4)
+
+    def test_batch_echoes_confirm_devices(self):
+        devices = []
+        for unit in (1, 2):
+            device = self.rfm_client.get_controlunit(Manufacturer.INTERTECHNO, ControlUnitModel.IT_1500)
+            device.set_channel_config(CODE="10" * 13, UNIT=unit)
+            devices.append(device)
+        default = devices[0].get_pulse_data(Action.OFF)[1]
+
+        for instrumentation, use_group_commands in ((None, False), (Instrumentation(), True)):
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as receiver:
+                receiver.bind(("127.0.0.1", 0))
+                receiver.settimeout(2)
+                gateway = self.rfm_client.get_gateway(Manufacturer.SEEGEL_SYSTEME, GatewayModel.RASPYRFM,
+                                                      *receiver.getsockname())
+                policy = AdaptiveRepetitionPolicy(floor=1, confirmations=1)
+                self.rfm_client.set_repetition_policy(policy)
+                self.rfm_client.set_instrumentation(instrumentation)
+
+                frames = self.rfm_client.send_batch(gateway, devices, Action.OFF, use_group_commands)
+                for _ in range(frames):
+                    message = receiver.recv(4096).decode()
+                    self.assertTrue(policy.observe_echo("RXP:" + message.split(":", 1)[1]))
+
+                # a group frame is attributed to the first device of the group
+                self.assertEqual([policy.get_repetitions(device) for device in devices],
+                                 [default - 1, default] if use_group_commands else [default - 1] * 2)
+
+    def test_missing_channel_config(self):
+        device = self.rfm_client.get_controlunit(Manufacturer.INTERTECHNO, ControlUnitModel.CMR_1000)
+        gateway = self.rfm_client.get_gateway(Manufacturer.SEEGEL_SYSTEME, GatewayModel.RASPYRFM, "127.0.0.1")
+        self.rfm_client.set_repetition_policy(AdaptiveRepetitionPolicy())
+
+        with self.assertRaisesRegex(ValueError, "Missing channel configuration"):
+            self.rfm_client.send(gateway, device, Action.ON)
+        with self.assertRaisesRegex(ValueError, "Missing channel configuration"):
+            self.rfm_client.send_batch(gateway, [self.device, device], Action.ON)
+
+    def test_itgw_echo_confirms_device(self):
+        itgw = self.rfm_client.get_gateway(Manufacturer.INTERTECHNO, GatewayModel.ITGW)
+        policy = AdaptiveRepetitionPolicy(floor=1, confirmations=1)
+        policy.apply(self.device)
+        policy.register_sent(self.device, itgw.generate_code(self.device, Action.ON), itgw)
+
+        # receivers hear the unshifted pulse train
+        echo = self.gateway.generate_code(self.device, Action.ON)
+        self.assertTrue(policy.observe_echo("RXP:" + echo.split(":", 1)[1]))
+        self.assertEqual(policy.get_repetitions(self.device), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import re
+import socket
+import time
+import unittest
+
+from raspyrfm_client import RaspyRFMClient
+from raspyrfm_client.device_implementations.controlunit.actions import Action
+from raspyrfm_client.device_implementations.controlunit.controlunit_constants import ControlUnitModel
+from raspyrfm_client.device_implementations.gateway.manufacturer.gateway_constants import GatewayModel
+from raspyrfm_client.device_implementations.gateway.manufacturer.intertechno.ITGW import ITGW
+from raspyrfm_client.device_implementations.gateway.manufacturer.seegel_systeme.RaspyRFM import RaspyRFM
+from raspyrfm_client.device_implementations.manufacturer_constants import Manufacturer
+from raspyrfm_client.simulator import GatewaySimulator
+
+
+class TestGatewaySimulator(unittest.TestCase):
+    def setUp(self):
+        self.rfm_client = RaspyRFMClient()
+        self.device = self.rfm_client.get_controlunit(Manufacturer.INTERTECHNO, ControlUnitModel.CMR_1000)
+        self.device.set_channel_config(master='A', slave=1)
+
+    def test_search_response(self):
+        for model in GatewayModel:
+            simulator = GatewaySimulator(model, port=0)
+            response = simulator.handle_datagram(b"SEARCH HCGW", ("127.0.0.1", 1234)).decode()
+
+            matches = []
+            for manufacturer in self.rfm_client.get_supported_gateway_manufacturers():
+                for gateway_model in self.rfm_client.get_supported_gateway_models(manufacturer):
+                    gateway = self.rfm_client.get_gateway(manufacturer, gateway_model)
+                    if re.match(gateway.get_search_response_regex_literal(), response):
+                        matches.append(gateway.create_from_broadcast("127.0.0.1", response).get_model())
+            self.assertEqual(matches, [model])
+
+    def test_busy_period_drops_frames(self):
+        simulator = GatewaySimulator(GatewayModel.ITGW, port=0)
+        code = ITGW().generate_code(self.device, Action.ON)
+
+        simulator.handle_datagram(code.encode(), ("127.0.0.1", 1234), now=100.0)
+        simulator.handle_datagram(code.encode(), ("127.0.0.1", 1234), now=100.1)
+        simulator.handle_datagram(code.encode(), ("127.0.0.1", 1234), now=101.0)
+        simulator.handle_datagram(RaspyRFM().generate_code(self.device, Action.ON).encode(), ("127.0.0.1", 1234))
+
+        stats = simulator.get_stats()
+        self.assertEqual((stats.received, stats.accepted, stats.dropped_busy, stats.invalid), (4, 2, 1, 1))
+        self.assertEqual(simulator.get_history(), [code, code])
+
+    def test_udp_round_trip(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as listener:
+            listener.bind(("127.0.0.1", 0))
+            listener.settimeout(2)
+
+            with GatewaySimulator(port=0, rx_port=listener.getsockname()[1], rx_rate=50) as simulator:
+                host, port = simulator.get_address()
+                self.rfm_client.send(RaspyRFM(host, port), self.device, Action.ON)
+
+                with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                    sock.sendto(b"RXSTART", (host, port))
+                    self.assertTrue(listener.recv(4096).startswith(b"RXP:"))
+                    sock.sendto(b"RXSTOP", (host, port))
+
+                deadline = time.monotonic() + 2
+                while simulator.get_stats().accepted < 1 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                self.assertEqual(simulator.get_stats().accepted, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
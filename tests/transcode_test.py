@@ -0,0 +1,72 @@
+import unittest
+
+from xeger import Xeger
+
+from raspyrfm_client import RaspyRFMClient
+from raspyrfm_client.device_implementations.controlunit.actions import Action
+from raspyrfm_client.device_implementations.controlunit.controlunit_constants import ControlUnitModel
+from raspyrfm_client.device_implementations.gateway.manufacturer.gateway_constants import GatewayModel
+from raspyrfm_client.device_implementations.manufacturer_constants import Manufacturer
+from raspyrfm_client.transcode import decode, transcode, transcode_all
+
+
+class TestTranscode(unittest.TestCase):
+    def setUp(self):
+        self.rfm_client = RaspyRFMClient()
+        self.gateways = {}
+        for manufacturer in self.rfm_client.get_supported_gateway_manufacturers():
+            for model in self.rfm_client.get_supported_gateway_models(manufacturer):
+                self.gateways[model] = self.rfm_client.get_gateway(manufacturer, model)
+
+    def iter_devices(self):
+        for manufacturer in self.rfm_client.get_supported_controlunit_manufacturers():
+            for model in self.rfm_client.get_supported_controlunit_models(manufacturer):
+                device = self.rfm_client.get_controlunit(manufacturer, model)
+                channel_config = {}
+                for arg, regex in device.get_channel_config_args().items():
+                    channel_config[arg] = Xeger().xeger(regex)
+                device.set_channel_config(**channel_config)
+                yield device
+
+    def test_all_models_between_all_gateways(self):
+        for device in self.iter_devices():
+            for action in device.get_supported_actions():
+                codes = {model: gateway.generate_code(device, action) for model, gateway in self.gateways.items()}
+                for source_model, code in codes.items():
+                    pulsedata = self.gateways[source_model].get_pulse_data(device, action)
+                    self.assertEqual(decode(code, source_model)[1], pulsedata)
+
+                    for target_model, expected in codes.items():
+                        self.assertEqual(transcode(code, target_model), expected,
+                                         "%s %s from %s to %s" % (device.get_model(), action, source_model,
+                                                                  target_model))
+
+    def test_long_trailing_pulse_on_itgw(self):
+        device = self.rfm_client.get_controlunit(Manufacturer.VOLTCRAFT, ControlUnitModel.RC30)
+        device.set_channel_config(CODE='000000000000', UNIT='1')
+
+        code = self.gateways[GatewayModel.ITGW].generate_code(device, Action.ON)
+
+        self.assertTrue(code.endswith(",1,476,0"))
+        self.assertEqual(decode(code)[1], device.get_pulse_data(Action.ON))
+
+    def test_pause_is_scaled(self):
+        code = "TXP:0,0,5,6000,350,2,1,3,1,31"
+
+        self.assertEqual(transcode(code, GatewayModel.ITGW), "0,0,5,12000,350,3,0,1,3,1,124,0")
+        self.assertEqual(transcode(transcode(code, GatewayModel.ITGW), GatewayModel.RASPYRFM), code)
+
+    def test_invalid_codes(self):
+        for code in ["", "TXP:0,0,5,5600,350,3,1,3", "0,0,5,11200,350,2,0,1,3,1,0", "RXSTART", "TXP:a,b"]:
+            self.assertRaises(ValueError, decode, code)
+        self.assertRaises(ValueError, decode, "TXP:0,0,5,5600,350,1,1,31", GatewayModel.ITGW)
+
+    def test_transcode_all(self):
+        codes = ["TXP:0,0,5,5600,350,1,1,31", "TXP:0,0,5,5600,350,1,1,31", "0,0,6,11200,275,2,0,1,164,0"]
+
+        self.assertEqual(transcode_all(codes, GatewayModel.ITGW),
+                         ["0,0,5,11200,350,2,0,1,124,0", "0,0,5,11200,350,2,0,1,124,0", "0,0,6,11200,275,2,0,1,164,0"])
+
+
+if __name__ == '__main__':
+    unittest.main()